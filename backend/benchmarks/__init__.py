@@ -0,0 +1 @@
+# Benchmarks package - pomiary wydajności 
\ No newline at end of file
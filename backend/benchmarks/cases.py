@@ -0,0 +1,186 @@
+"""
+Przypadki pakietu benchmarków (python -m benchmarks.suite).
+
+Każdy przypadek dostaje BenchContext z danymi zasianymi dla jednego rozmiaru zbioru
+i zwraca funkcję bez argumentów - jedno wywołanie to jedna mierzona iteracja.
+Przypadki zapisujące dane (writes=True) są uruchamiane po odczytach, żeby nie zmieniały
+zbioru mierzonego przez pozostałe przypadki.
+"""
+from typing import Callable, Dict, List, Tuple
+
+CaseFactory = Callable[["BenchContext"], Callable[[], object]]
+
+
+class BenchContext:
+    """Dane i zasoby współdzielone przez przypadki dla jednego rozmiaru zbioru"""
+
+    def __init__(self, session_factory, client, headers: dict, event_ids: List[int], results: int):
+        self.session_factory = session_factory
+        self.client = client
+        self.headers = headers
+        self.event_ids = event_ids
+        self.results = results
+        # Wydarzenie z pełną listą wyników - odpowiednik imprezy oglądanej przez widzów
+        self.hot_event_id = event_ids[0]
+
+
+CASES: Dict[str, Tuple[str, CaseFactory, bool]] = {}
+
+
+def case(group: str, name: str, writes: bool = False):
+    """Rejestruje przypadek pod nazwą `grupa.nazwa`"""
+    def register(factory: CaseFactory) -> CaseFactory:
+        CASES[f"{group}.{name}"] = (group, factory, writes)
+        return factory
+    return register
+
+
+def _with_session(ctx: BenchContext, call: Callable) -> Callable[[], object]:
+    """Każda iteracja w nowej sesji - tak jak jedno żądanie HTTP"""
+    def run():
+        db = ctx.session_factory()
+        try:
+            return call(db)
+        finally:
+            db.close()
+    return run
+
+
+# SqlAlchemyEventRepository
+
+@case("event_repository", "list_latest_events")
+def _list_latest_events(ctx):
+    from repositories.event_repository import SqlAlchemyEventRepository
+    return _with_session(ctx, lambda db: SqlAlchemyEventRepository(db).list_latest_events(3))
+
+
+@case("event_repository", "list_all_sorted")
+def _list_all_sorted(ctx):
+    from repositories.event_repository import SqlAlchemyEventRepository
+    return _with_session(ctx, lambda db: SqlAlchemyEventRepository(db).list_all_sorted())
+
+
+@case("event_repository", "list_page_50")
+def _list_page(ctx):
+    from repositories.event_repository import SqlAlchemyEventRepository
+    return _with_session(ctx, lambda db: SqlAlchemyEventRepository(db).list_page(limit=50))
+
+
+@case("event_repository", "list_page_category")
+def _list_page_category(ctx):
+    from repositories.event_repository import SqlAlchemyEventRepository
+    return _with_session(ctx, lambda db: SqlAlchemyEventRepository(db).list_page(limit=50, category="TS"))
+
+
+@case("event_repository", "get_by_id")
+def _get_event_by_id(ctx):
+    from repositories.event_repository import SqlAlchemyEventRepository
+    return _with_session(ctx, lambda db: SqlAlchemyEventRepository(db).get_by_id(ctx.hot_event_id))
+
+
+# SqlAlchemyResultRepository
+
+@case("result_repository", "get_by_event_grouped_by_category")
+def _grouped_results(ctx):
+    from repositories.result_repository import SqlAlchemyResultRepository
+    return _with_session(
+        ctx, lambda db: SqlAlchemyResultRepository(db).get_by_event_grouped_by_category(ctx.hot_event_id)
+    )
+
+
+@case("result_repository", "get_leaderboard")
+def _leaderboard(ctx):
+    from repositories.result_repository import SqlAlchemyResultRepository
+    return _with_session(ctx, lambda db: SqlAlchemyResultRepository(db).get_leaderboard(ctx.hot_event_id))
+
+
+@case("result_repository", "get_leaderboard_top10")
+def _leaderboard_top(ctx):
+    from repositories.result_repository import SqlAlchemyResultRepository
+    return _with_session(ctx, lambda db: SqlAlchemyResultRepository(db).get_leaderboard(ctx.hot_event_id, top=10))
+
+
+# ResultService
+
+@case("result_service", "add_result", writes=True)
+def _add_result(ctx):
+    from domain.result import Result
+    from repositories.result_repository import SqlAlchemyResultRepository
+    from usecases.result_service import ResultService
+
+    counter = iter(range(10 ** 9))
+
+    def add(db):
+        return ResultService(SqlAlchemyResultRepository(db)).add_result(Result(
+            event_id=ctx.hot_event_id, category="TZ", team=f"Bench {next(counter)}", penalty_points=7
+        ))
+    return _with_session(ctx, add)
+
+
+# Konwersje ORM -> domain object (_to_domain) na wczytanych wcześniej modelach (do 1000 sztuk)
+
+@case("to_domain", "events_batch")
+def _event_to_domain(ctx):
+    from infrastructure.db_models import EventModel
+    from repositories.event_repository import SqlAlchemyEventRepository
+
+    db = ctx.session_factory()
+    models = db.query(EventModel).limit(1000).all()
+    db.close()
+    repository = SqlAlchemyEventRepository(db)
+    return lambda: [repository._to_domain(model) for model in models]
+
+
+@case("to_domain", "results_batch")
+def _result_to_domain(ctx):
+    from infrastructure.db_models import ResultModel
+    from repositories.result_repository import SqlAlchemyResultRepository
+
+    db = ctx.session_factory()
+    models = db.query(ResultModel).limit(1000).all()
+    db.close()
+    repository = SqlAlchemyResultRepository(db)
+    return lambda: [repository._to_domain(model) for model in models]
+
+
+# Endpointy przez TestClient (cały stos FastAPI: zależności, serializacja, middleware)
+
+def _get(ctx, url: str, **kwargs):
+    def run():
+        response = ctx.client.get(url, **kwargs)
+        response.raise_for_status()
+        return response
+    return run
+
+
+@case("endpoints", "GET /events")
+def _endpoint_events(ctx):
+    return _get(ctx, "/events")
+
+
+@case("endpoints", "GET /events/all?limit=50")
+def _endpoint_events_page(ctx):
+    return _get(ctx, "/events/all", params={"limit": 50})
+
+
+@case("endpoints", "GET /results/{event_id}")
+def _endpoint_results(ctx):
+    return _get(ctx, f"/results/{ctx.hot_event_id}")
+
+
+@case("endpoints", "GET /results/{event_id}/leaderboard")
+def _endpoint_leaderboard(ctx):
+    return _get(ctx, f"/results/{ctx.hot_event_id}/leaderboard")
+
+
+@case("endpoints", "POST /results", writes=True)
+def _endpoint_add_result(ctx):
+    counter = iter(range(10 ** 9))
+
+    def run():
+        response = ctx.client.post("/results", headers=ctx.headers, json={
+            "event_id": ctx.hot_event_id, "category": "TU", "team": f"Bench HTTP {next(counter)}", "penalty_points": 3,
+        })
+        response.raise_for_status()
+        return response
+    return run
@@ -0,0 +1,190 @@
+"""
+Wspólne narzędzia benchmarków - lokalna baza, token Azure AD i dane syntetyczne.
+Benchmarki uruchamiamy z katalogu backend/, np. `python -m benchmarks.mixed_load`.
+"""
+import base64
+import json
+import math
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+DEFAULT_DATABASE_URL = "sqlite:///./benchmark.db"
+
+
+def make_azure_token(
+    email: str = "judge@example.com",
+    name: str = "Sędzia",
+    oid: Optional[str] = None,
+    lifetime: int = 3600
+) -> str:
+    """
+    Tworzy token w formacie Azure AD akceptowany przez get_current_user.
+    Podpis nie jest weryfikowany, więc benchmarki działają bez dostępu do Azure.
+    """
+    def encode(data: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode("utf-8")).decode("ascii").rstrip("=")
+
+    header = {"alg": "none", "typ": "JWT"}
+    payload = {
+        "oid": oid or f"bench-{email}",
+        "email": email,
+        "name": name,
+        "exp": int(time.time()) + lifetime,
+    }
+    return f"{encode(header)}.{encode(payload)}.bench"
+
+
+def load_app(database_url: str = DEFAULT_DATABASE_URL):
+    """Importuje aplikację FastAPI podłączoną do wskazanej bazy i tworzy schemat"""
+    os.environ["DATABASE_URL"] = database_url
+
+    import main
+    from infrastructure.database import engine
+    from infrastructure.migrations import run_migrations
+
+    run_migrations(engine)
+    return main.app
+
+
+def simulate_db_latency(engine, latency_ms: float) -> None:
+    """
+    Dodaje opóźnienie do każdego zapytania, symulując sieciowy round trip do PostgreSQL.
+    time.sleep zwalnia GIL tak jak oczekiwanie na odpowiedź bazy.
+    """
+    if latency_ms <= 0:
+        return
+
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _delay(conn, cursor, statement, parameters, context, executemany):
+        time.sleep(latency_ms / 1000.0)
+
+
+def seed_event(db, teams: int, categories: List[str], name: str = "Benchmark") -> int:
+    """Tworzy wydarzenie z `teams` wynikami rozłożonymi po kategoriach i zwraca jego ID"""
+    from sqlalchemy import insert
+    from infrastructure.db_models import EventModel, ResultModel
+    from repositories.standings_repository import SqlAlchemyStandingsRepository
+
+    event = EventModel(
+        name=name,
+        date=datetime.now() + timedelta(days=1),
+        categories=categories,
+        location="Benchmark",
+        start_point_url="https://example.com",
+        start_time="10:00",
+    )
+    db.add(event)
+    db.flush()
+
+    rows = [
+        {
+            "event_id": event.id,
+            "category": categories[i % len(categories)],
+            "team": f"Zespół {i}",
+            "penalty_points": (i * 37) % 500,
+            "deleted": False,
+        }
+        for i in range(teams)
+    ]
+    if rows:
+        db.execute(insert(ResultModel), rows)
+    db.commit()
+
+    # Wyniki wstawione z pominięciem repozytorium - klasyfikację trzeba odbudować
+    SqlAlchemyStandingsRepository(db).rebuild(event.id)
+    return event.id
+
+
+def clear_dataset(db) -> None:
+    """Usuwa wydarzenia, wyniki i klasyfikację (użytkownicy zostają)"""
+    from sqlalchemy import delete
+    from infrastructure.db_models import EventModel, ResultModel, StandingModel
+
+    for model in (StandingModel, ResultModel, EventModel):
+        db.execute(delete(model))
+    db.commit()
+
+
+def seed_dataset(db, results: int, teams_per_event: int = 500, chunk_size: int = 50000) -> List[int]:
+    """
+    Tworzy syntetyczny zbiór `results` wyników rozłożonych po wydarzeniach
+    (najwyżej `teams_per_event` na wydarzenie) razem z klasyfikacją. Zwraca ID wydarzeń.
+    """
+    from sqlalchemy import insert, select
+    from infrastructure.db_models import EventModel, ResultModel
+    from repositories.standings_repository import SqlAlchemyStandingsRepository
+
+    categories = ["TZ", "TU", "TT", "TS"]
+    teams_per_event = max(1, min(results, teams_per_event))
+    event_count = math.ceil(results / teams_per_event)
+    start = datetime(2024, 1, 1)
+
+    db.execute(insert(EventModel), [
+        {
+            "name": f"Benchmark {i}",
+            "date": start + timedelta(days=i % 730, hours=i // 730),
+            "categories": categories[: 1 + i % len(categories)],
+            "location": ("Kraków", "Warszawa", "Gdańsk")[i % 3],
+            "start_point_url": "https://example.com",
+            "start_time": "10:00",
+            "registered_participants": 0,
+            "deleted": False,
+        }
+        for i in range(event_count)
+    ])
+    event_ids = db.scalars(select(EventModel.id).order_by(EventModel.id)).all()
+
+    rows = []
+    for i in range(results):
+        rows.append({
+            "event_id": event_ids[i // teams_per_event],
+            "category": categories[i % len(categories)],
+            "team": f"Zespół {i % teams_per_event}",
+            "penalty_points": (i * 37) % 500,
+            "deleted": False,
+        })
+        if len(rows) >= chunk_size:
+            db.execute(insert(ResultModel), rows)
+            rows = []
+    if rows:
+        db.execute(insert(ResultModel), rows)
+    db.commit()
+
+    SqlAlchemyStandingsRepository(db).rebuild()
+    return list(event_ids)
+
+
+def results_payload(categories: List[str], teams: int, round_no: int = 0) -> Dict[str, List[dict]]:
+    """Buduje body dla PUT /results/{event_id} - co rundę zmienia się część wyników"""
+    payload = {category: [] for category in categories}
+    for i in range(teams):
+        payload[categories[i % len(categories)]].append({
+            "team": f"Zespół {i}",
+            "penalty_points": (i * 37 + (round_no if i % 10 == 0 else 0)) % 500,
+        })
+    return payload
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Zwraca percentyl (metoda najbliższego rzędu) dla posortowanej kopii listy"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies: List[float], errors: int = 0) -> dict:
+    """Podsumowanie czasów odpowiedzi w milisekundach"""
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p90_ms": round(percentile(latencies, 90) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies) * 1000, 2) if latencies else 0.0,
+    }
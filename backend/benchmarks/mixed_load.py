@@ -0,0 +1,116 @@
+"""
+Benchmark mieszanego obciążenia w jednym procesie.
+
+Sędziowie zapisują wyniki (PUT /results/{event_id}), widzowie czytają wyniki
+i wydarzenia, a sonda odpytuje /health. Klient i aplikacja dzielą jedną pętlę
+zdarzeń, więc każdy handler blokujący pętlę jest widoczny jako wzrost p99 sondy.
+
+Porównanie z poprzednią wersją: uruchom skrypt na obu commitach z tymi samymi
+parametrami i porównaj p99. Opcja --db-latency-ms symuluje round trip do
+PostgreSQL, bez którego lokalny SQLite ukrywa koszt blokowania pętli.
+
+    python -m benchmarks.mixed_load --judges 4 --spectators 50 --requests 20
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import defaultdict
+
+import httpx
+
+from benchmarks.common import (
+    DEFAULT_DATABASE_URL,
+    load_app,
+    make_azure_token,
+    results_payload,
+    seed_event,
+    simulate_db_latency,
+    summarize,
+)
+
+CATEGORIES = ["TZ", "TU", "TT", "TS"]
+
+
+async def run_mixed_load(app, event_id: int, judges: int, spectators: int, requests: int, teams: int) -> dict:
+    """Uruchamia sędziów, widzów i sondę równolegle i zwraca statystyki per endpoint"""
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    headers = {"Authorization": f"Bearer {make_azure_token()}"}
+    transport = httpx.ASGITransport(app=app)
+
+    async def timed(client, label, method, url, **kwargs):
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        latencies[label].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            errors[label] += 1
+
+    async def judge(client, judge_no):
+        for round_no in range(requests):
+            await timed(
+                client, "PUT /results/{event_id}", "PUT", f"/results/{event_id}",
+                json=results_payload(CATEGORIES, teams, round_no + judge_no), headers=headers
+            )
+
+    async def spectator(client, spectator_no):
+        for i in range(requests):
+            if (i + spectator_no) % 4 == 0:
+                await timed(client, "GET /events", "GET", "/events")
+            else:
+                await timed(client, "GET /results/{event_id}", "GET", f"/results/{event_id}")
+
+    async def probe(client, stop):
+        while not stop.is_set():
+            await timed(client, "GET /health (probe)", "GET", "/health")
+            await asyncio.sleep(0.005)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        # Pierwsze logowanie tworzy użytkownika - wykonaj je przed startem pomiaru
+        await client.get("/auth/me", headers=headers)
+
+        stop = asyncio.Event()
+        probe_task = asyncio.create_task(probe(client, stop))
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(judge(client, n) for n in range(judges)),
+            *(spectator(client, n) for n in range(spectators)),
+        )
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await probe_task
+
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "endpoints": {label: summarize(values, errors[label]) for label, values in sorted(latencies.items())},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark mieszanego obciążenia API")
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--judges", type=int, default=4)
+    parser.add_argument("--spectators", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=20, help="liczba żądań na klienta")
+    parser.add_argument("--teams", type=int, default=300)
+    parser.add_argument("--db-latency-ms", type=float, default=2.0,
+                        help="sztuczne opóźnienie każdego zapytania (round trip do bazy)")
+    args = parser.parse_args()
+
+    app = load_app(args.database_url)
+
+    from infrastructure.database import SessionLocal, engine
+    db = SessionLocal()
+    try:
+        event_id = seed_event(db, args.teams, CATEGORIES)
+    finally:
+        db.close()
+
+    simulate_db_latency(engine, args.db_latency_ms)
+
+    report = asyncio.run(run_mixed_load(app, event_id, args.judges, args.spectators, args.requests, args.teams))
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
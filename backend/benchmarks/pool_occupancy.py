@@ -0,0 +1,144 @@
+"""
+Zajętość puli połączeń z wczesnym oddawaniem połączeń (DB_EARLY_RELEASE) i bez niego.
+
+Dla każdego trybu uruchamiany jest serwer uvicorn z małą pulą, a widzowie równolegle
+pobierają duże wyniki wydarzenia (GET /results/{event_id}) i listę wydarzeń. Cache
+repozytoriów i łączenie odczytów są wyłączone, żeby każde żądanie szło do bazy.
+Po pomiarze raport czyta /metrics serwera: średni i maksymalny przedział czasu
+trzymania połączenia, czas czekania na pulę, najwyższą liczbę pobranych połączeń
+oraz przepustowość i percentyle odpowiedzi.
+
+    python -m benchmarks.pool_occupancy --spectators 50 --teams 5000 --duration 15
+"""
+import argparse
+import asyncio
+import os
+import time
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.common import DEFAULT_DATABASE_URL, summarize
+from benchmarks.race_day import prepare_database, start_server, wait_until_ready
+
+
+def parse_metrics(text: str) -> Dict[str, float]:
+    """Wartości metryk bez etykiet z formatu tekstowego Prometheusa"""
+    values = {}
+    for line in text.splitlines():
+        if line.startswith("#") or "{" in line or " " not in line:
+            continue
+        name, value = line.rsplit(" ", 1)
+        values[name] = float(value)
+    return values
+
+
+def histogram_max_bucket(text: str, name: str) -> str:
+    """Najmniejszy przedział histogramu, który obejmuje wszystkie obserwacje"""
+    buckets = []
+    total = None
+    for line in text.splitlines():
+        if line.startswith(f"{name}_bucket{{"):
+            bound = line.split('le="', 1)[1].split('"', 1)[0]
+            count = float(line.rsplit(" ", 1)[1])
+            if bound == "+Inf":
+                total = count
+            else:
+                buckets.append((float(bound), count))
+    for bound, count in buckets:
+        if total is not None and count >= total:
+            return f"<= {bound * 1000:g} ms"
+    return "> 10 s"
+
+
+async def run_spectators(base_url: str, event_id: int, spectators: int, duration: float) -> dict:
+    latencies: List[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=spectators, max_keepalive_connections=spectators)
+
+    async def spectator(client, number, deadline):
+        nonlocal errors
+        poll = number
+        while time.monotonic() < deadline:
+            url = "/events" if poll % 4 == 0 else f"/results/{event_id}"
+            started = time.perf_counter()
+            try:
+                failed = (await client.get(url)).status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - started)
+            errors += failed
+            poll += 1
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        started = time.perf_counter()
+        deadline = time.monotonic() + duration
+        await asyncio.gather(*(spectator(client, n, deadline) for n in range(spectators)))
+        elapsed = time.perf_counter() - started
+        metrics = (await client.get("/metrics")).text
+
+    return {
+        "latency": summarize(latencies, errors),
+        "throughput": len(latencies) / elapsed,
+        "metrics": metrics,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zajętość puli połączeń z DB_EARLY_RELEASE i bez")
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--spectators", type=int, default=50)
+    parser.add_argument("--teams", type=int, default=5000)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    if args.database_url.startswith("sqlite:///") and os.path.exists(args.database_url[len("sqlite:///"):]):
+        os.remove(args.database_url[len("sqlite:///"):])
+    event_id = prepare_database(args.database_url, args.teams)
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    rows = []
+    for early_release in ("false", "true"):
+        os.environ.update(
+            DB_EARLY_RELEASE=early_release,
+            DB_POOL_SIZE=str(args.pool_size),
+            DB_MAX_OVERFLOW="0",
+            REPOSITORY_CACHE_BACKEND="off",
+            SINGLE_FLIGHT_ENABLED="false",
+            QUERY_BUDGET_MODE="off",
+        )
+        server = start_server(args.database_url, 1, args.port)
+        try:
+            wait_until_ready(base_url)
+            report = asyncio.run(run_spectators(base_url, event_id, args.spectators, args.duration))
+        finally:
+            server.terminate()
+            server.wait()
+
+        metrics = parse_metrics(report["metrics"])
+        holds = metrics["db_pool_hold_seconds_count"] or 1
+        waits = metrics["db_pool_wait_seconds_count"] or 1
+        rows.append((
+            "wczesne oddawanie" if early_release == "true" else "do końca żądania",
+            report["throughput"],
+            report["latency"]["p50_ms"],
+            report["latency"]["p99_ms"],
+            report["latency"]["errors"],
+            metrics["db_pool_hold_seconds_sum"] / holds * 1000,
+            histogram_max_bucket(report["metrics"], "db_pool_hold_seconds"),
+            metrics["db_pool_wait_seconds_sum"] / waits * 1000,
+            int(metrics["db_pool_peak_in_use"]),
+        ))
+
+    print(f"pula: {args.pool_size} połączenia, widzowie: {args.spectators}, wyniki: {args.teams}")
+    print(f"{'połączenie':<18}  {'żąd./s':>7}  {'p50 ms':>7}  {'p99 ms':>7}  {'błędy':>5}  "
+          f"{'trzymanie śr. ms':>16}  {'trzymanie max':>13}  {'czekanie śr. ms':>15}  {'szczyt':>6}")
+    for label, throughput, p50, p99, errors, hold, hold_max, wait, peak in rows:
+        print(f"{label:<18}  {throughput:>7.1f}  {p50:>7.1f}  {p99:>7.1f}  {errors:>5}  "
+              f"{hold:>16.2f}  {hold_max:>13}  {wait:>15.2f}  {peak:>6}")
+
+
+if __name__ == "__main__":
+    main()
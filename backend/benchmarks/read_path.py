@@ -0,0 +1,176 @@
+"""
+Benchmark ścieżki odczytu repozytoriów: obiekty ORM vs SQLAlchemy Core.
+
+Poprzednia ścieżka (odtworzona tutaj) ładowała pełne instancje ORM (identity map,
+śledzenie zmian) i kopiowała pola do domain objects z __dict__. Obecna czyta krotki
+przez Core i tworzy domain objects z __slots__. Mierzymy najlepszy czas z kilku
+przebiegów oraz szczytową pamięć (tracemalloc) przy trzymaniu całej listy.
+
+Domyślnie baza SQLite w pamięci; dla PostgreSQL podaj pustą bazę (dane są dopisywane).
+
+    python -m benchmarks.read_path --rows 10000 --repeat 5
+"""
+import argparse
+import gc
+import json
+import os
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable
+
+
+class LegacyDomainObject:
+    """Event/Result sprzed __slots__ - zwykła klasa z __dict__ na instancję"""
+
+    def __init__(self, **fields):
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+
+def seed(db, rows: int) -> int:
+    """Tworzy `rows` wydarzeń i jedno wydarzenie z `rows` wynikami; zwraca ID tego wydarzenia"""
+    from sqlalchemy import insert
+    from infrastructure.db_models import EventModel, ResultModel
+
+    start = datetime(2024, 1, 1)
+    db.execute(insert(EventModel), [
+        {
+            "name": f"Impreza {i}",
+            "date": start + timedelta(hours=i),
+            "categories": ["TSZ", "TT", "TU"],
+            "location": "Kraków",
+            "start_point_url": "https://example.com/start",
+            "start_time": "10:00",
+            "registered_participants": 0,
+            "deleted": False,
+        }
+        for i in range(rows)
+    ])
+    event_id = db.execute(insert(EventModel).returning(EventModel.id), {
+        "name": "Benchmark", "date": start, "categories": ["TSZ", "TT", "TU"], "location": "Kraków",
+        "start_point_url": "https://example.com/start", "start_time": "10:00",
+        "registered_participants": 0, "deleted": False,
+    }).scalar_one()
+    db.execute(insert(ResultModel), [
+        {
+            "event_id": event_id,
+            "category": ("TSZ", "TT", "TU")[i % 3],
+            "team": f"Zespół {i}",
+            "penalty_points": i % 120,
+            "deleted": False,
+        }
+        for i in range(rows)
+    ])
+    db.commit()
+    return event_id
+
+
+def legacy_list_events(db):
+    from infrastructure.db_models import EventModel
+
+    events = db.query(EventModel).filter_by(deleted=False).order_by(EventModel.date, EventModel.id).all()
+    return [
+        LegacyDomainObject(
+            id=event.id, name=event.name, date=event.date, categories=event.categories,
+            location=event.location, start_point_url=event.start_point_url, start_time=event.start_time,
+            fee=event.fee, registration_deadline=event.registration_deadline,
+            registered_participants=event.registered_participants, google_maps_url=event.google_maps_url,
+            google_drive_url=event.google_drive_url, deleted=event.deleted,
+            created_at=event.created_at, updated_at=event.updated_at,
+        )
+        for event in events
+    ]
+
+
+def legacy_grouped_results(db, event_id: int):
+    from infrastructure.db_models import ResultModel
+
+    results = db.query(ResultModel).filter(
+        ResultModel.event_id == event_id,
+        ResultModel.deleted == False
+    ).order_by(ResultModel.category, ResultModel.created_at.desc()).all()
+    grouped = {}
+    for result in results:
+        grouped.setdefault(result.category, []).append(LegacyDomainObject(
+            id=result.id, event_id=result.event_id, category=result.category, team=result.team,
+            penalty_points=result.penalty_points, deleted=result.deleted,
+            created_at=result.created_at, updated_at=result.updated_at,
+        ))
+    return grouped
+
+
+def measure(session_factory, call: Callable, repeat: int) -> dict:
+    """Każdy przebieg w nowej sesji - identity map nie przenosi się między przebiegami"""
+    best = float("inf")
+    for _ in range(repeat):
+        db = session_factory()
+        try:
+            gc.collect()
+            started = time.perf_counter()
+            call(db)
+            best = min(best, time.perf_counter() - started)
+        finally:
+            db.close()
+
+    db = session_factory()
+    try:
+        gc.collect()
+        tracemalloc.start()
+        kept = call(db)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del kept
+    finally:
+        db.close()
+
+    return {"ms": round(best * 1000, 1), "peak_mb": round(peak / 1024 / 1024, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ścieżki odczytu (ORM vs Core)")
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database_url
+    from infrastructure.database import SessionLocal, engine
+    from infrastructure.migrations import run_migrations
+    from repositories.event_repository import SqlAlchemyEventRepository
+    from repositories.result_repository import SqlAlchemyResultRepository
+
+    run_migrations(engine)
+    db = SessionLocal()
+    try:
+        event_id = seed(db, args.rows)
+    finally:
+        db.close()
+
+    cases = {
+        "list_all_sorted": (
+            legacy_list_events,
+            lambda db: SqlAlchemyEventRepository(db).list_all_sorted(),
+        ),
+        "get_by_event_grouped_by_category": (
+            lambda db: legacy_grouped_results(db, event_id),
+            lambda db: SqlAlchemyResultRepository(db).get_by_event_grouped_by_category(event_id),
+        ),
+    }
+
+    report = {"rows": args.rows, "database": engine.dialect.name}
+    for name, (legacy, current) in cases.items():
+        before = measure(SessionLocal, legacy, args.repeat)
+        after = measure(SessionLocal, current, args.repeat)
+        report[name] = {
+            "orm": before,
+            "core": after,
+            "speedup": round(before["ms"] / after["ms"], 2),
+            "memory_ratio": round(before["peak_mb"] / after["peak_mb"], 2) if after["peak_mb"] else None,
+        }
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Mikrobenchmark serializacji odpowiedzi (bez bazy danych i HTTP).
+
+Porównuje poprzednią ścieżkę endpointów - EventResponse/słowniki budowane ręcznie
+(strftime, datetime.now() dla znaczników czasu), walidacja pydantic i jsonable_encoder
+z JSONResponse - ze ścieżką z serializers.py (słowniki z domain objects + ORJSONResponse).
+
+    python -m benchmarks.serialization --sizes 1000 10000 --repeat 5
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from domain.event import Event
+from domain.result import Result
+from schemas import EventResponse
+from serializers import events_to_list, results_by_category_to_dict
+
+
+def make_events(count: int) -> List[Event]:
+    created = datetime(2024, 5, 1, 12, 0, 0)
+    return [
+        Event(
+            id=i + 1,
+            name=f"Impreza {i}",
+            date=datetime(2024, 6, 1) + timedelta(days=i % 365),
+            categories=["TSZ", "TT", "TU"],
+            location="Kraków",
+            start_point_url="https://example.com/start",
+            start_time="10:00",
+            fee=25.0,
+            registration_deadline=datetime(2024, 5, 25),
+            registered_participants=i % 200,
+            created_at=created,
+            updated_at=created,
+        )
+        for i in range(count)
+    ]
+
+
+def make_results(count: int) -> List[Result]:
+    created = datetime(2024, 6, 1, 12, 0, 0)
+    return [
+        Result(
+            id=i + 1,
+            event_id=1,
+            category=("TSZ", "TT", "TU")[i % 3],
+            team=f"Zespół {i}",
+            penalty_points=i % 120,
+            created_at=created,
+            updated_at=created,
+        )
+        for i in range(count)
+    ]
+
+
+def legacy_events(events: List[Event]) -> bytes:
+    """Dawna ścieżka GET /events/all: EventResponse per obiekt, jsonable_encoder, JSONResponse"""
+    models = [
+        EventResponse(
+            id=event.id,
+            name=event.name,
+            date=event.date.strftime("%Y-%m-%d"),
+            categories=event.categories,
+            location=event.location,
+            start_point_url=event.start_point_url,
+            start_time=event.start_time,
+            fee=event.fee,
+            registration_deadline=event.registration_deadline.strftime("%Y-%m-%d") if event.registration_deadline else None,
+            registered_participants=event.registered_participants,
+            google_maps_url=event.google_maps_url,
+            google_drive_url=event.google_drive_url,
+            deleted=event.deleted,
+            created_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            updated_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        )
+        for event in events
+    ]
+    return JSONResponse(jsonable_encoder(models)).body
+
+
+def fast_events(events: List[Event]) -> bytes:
+    return ORJSONResponse(events_to_list(events)).body
+
+
+def legacy_results(results: List[Result]) -> bytes:
+    """Dawna ścieżka GET /results/{event_id}: słowniki z datetime.now(), jsonable_encoder, JSONResponse"""
+    response = {}
+    for result in results:
+        response.setdefault(result.category, []).append({
+            "id": result.id,
+            "event_id": result.event_id,
+            "category": result.category,
+            "team": result.team,
+            "penalty_points": result.penalty_points,
+            "deleted": result.deleted,
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        })
+    return JSONResponse(jsonable_encoder(response)).body
+
+
+def fast_results(results: List[Result]) -> bytes:
+    grouped = {}
+    for result in results:
+        grouped.setdefault(result.category, []).append(result)
+    return ORJSONResponse(results_by_category_to_dict(grouped)).body
+
+
+def measure(serialize: Callable[[list], bytes], objects: list, repeat: int) -> dict:
+    """Najlepszy czas z `repeat` przebiegów (najmniej zakłóceń od reszty systemu)"""
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = len(serialize(objects))
+        best = min(best, time.perf_counter() - started)
+    return {
+        "ms": round(best * 1000, 2),
+        "objects_per_s": round(len(objects) / best),
+        "bytes": size,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mikrobenchmark serializacji odpowiedzi")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    report = {}
+    for size in args.sizes:
+        events = make_events(size)
+        results = make_results(size)
+        legacy_event = measure(legacy_events, events, args.repeat)
+        fast_event = measure(fast_events, events, args.repeat)
+        legacy_result = measure(legacy_results, results, args.repeat)
+        fast_result = measure(fast_results, results, args.repeat)
+        report[size] = {
+            "events": {
+                "legacy": legacy_event,
+                "orjson": fast_event,
+                "speedup": round(legacy_event["ms"] / fast_event["ms"], 1),
+            },
+            "results": {
+                "legacy": legacy_result,
+                "orjson": fast_result,
+                "speedup": round(legacy_result["ms"] / fast_result["ms"], 1),
+            },
+        }
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
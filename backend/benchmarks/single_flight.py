@@ -0,0 +1,132 @@
+"""
+Łączenie równoczesnych identycznych odczytów (SingleFlight) w ResultService i EventService.
+
+N wątków startuje jednocześnie - każdy jak osobne żądanie z własną sesją - i pobiera
+te same wyniki wydarzenia. Bez łączenia każdy wykonuje własne zapytanie, z łączeniem
+wszystkie dostają wynik jednego zapytania i jednej serializacji. Cache repozytoriów
+jest tu pominięty, żeby mierzyć tylko warstwę usług. Kończy się kodem 1, gdy
+równoczesne wywołania z łączeniem wykonały więcej niż jedno zapytanie.
+
+    python -m benchmarks.single_flight --callers 50 --latency-ms 50
+"""
+import argparse
+import os
+import sys
+import threading
+from typing import Callable, List
+
+DEFAULT_SINGLE_FLIGHT_DATABASE_URL = "sqlite:///./single_flight.db"
+CATEGORIES = ["TZ", "TU", "TT", "TS"]
+
+
+def run_concurrently(callers: int, call: Callable[[], object]) -> List[object]:
+    """Uruchamia `callers` wywołań naraz (bariera) i zwraca ich wyniki"""
+    barrier = threading.Barrier(callers)
+    results: List[object] = [None] * callers
+
+    def worker(index: int) -> None:
+        barrier.wait()
+        results[index] = call()
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zapytania SQL przy równoczesnych identycznych odczytach")
+    parser.add_argument("--database-url", default=DEFAULT_SINGLE_FLIGHT_DATABASE_URL)
+    parser.add_argument("--callers", type=int, default=50)
+    parser.add_argument("--teams", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="symulowany czas zapytania")
+    args = parser.parse_args()
+
+    if args.database_url.startswith("sqlite:///") and os.path.exists(args.database_url[len("sqlite:///"):]):
+        os.remove(args.database_url[len("sqlite:///"):])
+    os.environ["DATABASE_URL"] = args.database_url
+
+    from sqlalchemy import event
+    from infrastructure.database import SessionLocal, engine
+    from infrastructure.migrations import run_migrations
+    from infrastructure.single_flight import SingleFlight
+    from benchmarks.common import seed_event, simulate_db_latency
+    from repositories.event_repository import SqlAlchemyEventRepository
+    from repositories.result_repository import SqlAlchemyResultRepository
+    from serializers import events_to_json, results_by_category_to_json
+    from usecases.event_service import EventService
+    from usecases.result_service import ResultService
+
+    run_migrations(engine)
+    db = SessionLocal()
+    try:
+        event_id = seed_event(db, args.teams, CATEGORIES)
+        version = ResultService(SqlAlchemyResultRepository(db)).get_results_version(event_id)
+        events_version = EventService(SqlAlchemyEventRepository(db)).get_events_version()
+    finally:
+        db.close()
+
+    counts = {"results": 0, "events": 0, "renders": 0}
+    lock = threading.Lock()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        table = "results" if "FROM results" in statement else "events" if "FROM events" in statement else None
+        if table is not None:
+            with lock:
+                counts[table] += 1
+
+    simulate_db_latency(engine, args.latency_ms)
+
+    def counted(render):
+        def wrapper(value):
+            with lock:
+                counts["renders"] += 1
+            return render(value)
+        return wrapper
+
+    render_results = counted(results_by_category_to_json)
+    render_events = counted(events_to_json)
+
+    def results_read(single_flight):
+        def call():
+            db = SessionLocal()
+            try:
+                service = ResultService(SqlAlchemyResultRepository(db), single_flight=single_flight)
+                return service.render_results_by_event(event_id, version, render_results)
+            finally:
+                db.close()
+        return call
+
+    def events_read(single_flight):
+        def call():
+            db = SessionLocal()
+            try:
+                service = EventService(SqlAlchemyEventRepository(db), single_flight=single_flight)
+                return service.render_latest_events(3, events_version, render_events)
+            finally:
+                db.close()
+        return call
+
+    failures = 0
+    print(f"{'odczyt':<40}  {'wywołania':>9}  {'zapytania':>9}  {'serializacje':>12}  {'różne treści':>12}")
+    for label, table, make_call in (
+        ("GET /results/{event_id}", "results", results_read),
+        ("GET /events", "events", events_read),
+    ):
+        for coalesced in (False, True):
+            counts.update(results=0, events=0, renders=0)
+            bodies = run_concurrently(args.callers, make_call(SingleFlight() if coalesced else None))
+            mode = "z łączeniem" if coalesced else "bez łączenia"
+            print(f"{label + ' (' + mode + ')':<40}  {args.callers:>9}  {counts[table]:>9}  {counts['renders']:>12}  {len(set(bodies)):>12}")
+            if coalesced and (counts[table] != 1 or counts["renders"] != 1):
+                failures += 1
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import Optional
+
+class DataVersion:
+    """
+    Klasa DataVersion - licznik zmian jednego zakresu danych (np. wyników wydarzenia).
+    Każdy zapis zwiększa wersję, więc para (zakres, wersja) identyfikuje stan danych
+    bez ich wczytywania - na tej podstawie API liczy ETagi odpowiedzi.
+    """
+    
+    __slots__ = ("scope", "version", "updated_at")
+    
+    def __init__(self, scope: str, version: int = 0, updated_at: Optional[datetime] = None):
+        self.scope = scope
+        self.version = version
+        self.updated_at = updated_at
@@ -7,6 +7,13 @@ class Event:
     To jest "czysta" klasa biznesowa - nie zależy od żadnych frameworków.
     """
     
+    # Bez __dict__ na instancję - listy wydarzeń zajmują mniej pamięci i szybciej się tworzą
+    __slots__ = (
+        "id", "name", "date", "categories", "location", "start_point_url", "start_time", "fee",
+        "registration_deadline", "registered_participants", "google_maps_url", "google_drive_url",
+        "deleted", "created_at", "updated_at",
+    )
+    
     def __init__(
         self,
         name: str,
@@ -22,6 +29,8 @@ class Event:
         google_drive_url: Optional[str] = None,
         deleted: bool = False,
         id: Optional[int] = None,
+        created_at: Optional[datetime] = None,
+        updated_at: Optional[datetime] = None,
     ):
         self.id = id
         self.name = name
@@ -36,6 +45,8 @@ class Event:
         self.google_maps_url = google_maps_url
         self.google_drive_url = google_drive_url
         self.deleted = deleted
+        self.created_at = created_at
+        self.updated_at = updated_at
     
     def is_registration_open(self) -> bool:
         """Sprawdza czy rejestracja jest jeszcze otwarta"""
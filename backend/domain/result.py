@@ -1,4 +1,5 @@
-from typing import Optional
+from datetime import datetime
+from typing import Dict, List, Optional
 
 class Result:
     """
@@ -6,6 +7,9 @@ class Result:
     To jest "czysta" klasa biznesowa - nie zależy od żadnych frameworków.
     """
     
+    # Bez __dict__ na instancję - listy wyników zajmują mniej pamięci i szybciej się tworzą
+    __slots__ = ("id", "event_id", "category", "team", "penalty_points", "deleted", "created_at", "updated_at")
+    
     def __init__(
         self,
         event_id: int,
@@ -13,7 +17,9 @@ class Result:
         team: str,
         penalty_points: int,
         deleted: bool = False,
-        id: Optional[int] = None
+        id: Optional[int] = None,
+        created_at: Optional[datetime] = None,
+        updated_at: Optional[datetime] = None
     ):
         self.id = id
         self.event_id = event_id
@@ -21,6 +27,8 @@ class Result:
         self.team = team
         self.penalty_points = penalty_points
         self.deleted = deleted
+        self.created_at = created_at
+        self.updated_at = updated_at
     
     def is_deleted(self) -> bool:
         """Sprawdza czy wynik jest usunięty"""
@@ -28,4 +36,36 @@ class Result:
     
     def has_penalty_points(self) -> bool:
         """Sprawdza czy wynik ma punkty karne"""
-        return self.penalty_points > 0 
\ No newline at end of file
+        return self.penalty_points > 0
+
+
+class ResultChangeSet:
+    """
+    Klasa ResultChangeSet - opisuje zmiany wprowadzone przy zapisie wyników wydarzenia.
+    Zawiera tylko faktycznie zmienione wiersze - niezmienione są jedynie zliczane.
+    """
+    
+    def __init__(
+        self,
+        inserted: Optional[List[Result]] = None,
+        updated: Optional[List[Result]] = None,
+        deleted: Optional[List[int]] = None,
+        unchanged: int = 0
+    ):
+        self.inserted = inserted or []
+        self.updated = updated or []
+        self.deleted = deleted or []
+        self.unchanged = unchanged
+    
+    def has_changes(self) -> bool:
+        """Sprawdza czy zapis cokolwiek zmienił"""
+        return bool(self.inserted or self.updated or self.deleted)
+    
+    def counts(self) -> Dict[str, int]:
+        """Zwraca liczbę wierszy dla każdego rodzaju zmiany"""
+        return {
+            "inserted": len(self.inserted),
+            "updated": len(self.updated),
+            "deleted": len(self.deleted),
+            "unchanged": self.unchanged,
+        }
\ No newline at end of file
@@ -0,0 +1,37 @@
+from typing import Optional
+
+class Standing:
+    """
+    Klasa Standing - reprezentuje pozycję zespołu w klasyfikacji kategorii.
+    To jest "czysta" klasa biznesowa - nie zależy od żadnych frameworków.
+    """
+    
+    __slots__ = (
+        "result_id", "event_id", "category", "team", "penalty_points", "rank", "position", "gap_to_leader", "tied",
+    )
+    
+    def __init__(
+        self,
+        event_id: int,
+        category: str,
+        team: str,
+        penalty_points: int,
+        rank: int,
+        position: int,
+        gap_to_leader: int,
+        tied: bool = False,
+        result_id: Optional[int] = None
+    ):
+        self.result_id = result_id
+        self.event_id = event_id
+        self.category = category
+        self.team = team
+        self.penalty_points = penalty_points
+        self.rank = rank  # miejsce (ex aequo dzielą to samo miejsce)
+        self.position = position  # kolejny numer w tabeli, unikalny w kategorii
+        self.gap_to_leader = gap_to_leader
+        self.tied = tied
+    
+    def is_leader(self) -> bool:
+        """Sprawdza czy zespół prowadzi w swojej kategorii"""
+        return self.rank == 1
@@ -0,0 +1,77 @@
+"""
+Konfiguracja produkcyjna: gunicorn zarządza kilkoma workerami uvicorn.
+
+    gunicorn -c gunicorn.conf.py main:app
+
+Aplikacja jest ładowana raz w procesie głównym (preload_app), a workery powstają
+przez fork - kod i dane tylko do odczytu są współdzielone (copy-on-write). Migracje
+wykonuje proces główny przed uruchomieniem workerów, a każdy worker po fork zaczyna
+z pustą pulą połączeń i własnym nasłuchem LISTEN/NOTIFY (startup aplikacji).
+
+Każdy worker ma osobną pulę - łącznie do WEB_CONCURRENCY * (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+połączeń. Strumienie wyników i unieważnienia cache muszą docierać do wszystkich procesów -
+przy PostgreSQL domyślnym backendem jest LISTEN/NOTIFY, a serwer z kilkoma workerami
+i backendem memory nie wystartuje (check_process_local_state).
+"""
+import gc
+import multiprocessing
+import os
+
+# Workery nie uruchamiają migracji - robi to on_starting w procesie głównym.
+# Ustawiane przed załadowaniem aplikacji (preload), więc main.py widzi już tę wartość.
+os.environ["RUN_MIGRATIONS_ON_STARTUP"] = "false"
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY") or multiprocessing.cpu_count())
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = os.getenv("PRELOAD_APP", "true").lower() in ("1", "true", "yes")
+# Strumienie SSE trzymają połączenie minutami - timeout dotyczy tylko zawieszonych workerów
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+accesslog = os.getenv("GUNICORN_ACCESS_LOG") or None
+
+
+def check_process_local_state(workers_count):
+    """
+    Stan trzymany tylko w pamięci procesu nie może obsługiwać kilku workerów - zapis
+    w jednym nie unieważniłby cache pozostałych (tokeny, wyniki, wersje dla ETag),
+    a strumienie wyników nie dostałyby zmian z innych procesów
+    """
+    if workers_count <= 1:
+        return
+    from infrastructure.broadcast import MemoryBroadcastBackend, result_broadcaster
+    from infrastructure.invalidation import cache_invalidation
+
+    for name, component in (("BROADCAST_BACKEND", result_broadcaster), ("CACHE_INVALIDATION_BACKEND", cache_invalidation)):
+        if isinstance(component.backend, MemoryBroadcastBackend):
+            raise RuntimeError(
+                f"{name}=memory działa tylko w jednym procesie, a skonfigurowano {workers_count} workerów - "
+                f"ustaw {name}=postgres albo WEB_CONCURRENCY=1"
+            )
+
+
+def on_starting(server):
+    """Migracje raz, przed uruchomieniem workerów (równoległe workery czekałyby na blokadę)"""
+    # RuntimeError zatrzymuje gunicorn z komunikatem, zanim powstanie jakikolwiek worker
+    check_process_local_state(server.cfg.workers)
+
+    from infrastructure.database import engine
+    from infrastructure.migrations import run_migrations
+
+    applied = run_migrations(engine)
+    if applied:
+        server.log.info("Zastosowane migracje: %s", ", ".join(applied))
+    # Połączenia procesu głównego nie mogą trafić do workerów
+    engine.dispose()
+
+    # Obiekty załadowane do tej pory nie będą skanowane przez GC w workerach - skanowanie
+    # zapisuje nagłówki obiektów i kopiowałoby współdzielone strony pamięci
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Worker nie może używać połączeń odziedziczonych po procesie głównym"""
+    from infrastructure.database import engine
+
+    engine.dispose(close=False)
@@ -0,0 +1,64 @@
+import os
+import zlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+from fastapi import Request
+from domain.data_version import DataVersion
+
+# Warunkowe GET (ETag / Last-Modified / 304) dla odpowiedzi liczonych z wersji danych.
+# ETag bierze się z licznika zmian (data_versions), więc sprawdzenie kosztuje jedno
+# zapytanie o jeden wiersz - bez wczytywania i serializacji wyników.
+
+# Ile sekund przeglądarki i nginx mogą użyć odpowiedzi bez pytania serwera (0 - zawsze pytają)
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "0"))
+
+def cache_control(max_age: int = HTTP_CACHE_MAX_AGE) -> str:
+    """Odpowiedź może trafić do cache współdzielonego (nginx), ale po max_age trzeba ją potwierdzić"""
+    if max_age > 0:
+        return f"public, max-age={max_age}, must-revalidate"
+    return "public, no-cache"
+
+def make_etag(version: DataVersion, request: Request) -> str:
+    """
+    Silny ETag: zakres i wersja danych oraz skrót parametrów zapytania - każda strona,
+    filtr i wybór pól to osobna reprezentacja tych samych danych
+    """
+    variant = zlib.crc32(request.url.query.encode("utf-8"))
+    return f'"{version.scope}.{version.version}.{variant:08x}"'
+
+def _as_utc(value: datetime) -> datetime:
+    # Znaczniki czasu w bazie są zapisywane bez strefy, w UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+def cache_headers(version: DataVersion, request: Request) -> Dict[str, str]:
+    """Nagłówki walidacji dołączane do odpowiedzi 200 i 304"""
+    headers = {"ETag": make_etag(version, request), "Cache-Control": cache_control()}
+    if version.updated_at is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(version.updated_at).replace(microsecond=0), usegmt=True)
+    return headers
+
+def is_not_modified(request: Request, etag: str, updated_at: Optional[datetime]) -> bool:
+    """
+    Sprawdza If-None-Match (porównanie słabe - nginx przy kompresji zamienia ETag na W/"...")
+    albo, gdy go brak, If-Modified-Since. Last-Modified ma dokładność sekundy, więc zapis
+    w tej samej sekundzie co poprzedni odczyt nigdy nie daje 304 - decyduje wtedy ETag.
+    Czas wersji jest brany przy jej zwiększeniu, a nie na początku transakcji zapisu
+    (SqlAlchemyDataVersionRepository), więc nowsza wersja nigdy nie ma starszego czasu.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+    
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and updated_at is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return _as_utc(updated_at) < since
+    return False
@@ -2,26 +2,61 @@ import os
 import httpx
 import base64
 import json
+import math
 from typing import Optional
 from jose import JWTError, jwt
+from fastapi.concurrency import run_in_threadpool
 from datetime import datetime, timedelta
 from domain.user import User
 from domain.interfaces import AuthService, UserRepository
 
+class AzureAdSettings:
+    """Konfiguracja Azure AD i JWT - czytana ze zmiennych środowiskowych raz na proces"""
+    
+    def __init__(
+        self,
+        client_id: Optional[str],
+        client_secret: Optional[str],
+        tenant_id: Optional[str],
+        jwt_secret: Optional[str]
+    ):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.tenant_id = tenant_id
+        self.jwt_secret = jwt_secret
+        
+        # Azure AD endpoints
+        self.authority = f"https://login.microsoftonline.com/{tenant_id}"
+        self.token_endpoint = f"{self.authority}/oauth2/v2.0/token"
+        self.userinfo_endpoint = "https://graph.microsoft.com/v1.0/me"
+    
+    @classmethod
+    def from_env(cls) -> "AzureAdSettings":
+        return cls(
+            client_id=os.getenv("AZURE_AD_CLIENT_ID"),
+            client_secret=os.getenv("AZURE_AD_CLIENT_SECRET"),
+            tenant_id=os.getenv("AZURE_AD_TENANT_ID"),
+            jwt_secret=os.getenv("JWT_SECRET_KEY"),
+        )
+
+# Ustawienia wspólne dla procesu - serwis jest tworzony przy każdym żądaniu
+azure_ad_settings = AzureAdSettings.from_env()
+
 class AzureAuthService(AuthService):
     """Implementacja serwisu autoryzacji z Azure AD"""
     
-    def __init__(self, user_repository: UserRepository):
+    def __init__(self, user_repository: UserRepository, settings: Optional[AzureAdSettings] = None):
         self.user_repository = user_repository
-        self.client_id = os.getenv("AZURE_AD_CLIENT_ID")
-        self.client_secret = os.getenv("AZURE_AD_CLIENT_SECRET")
-        self.tenant_id = os.getenv("AZURE_AD_TENANT_ID")
-        self.jwt_secret = os.getenv("JWT_SECRET_KEY")
+        settings = settings or azure_ad_settings
+        self.client_id = settings.client_id
+        self.client_secret = settings.client_secret
+        self.tenant_id = settings.tenant_id
+        self.jwt_secret = settings.jwt_secret
         
         # Azure AD endpoints
-        self.azure_authority = f"https://login.microsoftonline.com/{self.tenant_id}"
-        self.azure_token_endpoint = f"{self.azure_authority}/oauth2/v2.0/token"
-        self.azure_userinfo_endpoint = "https://graph.microsoft.com/v1.0/me"
+        self.azure_authority = settings.authority
+        self.azure_token_endpoint = settings.token_endpoint
+        self.azure_userinfo_endpoint = settings.userinfo_endpoint
     
     def validate_token(self, token: str) -> Optional[User]:
         """Waliduje token JWT i zwraca użytkownika"""
@@ -46,18 +81,34 @@ class AzureAuthService(AuthService):
         }
         return jwt.encode(payload, self.jwt_secret, algorithm="HS256")
     
+    @staticmethod
+    def decode_token_payload(token: str) -> Optional[dict]:
+        """Dekoduje payload tokenu JWT bez weryfikacji podpisu"""
+        parts = token.split('.')
+        if len(parts) != 3:
+            return None
+        
+        payload_bytes = base64.urlsafe_b64decode(parts[1] + '==')
+        return json.loads(payload_bytes.decode('utf-8'))
+    
+    @staticmethod
+    def token_expires_at(payload: dict) -> Optional[float]:
+        """Czas wygaśnięcia tokenu (`exp`, sekundy epoki) albo None, gdy token go nie ma"""
+        token_exp = payload.get("exp")
+        if token_exp is None:
+            return None
+        # NumericDate z JWT - liczba; tekst, bool, NaN lub nieskończoność to uszkodzony token
+        if isinstance(token_exp, bool) or not isinstance(token_exp, (int, float)) or not math.isfinite(token_exp):
+            raise ValueError(f"Nieprawidłowe pole exp tokenu: {token_exp!r}")
+        return float(token_exp)
+    
     async def verify_azure_token(self, token: str) -> Optional[User]:
         """Weryfikuje token Azure AD i zwraca użytkownika"""
         try:
-            # Dekoduj token JWT bez weryfikacji podpisu
-            parts = token.split('.')
-            if len(parts) != 3:
+            payload = self.decode_token_payload(token)
+            if payload is None:
                 return None
             
-            # Dekoduj payload
-            payload_bytes = base64.urlsafe_b64decode(parts[1] + '==')
-            payload = json.loads(payload_bytes.decode('utf-8'))
-            
             # Pobierz informacje o użytkowniku z payload
             user_email = payload.get("upn") or payload.get("email")
             user_name = payload.get("name")
@@ -66,25 +117,33 @@ class AzureAuthService(AuthService):
             if not user_email:
                 return None
             
-            # Sprawdź czy użytkownik istnieje w naszej bazie
-            user = self.user_repository.get_by_email(user_email)
+            # Uszkodzone exp odrzuca token (401) - później wyznacza czas życia wpisu w principal_cache
+            self.token_expires_at(payload)
             
-            if not user:
-                # Utwórz nowego użytkownika
-                user = User(
-                    id=user_id,
-                    email=user_email,
-                    name=user_name,
-                    roles=["admin"]
-                )
-                user = self.user_repository.create_user(user)
-            
-            return user
+            # Zapytania do bazy są synchroniczne - wykonaj je poza pętlą zdarzeń
+            return await run_in_threadpool(self._get_or_create_user, user_id, user_email, user_name)
                 
         except Exception as e:
             print(f"Błąd weryfikacji tokenu Azure: {e}")
             return None
     
+    def _get_or_create_user(self, user_id: str, user_email: str, user_name: str) -> User:
+        """Pobiera użytkownika z bazy lub tworzy go przy pierwszym logowaniu"""
+        # Sprawdź czy użytkownik istnieje w naszej bazie
+        user = self.user_repository.get_by_email(user_email)
+        
+        if not user:
+            # Utwórz nowego użytkownika
+            user = User(
+                id=user_id,
+                email=user_email,
+                name=user_name,
+                roles=["admin"]
+            )
+            user = self.user_repository.create_user(user)
+        
+        return user
+    
     def get_azure_login_url(self) -> str:
         """Zwraca URL do logowania Azure AD"""
         return f"{self.azure_authority}/oauth2/v2.0/authorize?" + \
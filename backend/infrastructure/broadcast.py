@@ -0,0 +1,252 @@
+import asyncio
+import json
+import logging
+import os
+import select
+import threading
+from typing import AsyncIterator, Callable, Dict, Optional, Set
+
+from sqlalchemy import text
+
+from infrastructure.request_metrics import outside_request
+
+logger = logging.getLogger(__name__)
+
+# Kanał Postgres LISTEN/NOTIFY dla zmian wyników
+RESULTS_CHANNEL = "ino_results"
+# NOTIFY przyjmuje do 8000 bajtów - większe zmiany są zastępowane komunikatem resync
+NOTIFY_PAYLOAD_LIMIT = 7900
+# Co ile sekund wysyłać komentarz podtrzymujący połączenie SSE (proxy zamykają bezczynne połączenia)
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+
+
+class Subscription:
+    """
+    Subskrypcja jednego klienta na zmiany wyników wydarzenia.
+    Kolejka jest ograniczona - gdy klient nie nadąża, zaległe zmiany są porzucane
+    i klient dostaje jeden komunikat `resync` (powinien wtedy pobrać wyniki od nowa).
+    """
+
+    def __init__(self, event_id: int, max_queue: int):
+        self.event_id = event_id
+        self.queue: "asyncio.Queue[bytes]" = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    def offer(self, frame: bytes) -> bool:
+        """Dokłada ramkę do kolejki; zwraca False gdy kolejka była pełna (wywoływane w pętli zdarzeń)"""
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            pass
+
+        self.dropped += 1
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(sse_frame("resync", json.dumps({"event_id": self.event_id})))
+        return False
+
+
+def sse_frame(kind: str, data: str) -> bytes:
+    """Buduje ramkę Server-Sent Events"""
+    return f"event: {kind}\ndata: {data}\n\n".encode("utf-8")
+
+
+class MemoryBroadcastBackend:
+    """Backend w pamięci - komunikaty trafiają tylko do subskrybentów tego procesu (testy, jeden worker)"""
+
+    def __init__(self):
+        self._deliver: Optional[Callable[[str], None]] = None
+
+    def start(self, deliver: Callable[[str], None]) -> None:
+        self._deliver = deliver
+
+    def publish(self, message: str) -> None:
+        if self._deliver is not None:
+            self._deliver(message)
+
+    def stop(self) -> None:
+        pass
+
+
+class PostgresBroadcastBackend:
+    """
+    Backend Postgres LISTEN/NOTIFY - komunikaty trafiają do subskrybentów wszystkich workerów.
+    Nasłuch działa w osobnym wątku na dedykowanym połączeniu (poza pulą).
+    """
+
+    def __init__(self, engine, channel: str = RESULTS_CHANNEL, poll_timeout: float = 1.0):
+        self.engine = engine
+        self.channel = channel
+        self.poll_timeout = poll_timeout
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, deliver: Callable[[str], None]) -> None:
+        self._deliver = deliver
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._listen, name="broadcast-listener", daemon=True)
+        self._thread.start()
+
+    def publish(self, message: str) -> None:
+        # NOTIFY nie wlicza się do budżetu zapytań żądania, które opublikowało zmianę
+        with outside_request(), self.engine.begin() as connection:
+            connection.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": self.channel, "payload": message})
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_timeout * 2)
+
+    def _connect(self):
+        import psycopg2
+        import psycopg2.extensions
+
+        url = self.engine.url
+        connection = psycopg2.connect(**url.translate_connect_args(username="user", database="dbname"), **url.query)
+        connection.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {self.channel}")
+        return connection
+
+    def _listen(self) -> None:
+        connection = None
+        while not self._stopped.is_set():
+            try:
+                if connection is None:
+                    connection = self._connect()
+                if select.select([connection], [], [], self.poll_timeout) == ([], [], []):
+                    continue
+                connection.poll()
+                while connection.notifies:
+                    self._deliver(connection.notifies.pop(0).payload)
+            except Exception:
+                logger.exception("Błąd nasłuchu LISTEN/NOTIFY - ponowne połączenie")
+                if connection is not None:
+                    connection.close()
+                    connection = None
+                self._stopped.wait(self.poll_timeout)
+        if connection is not None:
+            connection.close()
+
+
+class ResultBroadcaster:
+    """
+    Rozsyłanie zmian wyników do subskrybentów (fan-out).
+    Zmiana jest serializowana raz przy publikacji i raz zamieniana w ramkę SSE w każdym workerze -
+    wszyscy subskrybenci dostają ten sam obiekt bajtów, niezależnie od ich liczby.
+    Publikacja jest bezpieczna z wątków (endpointy synchroniczne działają w puli wątków).
+    """
+
+    def __init__(self, backend=None, max_queue: int = 100):
+        self.backend = backend or MemoryBroadcastBackend()
+        self.max_queue = max_queue
+        self._subscriptions: Dict[int, Set[Subscription]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.published = 0
+        self.delivered = 0
+        self.overflows = 0
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Wiąże broadcaster z pętlą zdarzeń aplikacji i uruchamia backend"""
+        self._loop = loop
+        self.backend.start(self._receive)
+
+    def stop(self) -> None:
+        self.backend.stop()
+        self._loop = None
+
+    def subscribe(self, event_id: int) -> Subscription:
+        """Tworzy subskrypcję (wywoływane w pętli zdarzeń)"""
+        subscription = Subscription(event_id, self.max_queue)
+        self._subscriptions.setdefault(event_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.event_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.event_id]
+
+    async def stream(self, event_id: int, keepalive_seconds: float = SSE_KEEPALIVE_SECONDS) -> AsyncIterator[bytes]:
+        """Strumień ramek SSE dla jednego klienta; subskrypcja jest usuwana po rozłączeniu"""
+        subscription = self.subscribe(event_id)
+        try:
+            yield b"retry: 3000\n" + sse_frame("ready", json.dumps({"event_id": event_id}))
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscription.queue.get(), timeout=keepalive_seconds)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+        finally:
+            self.unsubscribe(subscription)
+
+    def publish(self, event_id: int, kind: str, payload: dict) -> None:
+        """Publikuje zmianę; błąd backendu nie przerywa zapisu, który ją wywołał"""
+        data = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        message = f"{event_id} {kind} {data}"
+        if len(message.encode("utf-8")) > NOTIFY_PAYLOAD_LIMIT:
+            message = f"{event_id} resync {json.dumps({'event_id': event_id})}"
+        try:
+            self.backend.publish(message)
+            self.published += 1
+        except Exception:
+            logger.exception("Nie udało się opublikować zmian wyników wydarzenia %s", event_id)
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "events": len(self._subscriptions),
+            "subscribers": sum(len(subscriptions) for subscriptions in self._subscriptions.values()),
+            "max_queue": self.max_queue,
+            "published": self.published,
+            "delivered": self.delivered,
+            "overflows": self.overflows,
+        }
+
+    def _receive(self, message: str) -> None:
+        """Odbiera komunikat z backendu (dowolny wątek) i przekazuje go do pętli zdarzeń"""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        event_id, kind, data = message.split(" ", 2)
+        loop.call_soon_threadsafe(self._fan_out, int(event_id), sse_frame(kind, data))
+
+    def _fan_out(self, event_id: int, frame: bytes) -> None:
+        for subscription in list(self._subscriptions.get(event_id, ())):
+            if subscription.offer(frame):
+                self.delivered += 1
+            else:
+                self.overflows += 1
+
+
+def default_backend_name() -> str:
+    """
+    Domyślny backend komunikatów między procesami: postgres, gdy baza to PostgreSQL
+    (kilka workerów gunicorn i polecenia manage.py piszą do tej samej bazy), a memory
+    tylko dla SQLite - jeden proces w testach i lokalnie.
+    """
+    from infrastructure.database import DATABASE_URL
+
+    return "postgres" if DATABASE_URL.startswith("postgresql") else "memory"
+
+
+def _create_backend():
+    """Wybiera backend na podstawie BROADCAST_BACKEND (memory lub postgres)"""
+    backend_name = os.getenv("BROADCAST_BACKEND") or default_backend_name()
+    if backend_name == "postgres":
+        from infrastructure.database import engine
+
+        return PostgresBroadcastBackend(engine)
+    if backend_name != "memory":
+        raise ValueError(f"Nieznany BROADCAST_BACKEND: {backend_name}")
+    return MemoryBroadcastBackend()
+
+
+# Współdzielona instancja dla całego procesu
+result_broadcaster = ResultBroadcaster(
+    backend=_create_backend(),
+    max_queue=int(os.getenv("BROADCAST_QUEUE_SIZE", "100")),
+)
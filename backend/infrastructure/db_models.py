@@ -1,9 +1,46 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, ForeignKey, Text
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Boolean, Float, ForeignKey, Text, Index, JSON
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.sql import func
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.types import TypeDecorator
 
 Base = declarative_base()
 
+class CategoryList(TypeDecorator):
+    """
+    Lista kategorii wydarzenia.
+    W PostgreSQL natywna tablica VARCHAR[] (z indeksem GIN), w pozostałych bazach (SQLite) tekst JSON.
+    """
+    impl = JSON
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.ARRAY(String))
+        return dialect.type_descriptor(JSON())
+
+class categories_contain(FunctionElement):
+    """Warunek SQL: lista kategorii zawiera podaną kategorię - categories_contain(kolumna, kategoria)"""
+    type = Boolean()
+    inherit_cache = True
+    name = "categories_contain"
+
+@compiles(categories_contain, "postgresql")
+def _categories_contain_postgresql(element, compiler, **kw):
+    # Operator @> na tablicy korzysta z indeksu GIN ix_events_categories
+    column, category = list(element.clauses)
+    return f"{compiler.process(column, **kw)} @> ARRAY[{compiler.process(category, **kw)}]::VARCHAR[]"
+
+@compiles(categories_contain)
+def _categories_contain_json(element, compiler, **kw):
+    column, category = list(element.clauses)
+    return (
+        f"EXISTS (SELECT 1 FROM json_each({compiler.process(column, **kw)}) "
+        f"WHERE json_each.value = {compiler.process(category, **kw)})"
+    )
+
 class EventModel(Base):
     """Model bazy danych dla wydarzeń"""
     __tablename__ = "events"
@@ -11,7 +48,7 @@ class EventModel(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     date = Column(DateTime, nullable=False)
-    categories = Column(String, nullable=False)  # JSON string
+    categories = Column(CategoryList, nullable=False)
     location = Column(String, nullable=False)
     start_point_url = Column(String, nullable=False)
     start_time = Column(String, nullable=False)
@@ -24,6 +61,12 @@ class EventModel(Base):
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
+    # Indeksy tworzone przez migracje (migrations/) - tutaj dla kompletności modelu
+    __table_args__ = (
+        Index("ix_events_active_date_id", date, id, postgresql_where=deleted == False, sqlite_where=deleted == False),
+        Index("ix_events_categories", categories, postgresql_using="gin"),
+    )
+
 class ResultModel(Base):
     """Model bazy danych dla wyników"""
     __tablename__ = "results"
@@ -37,6 +80,77 @@ class ResultModel(Base):
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        Index(
+            "ix_results_active_event_category_created",
+            event_id, category, created_at.desc(),
+            postgresql_where=deleted == False, sqlite_where=deleted == False
+        ),
+        # Kandydaci do kompaktowania (python manage.py compact) - tylko usunięte wiersze
+        Index("ix_results_deleted_updated", updated_at, postgresql_where=deleted == True, sqlite_where=deleted == True),
+    )
+
+class ArchivedEventModel(Base):
+    """Usunięte wydarzenie przeniesione z events przez kompaktowanie (bez kluczy obcych)"""
+    __tablename__ = "events_archive"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    date = Column(DateTime, nullable=False)
+    categories = Column(CategoryList, nullable=False)
+    location = Column(String, nullable=False)
+    start_point_url = Column(String, nullable=False)
+    start_time = Column(String, nullable=False)
+    fee = Column(Float, nullable=True)
+    registration_deadline = Column(DateTime, nullable=True)
+    registered_participants = Column(Integer)
+    google_maps_url = Column(String, nullable=True)
+    google_drive_url = Column(String, nullable=True)
+    deleted = Column(Boolean)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    archived_at = Column(DateTime, nullable=False, server_default=func.now())
+
+class ArchivedResultModel(Base):
+    """Usunięty wynik przeniesiony z results przez kompaktowanie (bez kluczy obcych)"""
+    __tablename__ = "results_archive"
+
+    id = Column(Integer, primary_key=True)
+    event_id = Column(Integer, nullable=False, index=True)
+    category = Column(String, nullable=False)
+    team = Column(String, nullable=False)
+    penalty_points = Column(Integer)
+    deleted = Column(Boolean)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    archived_at = Column(DateTime, nullable=False, server_default=func.now())
+
+class StandingModel(Base):
+    """
+    Model bazy danych dla klasyfikacji - jeden wiersz na aktywny wynik.
+    Utrzymywany w tej samej transakcji co zapisy do results, posortowany indeksem.
+    """
+    __tablename__ = "standings"
+
+    result_id = Column(Integer, ForeignKey("results.id"), primary_key=True)
+    event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
+    category = Column(String, nullable=False)
+    team = Column(String, nullable=False)
+    penalty_points = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_standings_event_order", event_id, category, penalty_points, team, result_id),
+        Index("ix_standings_event_team", event_id, team),
+    )
+
+class DataVersionModel(Base):
+    """Licznik zmian zakresu danych (events, results:<event_id>) - podstawa ETagów"""
+    __tablename__ = "data_versions"
+
+    scope = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, server_default=func.now())
+
 class UserModel(Base):
     """Model bazy danych dla użytkowników"""
     __tablename__ = "users"
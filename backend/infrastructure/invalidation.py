@@ -0,0 +1,94 @@
+import logging
+import os
+import uuid
+from typing import Callable, Dict, List
+
+from infrastructure.broadcast import MemoryBroadcastBackend, PostgresBroadcastBackend, default_backend_name
+
+logger = logging.getLogger(__name__)
+
+# Kanał Postgres LISTEN/NOTIFY dla unieważnień cache (osobny od zmian wyników)
+INVALIDATION_CHANNEL = "ino_cache_invalidation"
+
+
+class CacheInvalidationBus:
+    """
+    Kanał unieważnień cache trzymanych w pamięci procesu.
+    Przy kilku workerach każdy ma własne kopie cache - zmiana zapisana w jednym workerze
+    musi usunąć wpisy we wszystkich. Unieważnienie jest stosowane lokalnie od razu,
+    a pozostałe procesy dostają je przez backend (Postgres LISTEN/NOTIFY albo pamięć w testach).
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or MemoryBroadcastBackend()
+        # Identyfikator procesu - własne komunikaty wracające z backendu są pomijane
+        self.origin = uuid.uuid4().hex[:12]
+        self._handlers: Dict[str, List[Callable[[str], None]]] = {}
+        self.published = 0
+        self.received = 0
+
+    def register(self, namespace: str, handler: Callable[[str], None]) -> None:
+        """Rejestruje funkcję usuwającą wpisy cache dla klucza z danej przestrzeni nazw"""
+        if " " in namespace:
+            raise ValueError("Nazwa przestrzeni unieważnień nie może zawierać spacji")
+        self._handlers.setdefault(namespace, []).append(handler)
+
+    def start(self) -> None:
+        """Uruchamia nasłuch - w każdym workerze osobno (po fork, przy starcie aplikacji)"""
+        # Proces potomny dziedziczy origin po procesie, który załadował aplikację (preload)
+        self.origin = uuid.uuid4().hex[:12]
+        self.backend.start(self._receive)
+
+    def stop(self) -> None:
+        self.backend.stop()
+
+    def invalidate(self, namespace: str, key: str) -> None:
+        """Unieważnia klucz w tym procesie i rozsyła unieważnienie do pozostałych"""
+        self._apply(namespace, key)
+        try:
+            self.backend.publish(f"{self.origin} {namespace} {key}")
+            self.published += 1
+        except Exception:
+            # Pozostałe workery zobaczą zmianę najpóźniej po wygaśnięciu TTL wpisów
+            logger.exception("Nie udało się rozesłać unieważnienia %s %s", namespace, key)
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "namespaces": sorted(self._handlers),
+            "published": self.published,
+            "received": self.received,
+        }
+
+    def _receive(self, message: str) -> None:
+        """Odbiera unieważnienie z backendu (wątek nasłuchu)"""
+        origin, namespace, key = message.split(" ", 2)
+        if origin == self.origin:
+            return
+        self.received += 1
+        self._apply(namespace, key)
+
+    def _apply(self, namespace: str, key: str) -> None:
+        for handler in self._handlers.get(namespace, ()):
+            try:
+                handler(key)
+            except Exception:
+                logger.exception("Błąd unieważnienia cache %s %s", namespace, key)
+
+
+def _create_backend():
+    """Wybiera backend na podstawie CACHE_INVALIDATION_BACKEND (domyślnie jak BROADCAST_BACKEND)"""
+    backend_name = (
+        os.getenv("CACHE_INVALIDATION_BACKEND") or os.getenv("BROADCAST_BACKEND") or default_backend_name()
+    )
+    if backend_name == "postgres":
+        from infrastructure.database import engine
+
+        return PostgresBroadcastBackend(engine, channel=INVALIDATION_CHANNEL)
+    if backend_name != "memory":
+        raise ValueError(f"Nieznany CACHE_INVALIDATION_BACKEND: {backend_name}")
+    return MemoryBroadcastBackend()
+
+
+# Współdzielona instancja dla całego procesu
+cache_invalidation = CacheInvalidationBus(backend=_create_backend())
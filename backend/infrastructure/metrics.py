@@ -0,0 +1,40 @@
+import threading
+from typing import Iterable, Optional
+
+# Domyślne przedziały (w sekundach) dla pomiarów czasu
+DEFAULT_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """
+    Prosty histogram z kumulatywnymi przedziałami (jak w Prometheusie).
+    Bezpieczny dla wielu wątków - obserwacje przychodzą z puli wątków FastAPI.
+    """
+
+    def __init__(self, buckets: Optional[Iterable[float]] = None):
+        self.buckets = tuple(sorted(buckets or DEFAULT_TIME_BUCKETS))
+        self._counts = [0] * len(self.buckets)
+        self._count = 0
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Zapisuje pojedynczą obserwację"""
+        with self._lock:
+            self._count += 1
+            self._sum += value
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self._counts[i] += 1
+                    break
+
+    def snapshot(self) -> dict:
+        """Zwraca kumulatywne liczniki przedziałów, liczbę i sumę obserwacji"""
+        with self._lock:
+            buckets = {}
+            cumulative = 0
+            for bound, count in zip(self.buckets, self._counts):
+                cumulative += count
+                buckets[str(bound)] = cumulative
+            buckets["+Inf"] = self._count
+            return {"buckets": buckets, "count": self._count, "sum": self._sum}
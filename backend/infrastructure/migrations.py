@@ -0,0 +1,83 @@
+import importlib
+import os
+import pkgutil
+from datetime import datetime
+from typing import List, Tuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, select, text
+from sqlalchemy.engine import Engine
+
+import migrations
+
+# Tabela z listą zastosowanych migracji
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+# Migracje przy starcie aplikacji - gunicorn.conf.py wyłącza je w workerach,
+# bo wykonuje je raz w procesie głównym
+RUN_MIGRATIONS_ON_STARTUP = os.getenv("RUN_MIGRATIONS_ON_STARTUP", "true").lower() in ("1", "true", "yes")
+
+# Dowolna stała - identyfikuje blokadę migracji w PostgreSQL
+_ADVISORY_LOCK_ID = 824_113_001
+
+
+def discover_migrations() -> List[Tuple[int, str]]:
+    """
+    Zwraca listę (wersja, nazwa modułu) z pakietu `migrations`, posortowaną po wersji.
+    Moduły nazywamy `mNNNN_opis.py` i definiujemy w nich funkcję `upgrade(connection)`.
+    """
+    found = []
+    for module_info in pkgutil.iter_modules(migrations.__path__):
+        name = module_info.name
+        if name.startswith("m") and name[1:5].isdigit():
+            found.append((int(name[1:5]), name))
+    return sorted(found)
+
+
+def applied_versions(engine: Engine) -> List[int]:
+    """Zwraca wersje migracji już zastosowanych w bazie"""
+    with engine.begin() as connection:
+        _metadata.create_all(connection, checkfirst=True)
+        return list(connection.execute(select(schema_migrations.c.version).order_by(schema_migrations.c.version)).scalars())
+
+
+def run_migrations(engine: Engine) -> List[str]:
+    """
+    Stosuje wszystkie brakujące migracje - każdą w osobnej transakcji.
+    W PostgreSQL równoległe procesy czekają na blokadę, więc migracje wykonają się raz.
+    """
+    applied = []
+    with engine.connect() as lock_connection:
+        use_lock = lock_connection.dialect.name == "postgresql"
+        if use_lock:
+            lock_connection.execute(text("SELECT pg_advisory_lock(:id)"), {"id": _ADVISORY_LOCK_ID})
+            lock_connection.commit()
+        try:
+            done = set(applied_versions(engine))
+            for version, name in discover_migrations():
+                if version in done:
+                    continue
+                module = importlib.import_module(f"migrations.{name}")
+                with engine.begin() as connection:
+                    module.upgrade(connection)
+                    connection.execute(
+                        schema_migrations.insert().values(version=version, name=name, applied_at=datetime.utcnow())
+                    )
+                applied.append(name)
+        finally:
+            if use_lock:
+                lock_connection.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": _ADVISORY_LOCK_ID})
+                lock_connection.commit()
+    return applied
+
+
+def migration_status(engine: Engine) -> List[Tuple[int, str, bool]]:
+    """Zwraca (wersja, nazwa, czy_zastosowana) dla wszystkich znanych migracji"""
+    done = set(applied_versions(engine))
+    return [(version, name, version in done) for version, name in discover_migrations()]
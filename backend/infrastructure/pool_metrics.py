@@ -0,0 +1,107 @@
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool, QueuePool
+
+from infrastructure.metrics import Histogram
+
+
+class PoolMetrics:
+    """
+    Statystyki puli połączeń zbierane ze zdarzeń puli SQLAlchemy.
+    Pozwalają odróżnić czekanie na wolne połączenie od czasu samej bazy, a czas
+    trzymania połączenia (od pobrania do oddania) pokazuje, jak długo żądania je blokują.
+    """
+
+    def __init__(self):
+        self.wait_time = Histogram()
+        self.hold_time = Histogram()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.timeouts = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self._lock = threading.Lock()
+
+    def attach(self, pool: Pool) -> None:
+        """Podpina liczniki pod zdarzenia puli"""
+        event.listen(pool, "connect", self._on_connect)
+        event.listen(pool, "checkout", self._on_checkout)
+        event.listen(pool, "checkin", self._on_checkin)
+
+    def observe_wait(self, seconds: float) -> None:
+        """Zapisuje czas oczekiwania na połączenie z puli"""
+        self.wait_time.observe(seconds)
+
+    def record_timeout(self) -> None:
+        """Zlicza nieudane pobranie połączenia (przekroczony pool_timeout)"""
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool: Pool) -> dict:
+        """Zwraca aktualny stan puli razem z licznikami i histogramem czasu oczekiwania"""
+        status = {"pool_class": type(pool).__name__, "status": pool.status()}
+        if isinstance(pool, QueuePool):
+            status.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+                "timeout": pool.timeout(),
+            })
+
+        with self._lock:
+            status.update({
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "timeouts": self.timeouts,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+            })
+        status["wait_time_seconds"] = self.wait_time.snapshot()
+        status["hold_time_seconds"] = self.hold_time.snapshot()
+        return status
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        # Połączenie odłączone od puli może wrócić bez rekordu
+        checked_out_at = connection_record.info.pop("checked_out_at", None) if connection_record is not None else None
+        if checked_out_at is not None:
+            self.hold_time.observe(time.perf_counter() - checked_out_at)
+        with self._lock:
+            self.checkins += 1
+            if checked_out_at is not None:
+                self.in_use -= 1
+
+
+# Współdzielona instancja dla engine aplikacji
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool mierzący czas oczekiwania na wolne połączenie"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        finally:
+            pool_metrics.observe_wait(time.perf_counter() - started)
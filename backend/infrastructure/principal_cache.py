@@ -0,0 +1,135 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from domain.user import User
+from infrastructure.invalidation import cache_invalidation
+
+# Przestrzeń unieważnień - kluczem jest ID użytkownika
+PRINCIPAL_NAMESPACE = "principal"
+
+
+class PrincipalCache:
+    """
+    Cache zweryfikowanych użytkowników (principal) kluczowany skrótem tokenu.
+    Ograniczony rozmiarem (LRU) i czasem życia - wpis nigdy nie żyje dłużej niż `exp` tokenu.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 300.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, User]]" = OrderedDict()
+        self._digests_by_user: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Cache jest wyłączony gdy rozmiar lub TTL wynosi 0"""
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    @staticmethod
+    def token_digest(token: str) -> str:
+        """Zwraca skrót tokenu - surowe tokeny nie są trzymane w pamięci"""
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[User]:
+        """Zwraca użytkownika dla tokenu lub None gdy brak ważnego wpisu"""
+        if not self.enabled:
+            return None
+
+        digest = self.token_digest(token)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, user = entry
+            if expires_at <= time.time():
+                self._remove(digest)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return user
+
+    def put(self, token: str, user: User, token_expires_at: Optional[float] = None) -> None:
+        """Zapisuje użytkownika; `token_expires_at` to `exp` tokenu (sekundy epoki)"""
+        if not self.enabled:
+            return
+
+        expires_at = time.time() + self.ttl_seconds
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+        if expires_at <= time.time():
+            return
+
+        digest = self.token_digest(token)
+        with self._lock:
+            if digest in self._entries:
+                self._remove(digest)
+            self._entries[digest] = (expires_at, user)
+            self._digests_by_user.setdefault(user.id, set()).add(digest)
+
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Usuwa wszystkie wpisy danego użytkownika (np. po zmianie ról)"""
+        with self._lock:
+            digests = self._digests_by_user.pop(user_id, set())
+            for digest in digests:
+                self._entries.pop(digest, None)
+            self.invalidations += len(digests)
+
+    def clear(self) -> None:
+        """Czyści cały cache"""
+        with self._lock:
+            self._entries.clear()
+            self._digests_by_user.clear()
+
+    def stats(self) -> dict:
+        """Zwraca liczniki trafień i chybień"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, digest: str) -> None:
+        """Usuwa wpis razem z indeksem użytkownika (wywoływane pod lockiem)"""
+        entry = self._entries.pop(digest, None)
+        if entry is None:
+            return
+        user_id = entry[1].id
+        digests = self._digests_by_user.get(user_id)
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del self._digests_by_user[user_id]
+
+
+# Współdzielona instancja dla całego procesu
+principal_cache = PrincipalCache(
+    max_size=int(os.getenv("AUTH_CACHE_MAX_SIZE", "1024")),
+    ttl_seconds=float(os.getenv("AUTH_CACHE_TTL_SECONDS", "300")),
+)
+# Zmiana ról lub aktywności w dowolnym workerze usuwa wpisy użytkownika we wszystkich
+cache_invalidation.register(PRINCIPAL_NAMESPACE, principal_cache.invalidate_user)
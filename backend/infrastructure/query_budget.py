@@ -0,0 +1,74 @@
+import logging
+import os
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# off - bez sprawdzania, warn - ostrzeżenie w logu, raise - wyjątek (testy, benchmarki)
+QUERY_BUDGET_MODE = os.getenv("QUERY_BUDGET_MODE", "warn").lower()
+QUERY_BUDGET_MODES = ("off", "warn", "raise")
+if QUERY_BUDGET_MODE not in QUERY_BUDGET_MODES:
+    raise ValueError(f"Nieznany QUERY_BUDGET_MODE: {QUERY_BUDGET_MODE}")
+
+# Ile zapytań pokazać w raporcie przekroczenia
+MAX_REPORTED_STATEMENTS = 20
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Żądanie wykonało więcej zapytań SQL niż przewiduje budżet trasy"""
+
+    def __init__(self, label: str, budget: int, queries: int, statements: List[Tuple[str, float]]):
+        self.label = label
+        self.budget = budget
+        self.queries = queries
+        self.statements = statements
+        super().__init__(format_budget_report(label, budget, queries, statements))
+
+
+def query_budget(limit: int) -> Callable:
+    """
+    Dekorator endpointu - maksymalna liczba zapytań SQL na jedno żądanie, łącznie
+    z zależnościami (sesja, uwierzytelnienie). Sprawdza go MetricsMiddleware.
+    Funkcja nie jest opakowywana, więc FastAPI widzi jej oryginalną sygnaturę.
+    """
+    if limit < 0:
+        raise ValueError("Budżet zapytań nie może być ujemny")
+
+    def mark(endpoint: Callable) -> Callable:
+        endpoint.query_budget = limit
+        return endpoint
+    return mark
+
+
+def budget_of(endpoint: Optional[Callable]) -> Optional[int]:
+    """Budżet zapytań endpointu albo None, gdy trasa go nie ma"""
+    return getattr(endpoint, "query_budget", None)
+
+
+def format_budget_report(label: str, budget: int, queries: int, statements: List[Tuple[str, float]]) -> str:
+    """
+    Opis przekroczenia z listą zapamiętanych zapytań - żądanie zapamiętuje je tylko do
+    pierwszego ponad budżet (najwyżej MAX_REPORTED_STATEMENTS), pozostałe są tylko liczone
+    """
+    lines = [f"{label}: {queries} zapytań SQL przy budżecie {budget}"]
+    for number, (statement, seconds) in enumerate(statements[:MAX_REPORTED_STATEMENTS], start=1):
+        lines.append(f"  {number}. [{seconds * 1000:.1f} ms] {' '.join(statement.split())}")
+    shown = min(len(statements), MAX_REPORTED_STATEMENTS)
+    if queries > shown:
+        lines.append(f"  ... i {queries - shown} kolejnych")
+    return "\n".join(lines)
+
+
+def enforce_budget(
+    label: str,
+    budget: Optional[int],
+    queries: int,
+    statements: List[Tuple[str, float]],
+    mode: str = QUERY_BUDGET_MODE
+) -> None:
+    """Zgłasza przekroczenie budżetu zgodnie z trybem (warn/raise)"""
+    if budget is None or mode == "off" or queries <= budget:
+        return
+    if mode == "raise":
+        raise QueryBudgetExceeded(label, budget, queries, statements)
+    logger.warning(format_budget_report(label, budget, queries, statements))
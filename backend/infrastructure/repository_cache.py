@@ -0,0 +1,300 @@
+import math
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from infrastructure.broadcast import MemoryBroadcastBackend
+from infrastructure.invalidation import cache_invalidation
+
+# Przestrzeń unieważnień - kluczem jest zakres danych (events, results:<event_id>)
+REPOSITORY_NAMESPACE = "repository"
+
+# Znacznik braku wpisu - None jest poprawną wartością w cache (np. brak wydarzenia)
+MISSING = object()
+
+
+class MemoryCacheBackend:
+    """
+    Cache w pamięci procesu: LRU ograniczone liczbą wpisów i TTL.
+    Liczniki generacji są trzymane osobno i nie podlegają wypieraniu.
+    """
+
+    shared = False
+
+    def __init__(self, max_size: int = 1000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_counter(self, key: str) -> int:
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class RedisCacheBackend:
+    """
+    Cache współdzielony przez wszystkie workery (Redis). Wartości są serializowane przez
+    pickle - Redis musi być zaufaną, wewnętrzną usługą. Rozmiar ogranicza sam Redis
+    (maxmemory z polityką allkeys-lru), TTL ustawiany jest przy zapisie.
+    Wymaga pakietu redis; w testach zamiast klienta można podać LocalRedisStandIn.
+    """
+
+    shared = True
+
+    def __init__(self, url: Optional[str] = None, client=None, prefix: str = "ino:"):
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+        self.evictions = 0
+
+    def get(self, key: str) -> Any:
+        raw = self.client.get(self.prefix + key)
+        return MISSING if raw is None else pickle.loads(raw)
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        self.client.set(self.prefix + key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), px=math.ceil(ttl_seconds * 1000))
+
+    def get_counter(self, key: str) -> int:
+        return int(self.client.get(self.prefix + key) or 0)
+
+    def incr(self, key: str) -> int:
+        return self.client.incr(self.prefix + key)
+
+    def clear(self) -> None:
+        # Wpisy wygasną same - zmiana generacji wszystkich zakresów nie jest tu potrzebna
+        pass
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class LocalRedisStandIn:
+    """Zastępstwo klienta Redis w jednym procesie (testy) - tylko get/set z px/incr"""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[Optional[float], bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: str, value: bytes, px: Optional[int] = None) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + px / 1000 if px else None, value)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            _, value = self._data.get(key, (None, b"0"))
+            number = int(value) + 1
+            self._data[key] = (None, str(number).encode("ascii"))
+            return number
+
+
+class _MethodStats:
+    __slots__ = ("hits", "misses", "coalesced")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+
+class RepositoryCache:
+    """
+    Cache odczytów repozytoriów (read-through) z unieważnianiem przez generacje.
+    Klucz wpisu zawiera generację zakresu danych - zapis zwiększa generację, więc stare
+    wpisy przestają być czytane od razu (i wypadają przez LRU/TTL). Przy cache w pamięci
+    zmiana generacji jest rozsyłana do pozostałych workerów przez cache_invalidation.
+
+    Przy chybieniu wczytuje tylko jeden wątek na klucz - pozostałe czekają na jego wynik
+    (ochrona przed lawiną identycznych zapytań, gdy wygasa popularny wpis).
+    Zwracane obiekty są współdzielone między żądaniami - wywołujący nie może ich zmieniać.
+
+    Cache w pamięci z kanałem unieważnień memory działa tylko w jednym procesie (process_local):
+    zapisy innych workerów i poleceń manage.py nie docierają do niego przed upływem TTL.
+    """
+
+    def __init__(self, backend=None, ttl_seconds: float = 30.0, invalidation=None):
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.ttl_seconds = ttl_seconds
+        self.invalidation = invalidation
+        self.invalidations = 0
+        self._stats: Dict[str, _MethodStats] = {}
+        self._key_locks: Dict[str, list] = {}
+        self._lock = threading.Lock()
+        if invalidation is not None and not self.backend.shared:
+            invalidation.register(REPOSITORY_NAMESPACE, self._bump_local)
+
+    @property
+    def process_local(self) -> bool:
+        """Czy unieważnienia z tego procesu nie docierają do żadnego innego"""
+        if self.backend.shared:
+            return False
+        return self.invalidation is None or isinstance(self.invalidation.backend, MemoryBroadcastBackend)
+
+    def get_or_load(self, method: str, scope: str, args: Hashable, loader: Callable[[], Any]) -> Any:
+        """Zwraca wartość z cache albo wczytuje ją przez loader (jeden wątek na klucz)"""
+        stats = self._method_stats(method)
+        key = f"{method}:{scope}:{self.backend.get_counter(self._generation_key(scope))}:{args!r}"
+        value = self.backend.get(key)
+        if value is not MISSING:
+            stats.hits += 1
+            return value
+
+        with self._key_lock(key):
+            # Inny wątek mógł wczytać wartość, gdy czekaliśmy na blokadę
+            value = self.backend.get(key)
+            if value is not MISSING:
+                stats.coalesced += 1
+                return value
+            stats.misses += 1
+            value = loader()
+            self.backend.set(key, value, self.ttl_seconds)
+            return value
+
+    def invalidate(self, scope: str) -> None:
+        """Zwiększa generację zakresu - wywoływane po zatwierdzeniu zapisu"""
+        self.invalidations += 1
+        if self.backend.shared or self.invalidation is None:
+            self.backend.incr(self._generation_key(scope))
+        else:
+            self.invalidation.invalidate(REPOSITORY_NAMESPACE, scope)
+
+    def clear(self) -> None:
+        """Usuwa wpisy tego procesu (backend współdzielony - wpisy wygasną po TTL)"""
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            methods = {
+                name: {"hits": stats.hits, "misses": stats.misses, "coalesced": stats.coalesced}
+                for name, stats in sorted(self._stats.items())
+            }
+        hits = sum(method["hits"] + method["coalesced"] for method in methods.values())
+        lookups = hits + sum(method["misses"] for method in methods.values())
+        return {
+            "backend": type(self.backend).__name__,
+            "process_local": self.process_local,
+            "ttl_seconds": self.ttl_seconds,
+            "entries": self.backend.size(),
+            "evictions": self.backend.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": round(hits / lookups, 4) if lookups else None,
+            "methods": methods,
+        }
+
+    @staticmethod
+    def _generation_key(scope: str) -> str:
+        return f"generation:{scope}"
+
+    def _bump_local(self, scope: str) -> None:
+        self.backend.incr(self._generation_key(scope))
+
+    def _method_stats(self, method: str) -> _MethodStats:
+        stats = self._stats.get(method)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(method, _MethodStats())
+        return stats
+
+    def _key_lock(self, key: str) -> "_KeyLock":
+        return _KeyLock(self, key)
+
+
+class _KeyLock:
+    """Blokada jednego klucza; wpis w słowniku blokad żyje tylko, gdy ktoś na nią czeka"""
+
+    __slots__ = ("cache", "key", "lock")
+
+    def __init__(self, cache: RepositoryCache, key: str):
+        self.cache = cache
+        self.key = key
+
+    def __enter__(self):
+        with self.cache._lock:
+            entry = self.cache._key_locks.get(self.key)
+            if entry is None:
+                entry = self.cache._key_locks[self.key] = [threading.Lock(), 0]
+            entry[1] += 1
+            self.lock = entry[0]
+        self.lock.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.lock.release()
+        with self.cache._lock:
+            entry = self.cache._key_locks[self.key]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self.cache._key_locks[self.key]
+
+
+def _create_repository_cache() -> Optional[RepositoryCache]:
+    """Tworzy cache na podstawie REPOSITORY_CACHE_BACKEND (memory, redis lub off)"""
+    backend_name = os.getenv("REPOSITORY_CACHE_BACKEND", "memory")
+    if backend_name == "off":
+        return None
+    if backend_name == "memory":
+        backend = MemoryCacheBackend(max_size=int(os.getenv("REPOSITORY_CACHE_MAX_SIZE", "1000")))
+    elif backend_name == "redis":
+        backend = RedisCacheBackend(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    else:
+        raise ValueError(f"Nieznany REPOSITORY_CACHE_BACKEND: {backend_name}")
+    return RepositoryCache(
+        backend=backend,
+        ttl_seconds=float(os.getenv("REPOSITORY_CACHE_TTL_SECONDS", "30")),
+        invalidation=cache_invalidation,
+    )
+
+
+# Współdzielona instancja dla całego procesu (None - cache wyłączony)
+repository_cache = _create_repository_cache()
@@ -0,0 +1,346 @@
+import hmac
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+from starlette.datastructures import MutableHeaders
+
+from infrastructure.metrics import Histogram
+from infrastructure.pool_metrics import pool_metrics
+from infrastructure.query_budget import MAX_REPORTED_STATEMENTS, QUERY_BUDGET_MODE, budget_of, enforce_budget
+
+# Nagłówek Server-Timing z podziałem czasu żądania na bazę i Pythona
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Token wymagany przez GET /metrics (Authorization: Bearer <token>); pusty - bez tokenu,
+# wtedy endpoint musi być osiągalny tylko z sieci wewnętrznej
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Przedziały liczby zapytań SQL na żądanie - duże wartości zdradzają problem N+1
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+# Etykieta żądań, które nie trafiły w żadną trasę (404) - bez surowej ścieżki,
+# żeby skanery nie tworzyły osobnej serii dla każdego adresu
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestStats:
+    """
+    Liczba zapytań SQL i czas bazy w ramach jednego żądania HTTP.
+    Przy record_statements=True zapamiętuje też treść zapytań (do raportu budżetu). Ze scope
+    żądania HTTP tylko na trasach z budżetem i tylko do pierwszego zapytania ponad budżet
+    (najwyżej MAX_REPORTED_STATEMENTS) - trasy bez budżetu, np. import, mogą wykonać
+    dowolnie wiele zapytań, a do raportu wystarczy ich liczba.
+    """
+
+    __slots__ = ("queries", "db_seconds", "statements", "scope")
+
+    def __init__(self, record_statements: bool = False, scope: Optional[dict] = None):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.statements: Optional[List[Tuple[str, float]]] = [] if record_statements else None
+        self.scope = scope
+
+    def record(self, statement: Optional[str], seconds: float) -> None:
+        """Zapisuje wykonane zapytanie"""
+        self.queries += 1
+        self.db_seconds += seconds
+        if self.statements is None:
+            return
+        if self.scope is not None:
+            # Router zapisuje dopasowaną trasę w scope, zanim uruchomi zależności endpointu
+            budget = budget_of(getattr(self.scope.get("route"), "endpoint", None))
+            if budget is None or len(self.statements) > min(budget, MAX_REPORTED_STATEMENTS - 1):
+                return
+        self.statements.append((statement or "", seconds))
+
+
+# Statystyki bieżącego żądania. Kontekst jest kopiowany do puli wątków FastAPI, więc
+# zapytania z synchronicznych endpointów trafiają do tego samego obiektu RequestStats.
+_current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+
+class _RouteMetrics:
+    """Histogramy jednej trasy (metoda + szablon ścieżki)"""
+
+    def __init__(self):
+        self.duration = Histogram()
+        self.db_duration = Histogram()
+        self.db_queries = Histogram(QUERY_COUNT_BUCKETS)
+
+
+class RequestMetrics:
+    """
+    Metryki żądań HTTP i zapytań SQL w formacie tekstowym Prometheusa.
+    Liczniki są per proces - przy kilku workerach każdy raportuje własne wartości.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self.queries = 0
+        self.query_duration = Histogram()
+        self._routes: Dict[Tuple[str, str], _RouteMetrics] = {}
+        self._statuses: Dict[Tuple[str, str, int], int] = {}
+        self._lock = threading.Lock()
+
+    def attach(self, engine: Engine) -> None:
+        """Podpina liczenie zapytań i czasu bazy pod zdarzenia engine"""
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+
+    def request_started(self, record_statements: bool = False, scope: Optional[dict] = None) -> RequestStats:
+        with self._lock:
+            self.in_flight += 1
+        return RequestStats(record_statements, scope)
+
+    def request_finished(self, method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+        """Zapisuje zakończone żądanie w histogramach trasy"""
+        with self._lock:
+            self.in_flight -= 1
+            key = (method, route, status)
+            self._statuses[key] = self._statuses.get(key, 0) + 1
+            metrics = self._routes.get((method, route))
+            if metrics is None:
+                metrics = self._routes[(method, route)] = _RouteMetrics()
+        metrics.duration.observe(seconds)
+        metrics.db_duration.observe(stats.db_seconds)
+        metrics.db_queries.observe(stats.queries)
+
+    def route_queries(self, method: str, route: str) -> int:
+        """Suma zapytań SQL wliczonych do żądań trasy (bez zapytań poza żądaniem, np. NOTIFY)"""
+        with self._lock:
+            metrics = self._routes.get((method, route))
+        return int(metrics.db_queries.snapshot()["sum"]) if metrics is not None else 0
+
+    def render(self, pool: Optional[Pool] = None, cache_stats: Optional[dict] = None) -> str:
+        """Zwraca wszystkie metryki w formacie tekstowym Prometheusa (text/plain; version=0.0.4)"""
+        with self._lock:
+            in_flight = self.in_flight
+            queries = self.queries
+            routes = sorted(self._routes.items())
+            statuses = sorted(self._statuses.items())
+
+        lines: List[str] = []
+        lines += _header("http_requests_in_flight", "gauge", "Żądania HTTP w trakcie obsługi")
+        lines.append(f"http_requests_in_flight {in_flight}")
+
+        lines += _header("http_requests_total", "counter", "Zakończone żądania HTTP według trasy i statusu")
+        for (method, route, status), count in statuses:
+            lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+
+        lines += _header("http_request_duration_seconds", "histogram", "Czas obsługi żądania HTTP")
+        for (method, route), metrics in routes:
+            lines += _histogram("http_request_duration_seconds", metrics.duration.snapshot(), method=method, route=route)
+
+        lines += _header("http_request_db_duration_seconds", "histogram", "Czas zapytań SQL w ramach żądania")
+        for (method, route), metrics in routes:
+            lines += _histogram("http_request_db_duration_seconds", metrics.db_duration.snapshot(), method=method, route=route)
+
+        lines += _header("http_request_db_queries", "histogram", "Liczba zapytań SQL na żądanie")
+        for (method, route), metrics in routes:
+            lines += _histogram("http_request_db_queries", metrics.db_queries.snapshot(), method=method, route=route)
+
+        lines += _header("db_queries_total", "counter", "Wszystkie zapytania SQL (także poza żądaniami HTTP)")
+        lines.append(f"db_queries_total {queries}")
+        lines += _header("db_query_duration_seconds", "histogram", "Czas pojedynczego zapytania SQL")
+        lines += _histogram("db_query_duration_seconds", self.query_duration.snapshot())
+
+        if pool is not None:
+            lines += _pool_lines(pool_metrics.snapshot(pool))
+        if cache_stats is not None:
+            lines += _repository_cache_lines(cache_stats)
+        return "\n".join(lines) + "\n"
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # Stos, bo zapytanie może zostać wykonane w trakcie innego (np. przez zdarzenia)
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self._query_finished(conn, statement)
+
+    def _handle_error(self, exception_context):
+        if exception_context.connection is not None:
+            self._query_finished(exception_context.connection, exception_context.statement)
+
+    def _query_finished(self, conn, statement: Optional[str]) -> None:
+        started = conn.info.get("query_started")
+        if not started:
+            return
+        seconds = time.perf_counter() - started.pop()
+        self.query_duration.observe(seconds)
+        with self._lock:
+            self.queries += 1
+        stats = _current_request.get()
+        if stats is not None:
+            stats.record(statement, seconds)
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI mierzące każde żądanie HTTP. Trasa jest opisywana szablonem ścieżki
+    (np. /results/{event_id}), a odpowiedź dostaje nagłówek Server-Timing z czasem bazy
+    (db), czasem Pythona (app) i czasem całkowitym - liczonym do wysłania nagłówków.
+    Po zakończeniu żądania sprawdza budżet zapytań trasy (@query_budget).
+    """
+
+    def __init__(
+        self,
+        app,
+        metrics: Optional[RequestMetrics] = None,
+        server_timing: bool = SERVER_TIMING_ENABLED,
+        budget_mode: str = QUERY_BUDGET_MODE
+    ):
+        self.app = app
+        self.metrics = metrics or request_metrics
+        self.server_timing = server_timing
+        self.budget_mode = budget_mode
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        stats = self.metrics.request_started(record_statements=self.budget_mode != "off", scope=scope)
+        token = _current_request.set(stats)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", server_timing_header(stats, time.perf_counter() - started))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_request.reset(token)
+            # Router FastAPI zapisuje dopasowaną trasę w tym samym słowniku scope
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            self.metrics.request_finished(scope["method"], route_path, status, time.perf_counter() - started, stats)
+
+        # Poza finally - wyjątek aplikacji ma pierwszeństwo przed raportem budżetu
+        if stats.statements is not None:
+            enforce_budget(
+                f"{scope['method']} {route_path}", budget_of(getattr(route, "endpoint", None)),
+                stats.queries, stats.statements, self.budget_mode
+            )
+
+
+@contextmanager
+def count_queries() -> Iterator[RequestStats]:
+    """
+    Liczy zapytania SQL wykonane w bloku (np. w teście albo skrypcie):
+
+        with count_queries() as stats:
+            repository.get_by_id(1)
+        assert stats.queries == 1, stats.statements
+    """
+    stats = RequestStats(record_statements=True)
+    token = _current_request.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_request.reset(token)
+
+
+@contextmanager
+def outside_request() -> Iterator[None]:
+    """
+    Zapytania w bloku nie są liczone do bieżącego żądania (budżet, Server-Timing), tylko do
+    db_queries_total - np. NOTIFY kanałów między procesami, który nie jest pracą samego endpointu
+    """
+    token = _current_request.set(None)
+    try:
+        yield
+    finally:
+        _current_request.reset(token)
+
+
+def server_timing_header(stats: RequestStats, total_seconds: float) -> str:
+    """Wartość nagłówka Server-Timing, np. db;dur=12.3;desc="4 queries", app;dur=3.1, total;dur=15.4"""
+    db_ms = stats.db_seconds * 1000
+    total_ms = total_seconds * 1000
+    app_ms = max(total_ms - db_ms, 0.0)
+    return f'db;dur={db_ms:.1f};desc="{stats.queries} queries", app;dur={app_ms:.1f}, total;dur={total_ms:.1f}'
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _header(name: str, kind: str, description: str) -> List[str]:
+    return [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+
+
+def _histogram(name: str, snapshot: dict, **labels) -> List[str]:
+    lines = [
+        f"{name}_bucket{_labels(**labels, le=bound)} {count}"
+        for bound, count in snapshot["buckets"].items()
+    ]
+    lines.append(f"{name}_sum{_labels(**labels)} {snapshot['sum']}")
+    lines.append(f"{name}_count{_labels(**labels)} {snapshot['count']}")
+    return lines
+
+
+def _pool_lines(snapshot: dict) -> List[str]:
+    """Stan puli połączeń z PoolMetrics jako metryki Prometheusa"""
+    lines: List[str] = []
+    for key in ("size", "checked_out", "overflow"):
+        if key in snapshot:
+            lines += _header(f"db_pool_{key}", "gauge", f"Pula połączeń: {key}")
+            lines.append(f"db_pool_{key} {snapshot[key]}")
+    for key in ("connects", "checkouts", "timeouts"):
+        lines += _header(f"db_pool_{key}_total", "counter", f"Pula połączeń: {key}")
+        lines.append(f"db_pool_{key}_total {snapshot[key]}")
+    lines += _header("db_pool_peak_in_use", "gauge", "Najwięcej połączeń pobranych z puli jednocześnie")
+    lines.append(f"db_pool_peak_in_use {snapshot['peak_in_use']}")
+    lines += _header("db_pool_wait_seconds", "histogram", "Czas oczekiwania na połączenie z puli")
+    lines += _histogram("db_pool_wait_seconds", snapshot["wait_time_seconds"])
+    lines += _header("db_pool_hold_seconds", "histogram", "Czas od pobrania połączenia z puli do jego oddania")
+    lines += _histogram("db_pool_hold_seconds", snapshot["hold_time_seconds"])
+    return lines
+
+
+def _repository_cache_lines(stats: dict) -> List[str]:
+    """Trafienia i chybienia cache repozytoriów (RepositoryCache.stats) jako metryki Prometheusa"""
+    lines: List[str] = []
+    for key, description in (("hits", "trafienia"), ("misses", "chybienia - odczyt z bazy"), ("coalesced", "trafienia po czekaniu na odczyt innego wątku")):
+        lines += _header(f"repository_cache_{key}_total", "counter", f"Cache repozytoriów: {description}")
+        for method, counters in stats["methods"].items():
+            lines.append(f"repository_cache_{key}_total{_labels(method=method)} {counters[key]}")
+    for key in ("evictions", "invalidations"):
+        lines += _header(f"repository_cache_{key}_total", "counter", f"Cache repozytoriów: {key}")
+        lines.append(f"repository_cache_{key}_total {stats[key]}")
+    if stats["entries"] is not None:
+        lines += _header("repository_cache_entries", "gauge", "Cache repozytoriów: liczba wpisów")
+        lines.append(f"repository_cache_entries {stats['entries']}")
+    return lines
+
+
+# Wspólny rejestr metryk procesu
+request_metrics = RequestMetrics()
+
+
+def metrics_authorized(authorization: Optional[str]) -> bool:
+    """Czy nagłówek Authorization pozwala odczytać /metrics (METRICS_TOKEN)"""
+    if not METRICS_TOKEN:
+        return True
+    return hmac.compare_digest(authorization or "", f"Bearer {METRICS_TOKEN}")
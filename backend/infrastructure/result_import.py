@@ -0,0 +1,148 @@
+import csv
+import io
+import xml.etree.ElementTree as ET
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+
+# Nazwy kolumn akceptowane w plikach CSV (małe litery, bez spacji na końcach)
+CSV_COLUMN_ALIASES = {
+    "category": ("category", "kategoria", "class"),
+    "team": ("team", "zespol", "zespół", "name", "nazwa"),
+    "penalty_points": ("penalty_points", "punkty_karne", "punkty", "penalty", "score"),
+}
+
+# Typy elementu Score w IOF XML uznawane za punkty karne (w kolejności preferencji)
+IOF_PENALTY_SCORE_TYPES = ("penalty", "penaltypoints", "penalty_points", "")
+
+ImportRecord = Tuple[int, Dict[str, Optional[str]]]
+
+
+def iter_csv_records(stream: BinaryIO) -> Iterator[ImportRecord]:
+    """
+    Czyta plik CSV wiersz po wierszu i zwraca (numer_wiersza, rekord).
+    Rozpoznaje separator (`,` lub `;`) i nazwy kolumn po polsku lub angielsku.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    header_line = text.readline()
+    if not header_line.strip():
+        return
+
+    delimiter = ";" if header_line.count(";") > header_line.count(",") else ","
+    header = [name.strip().lower() for name in next(csv.reader([header_line], delimiter=delimiter))]
+
+    columns = {}
+    for field, aliases in CSV_COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in header:
+                columns[field] = header.index(alias)
+                break
+    missing = [field for field in ("category", "team") if field not in columns]
+    if missing:
+        raise ValueError(f"Brak wymaganych kolumn CSV: {', '.join(missing)}")
+
+    # Wiersz 1 to nagłówek - numeracja odpowiada liniom pliku
+    for row_number, row in enumerate(csv.reader(text, delimiter=delimiter), start=2):
+        if not any(value.strip() for value in row):
+            continue
+        yield row_number, {
+            field: (row[index].strip() if index < len(row) else None)
+            for field, index in columns.items()
+        }
+
+
+def iter_iof_xml_records(stream: BinaryIO) -> Iterator[ImportRecord]:
+    """
+    Czyta ResultList w formacie IOF XML 3.0 strumieniowo (iterparse) i zwraca (numer_wyniku, rekord).
+    Kategorią jest Class/Name, zespołem TeamResult/Name albo imię i nazwisko z PersonResult,
+    a punktami karnymi element Result/Score (preferowany type="Penalty").
+    Przetworzone elementy są czyszczone, więc pamięć nie rośnie z rozmiarem pliku.
+    """
+    category = None
+    result_number = 0
+    depth_stack = []
+
+    for event, element in ET.iterparse(stream, events=("start", "end")):
+        tag = _local_name(element.tag)
+
+        if event == "start":
+            depth_stack.append(tag)
+            continue
+
+        depth_stack.pop()
+        parent = depth_stack[-1] if depth_stack else None
+
+        if tag == "Name" and parent == "Class":
+            category = (element.text or "").strip()
+        elif tag in ("PersonResult", "TeamResult") and parent == "ClassResult":
+            result_number += 1
+            yield result_number, {
+                "category": category,
+                "team": _iof_team_name(element),
+                "penalty_points": _iof_penalty_points(element),
+            }
+            element.clear()
+        elif tag == "ClassResult":
+            category = None
+            element.clear()
+
+
+IMPORT_FORMATS = {"csv": iter_csv_records, "iof": iter_iof_xml_records}
+
+
+def detect_import_format(filename: Optional[str]) -> str:
+    """Zgaduje format pliku po rozszerzeniu (domyślnie CSV)"""
+    if filename and filename.lower().endswith(".xml"):
+        return "iof"
+    return "csv"
+
+
+def iter_import_records(stream: BinaryIO, import_format: str) -> Iterator[ImportRecord]:
+    """Zwraca czytnik rekordów dla wskazanego formatu"""
+    reader = IMPORT_FORMATS.get(import_format)
+    if reader is None:
+        raise ValueError(f"Nieobsługiwany format importu: {import_format} (dostępne: {', '.join(IMPORT_FORMATS)})")
+    return reader(stream)
+
+
+def _local_name(tag: str) -> str:
+    """Usuwa przestrzeń nazw z nazwy elementu"""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child(element: ET.Element, name: str) -> Optional[ET.Element]:
+    for child in element:
+        if _local_name(child.tag) == name:
+            return child
+    return None
+
+
+def _iof_team_name(element: ET.Element) -> Optional[str]:
+    """Nazwa zespołu z TeamResult/Name lub imię i nazwisko z PersonResult/Person/Name"""
+    name = _child(element, "Name")
+    if name is not None and (name.text or "").strip():
+        return name.text.strip()
+
+    person = _child(element, "Person")
+    person_name = _child(person, "Name") if person is not None else None
+    if person_name is not None:
+        parts = [
+            (part.text or "").strip()
+            for part in (_child(person_name, "Given"), _child(person_name, "Family"))
+            if part is not None
+        ]
+        full_name = " ".join(part for part in parts if part)
+        if full_name:
+            return full_name
+    return None
+
+
+def _iof_penalty_points(element: ET.Element) -> Optional[str]:
+    """Wartość elementu Score z wyniku - preferuje typ oznaczający punkty karne"""
+    scores = {}
+    for node in element.iter():
+        if _local_name(node.tag) == "Score" and (node.text or "").strip():
+            scores.setdefault((node.get("type") or "").strip().lower(), node.text.strip())
+
+    for score_type in IOF_PENALTY_SCORE_TYPES:
+        if score_type in scores:
+            return scores[score_type]
+    return next(iter(scores.values()), None)
@@ -0,0 +1,71 @@
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# Łączenie równoczesnych identycznych odczytów (wyłączenie: SINGLE_FLIGHT_ENABLED=false)
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+class _Call:
+    """Trwające wywołanie - wynik albo wyjątek odbierają wszyscy oczekujący"""
+
+    __slots__ = ("done", "value", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Łączy równoczesne wywołania z tym samym kluczem: pierwsze wykonuje funkcję, pozostałe
+    czekają na jego wynik zamiast powtarzać zapytanie. Nie jest to cache - po zakończeniu
+    wywołania klucz jest zwalniany, a kolejne żądanie wykonuje funkcję od nowa.
+    Wynik jest współdzielony między wątkami - wywołujący nie może go zmieniać.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """Wykonuje function albo dołącza do trwającego wywołania z tym samym kluczem"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                call.waiters += 1
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = function()
+            return call.value
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            in_flight = len(self._calls)
+        return {"executed": self.executed, "shared": self.shared, "in_flight": in_flight}
+
+
+# Współdzielona instancja dla całego procesu (None - łączenie wyłączone)
+single_flight = SingleFlight() if SINGLE_FLIGHT_ENABLED else None
@@ -1,29 +1,48 @@
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
+import asyncio
+import base64
 
 # Importy z naszych warstw
-from infrastructure.database import get_db, create_tables
-from repositories.event_repository import SqlAlchemyEventRepository
+from infrastructure.database import get_db, request_repository, warm_up_pool, engine, SessionLocal
+from infrastructure.migrations import RUN_MIGRATIONS_ON_STARTUP, run_migrations
+from infrastructure.pool_metrics import pool_metrics
+from infrastructure.request_metrics import MetricsMiddleware, metrics_authorized, request_metrics
+from infrastructure.query_budget import query_budget
+from repositories.event_repository import SqlAlchemyEventRepository, EVENT_FIELDS
 from repositories.result_repository import SqlAlchemyResultRepository
 from repositories.user_repository import SqlAlchemyUserRepository
+from repositories.cached_repositories import CachedEventRepository, CachedResultRepository
 from usecases.event_service import EventService
 from usecases.result_service import ResultService
 from usecases.user_service import UserService
+from usecases.export_service import ExportService
+from usecases.import_service import ImportRejectedError, ResultImportService
+from infrastructure.result_import import detect_import_format, iter_import_records
 from domain.event import Event
 from domain.result import Result
+from http_cache import cache_headers, is_not_modified
+from serializers import event_to_dict, event_fields_to_dict, events_to_list, events_to_json, result_to_dict, results_by_category_to_json
 from schemas import EventCreate, EventResponse, ResultCreate, ResultResponse, UserResponse, TokenResponse, AzureLoginRequest, LoginResponse
 from infrastructure.auth_service import AzureAuthService
 from middleware.auth_middleware import get_current_user, require_roles, require_admin
+from infrastructure.principal_cache import principal_cache
+from infrastructure.broadcast import result_broadcaster
+from infrastructure.invalidation import cache_invalidation
+from infrastructure.repository_cache import repository_cache
+from infrastructure.single_flight import single_flight
 from domain.user import User
 
 # Tworzenie aplikacji FastAPI
 app = FastAPI(
     title="INO API",
     description="API dla systemu Impreza na Orientację",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Konfiguracja CORS
@@ -38,33 +57,53 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Wszystkie metody HTTP
     allow_headers=["*"],  # Wszystkie nagłówki
+    # Kursor następnej strony w GET /events/all, ETag (warunkowe GET) i podział czasu żądania
+    expose_headers=["X-Next-Cursor", "ETag", "Server-Timing"],
 )
 
-# Tworzenie tabel przy starcie
+# Metryki żądań (czas per trasa, statusy, zapytania SQL) i nagłówek Server-Timing
+app.add_middleware(MetricsMiddleware)
+
+# Aktualizacja schematu bazy (migracje) przy starcie
 @app.on_event("startup")
 async def startup_event():
-    create_tables()
+    if RUN_MIGRATIONS_ON_STARTUP:
+        run_migrations(engine)
+    warm_up_pool()
+    result_broadcaster.start(asyncio.get_running_loop())
+    cache_invalidation.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    cache_invalidation.stop()
+    result_broadcaster.stop()
 
 # Dependency injection dla serwisów
+# Odczyty wydarzeń i wyników idą przez cache repozytoriów (chyba że REPOSITORY_CACHE_BACKEND=off)
 def get_event_service(db: Session = Depends(get_db)) -> EventService:
-    repository = SqlAlchemyEventRepository(db)
-    return EventService(repository)
+    repository = request_repository(SqlAlchemyEventRepository(db), db)
+    if repository_cache is not None:
+        repository = CachedEventRepository(repository, repository_cache)
+    return EventService(repository, single_flight=single_flight)
 
 def get_result_service(db: Session = Depends(get_db)) -> ResultService:
-    repository = SqlAlchemyResultRepository(db)
-    return ResultService(repository)
+    repository = request_repository(SqlAlchemyResultRepository(db), db)
+    if repository_cache is not None:
+        repository = CachedResultRepository(repository, repository_cache)
+    return ResultService(repository, publisher=result_broadcaster, single_flight=single_flight)
 
 def get_user_service(db: Session = Depends(get_db)) -> UserService:
-    user_repository = SqlAlchemyUserRepository(db)
+    user_repository = request_repository(SqlAlchemyUserRepository(db), db)
     auth_service = AzureAuthService(user_repository)
     return UserService(user_repository, auth_service)
 
 def get_auth_service(db: Session = Depends(get_db)) -> AzureAuthService:
-    user_repository = SqlAlchemyUserRepository(db)
+    user_repository = request_repository(SqlAlchemyUserRepository(db), db)
     return AzureAuthService(user_repository)
 
 # Endpointy autoryzacji
 @app.post("/auth/azure-login", response_model=LoginResponse)
+@query_budget(2)
 async def azure_login(
     login_data: AzureLoginRequest,
     user_service: UserService = Depends(get_user_service)
@@ -103,6 +142,7 @@ async def azure_login(
         )
 
 @app.get("/auth/me", response_model=UserResponse)
+@query_budget(2)
 async def get_current_user_info(current_user: User = Depends(get_current_user)):
     """Pobiera informacje o aktualnym użytkowniku"""
     return UserResponse(
@@ -115,9 +155,57 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
         updated_at=current_user.updated_at.isoformat() if current_user.updated_at else None
     )
 
+@app.get("/admin/auth-cache")
+@query_budget(2)
+def get_auth_cache_stats(current_user: User = Depends(require_admin)):
+    """Zwraca statystyki cache zweryfikowanych użytkowników (wymaga roli admin)"""
+    return {**principal_cache.stats(), "invalidation": cache_invalidation.stats()}
+
+@app.get("/admin/db-pool")
+@query_budget(2)
+def get_db_pool_stats(current_user: User = Depends(require_admin)):
+    """Zwraca stan puli połączeń i histogram czasu oczekiwania (wymaga roli admin)"""
+    return pool_metrics.snapshot(engine.pool)
+
+@app.get("/admin/broadcast")
+@query_budget(2)
+def get_broadcast_stats(current_user: User = Depends(require_admin)):
+    """Zwraca liczbę subskrybentów strumieni wyników i liczniki rozsyłania (wymaga roli admin)"""
+    return result_broadcaster.stats()
+
+@app.get("/admin/repository-cache")
+@query_budget(2)
+def get_repository_cache_stats(current_user: User = Depends(require_admin)):
+    """Zwraca skuteczność cache odczytów wydarzeń i wyników oraz łączenia równoczesnych odczytów (wymaga roli admin)"""
+    stats = {"enabled": False} if repository_cache is None else {"enabled": True, **repository_cache.stats()}
+    stats["single_flight"] = single_flight.stats() if single_flight is not None else None
+    return stats
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+@query_budget(0)
+def get_metrics(request: Request):
+    """
+    Metryki w formacie Prometheusa. nginx nie przepuszcza /metrics z zewnątrz - Prometheus
+    odpytuje api:8000 w sieci wewnętrznej; przy ustawionym METRICS_TOKEN wymagany jest też token
+    """
+    if not metrics_authorized(request.headers.get("authorization")):
+        raise HTTPException(status_code=401, detail="Brak dostępu do metryk")
+    cache_stats = repository_cache.stats() if repository_cache is not None else None
+    return PlainTextResponse(request_metrics.render(engine.pool, cache_stats), media_type="text/plain; version=0.0.4")
+
+# Endpointy korzystające z bazy są zwykłymi funkcjami (def) - FastAPI uruchamia je
+# w puli wątków, dzięki czemu synchroniczne zapytania SQLAlchemy nie blokują pętli zdarzeń
+#
+# @query_budget to najwyższa dopuszczalna liczba zapytań SQL na żądanie - razem
+# z uwierzytelnieniem przy pustym cache i założeniem konta przy pierwszym logowaniu
+# (+1 zapytanie). Budżet nie może zależeć od liczby wierszy. NOTIFY kanałów między
+# procesami (zmiany wyników, unieważnienia cache) nie jest wliczany.
+# Aktualne wartości pokazuje python -m benchmarks.query_counts
+
 # Endpointy dla Event
 @app.post("/events", response_model=EventResponse)
-async def create_event(
+@query_budget(5)
+def create_event(
     event_data: EventCreate,
     event_service: EventService = Depends(get_event_service),
     current_user: User = Depends(get_current_user)
@@ -147,87 +235,109 @@ async def create_event(
         
         created_event = event_service.create_event(event)
         
-        # Konwertuj z powrotem na response model
-        return EventResponse(
-            id=created_event.id,
-            name=created_event.name,
-            date=created_event.date.strftime("%Y-%m-%d"),
-            categories=created_event.categories,
-            location=created_event.location,
-            start_point_url=created_event.start_point_url,
-            start_time=created_event.start_time,
-            fee=created_event.fee,
-            registration_deadline=created_event.registration_deadline.strftime("%Y-%m-%d") if created_event.registration_deadline else None,
-            registered_participants=created_event.registered_participants,
-            google_maps_url=created_event.google_maps_url,
-            google_drive_url=created_event.google_drive_url,
-            deleted=created_event.deleted,
-            created_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            updated_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        )
+        # Domain object pochodzi z bazy - serializujemy go bez ponownej walidacji
+        return ORJSONResponse(event_to_dict(created_event))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.get("/events", response_model=List[EventResponse])
+@query_budget(2)
 def list_events(
+    request: Request,
     event_service: EventService = Depends(get_event_service)
 ):
     """Listuje najnowsze 3 aktywne wydarzenia posortowane po dacie"""
-    events = event_service.list_latest_events(3)
+    version = event_service.get_events_version()
+    headers = cache_headers(version, request)
+    if is_not_modified(request, headers["ETag"], version.updated_at):
+        return Response(status_code=304, headers=headers)
     
-    # Konwertuj na response models
-    return [
-        EventResponse(
-            id=event.id,
-            name=event.name,
-            date=event.date.strftime("%Y-%m-%d"),
-            categories=event.categories,
-            location=event.location,
-            start_point_url=event.start_point_url,
-            start_time=event.start_time,
-            fee=event.fee,
-            registration_deadline=event.registration_deadline.strftime("%Y-%m-%d") if event.registration_deadline else None,
-            registered_participants=event.registered_participants,
-            google_maps_url=event.google_maps_url,
-            google_drive_url=event.google_drive_url,
-            deleted=event.deleted,
-            created_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            updated_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        )
-        for event in events
-    ]
+    # Równoczesne żądania o tę samą wersję dzielą zapytanie i gotową treść odpowiedzi
+    body = event_service.render_latest_events(3, version, events_to_json)
+    return Response(body, media_type="application/json", headers=headers)
+
+def _encode_events_cursor(event: Event) -> str:
+    """Koduje (data, id) ostatniego wydarzenia strony jako nieprzezroczysty kursor"""
+    raw = f"{event.date.isoformat()}|{event.id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+def _decode_events_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Dekoduje kursor z _encode_events_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        date_part, id_part = raw.split("|")
+        return datetime.fromisoformat(date_part), int(id_part)
+    except Exception:
+        raise ValueError("Nieprawidłowy kursor")
+
+def _parse_date_range(date_from: Optional[str], date_to: Optional[str]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Zamienia daty z parametrów zapytania na zakres; data końcowa obejmuje cały dzień"""
+    date_from_value = datetime.strptime(date_from, "%Y-%m-%d") if date_from else None
+    date_to_value = None
+    if date_to:
+        date_to_value = datetime.strptime(date_to, "%Y-%m-%d").replace(hour=23, minute=59, second=59, microsecond=999999)
+    return date_from_value, date_to_value
 
 @app.get("/events/all", response_model=List[EventResponse])
+@query_budget(2)
 def list_all_events(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Rozmiar strony (domyślnie wszystkie wydarzenia)"),
+    cursor: Optional[str] = Query(None, description="Kursor z nagłówka X-Next-Cursor poprzedniej strony"),
+    date_from: Optional[str] = Query(None, description="Format: 2024-06-01"),
+    date_to: Optional[str] = Query(None, description="Format: 2024-06-30"),
+    category: Optional[str] = None,
+    location: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Lista pól oddzielonych przecinkami, np. id,name,date"),
     event_service: EventService = Depends(get_event_service)
 ):
-    """Listuje wszystkie aktywne wydarzenia posortowane po dacie"""
-    events = event_service.list_events()
+    """Listuje aktywne wydarzenia posortowane po dacie (opcjonalnie stronicowane i filtrowane)"""
+    # Wersja jest czytana przed wydarzeniami - zapis pomiędzy da co najwyżej nowsze dane
+    # ze starszym ETagiem (klient pobierze je ponownie), nigdy odwrotnie
+    version = event_service.get_events_version()
+    headers = cache_headers(version, request)
+    if is_not_modified(request, headers["ETag"], version.updated_at):
+        return Response(status_code=304, headers=headers)
     
-    # Konwertuj na response models
-    return [
-        EventResponse(
-            id=event.id,
-            name=event.name,
-            date=event.date.strftime("%Y-%m-%d"),
-            categories=event.categories,
-            location=event.location,
-            start_point_url=event.start_point_url,
-            start_time=event.start_time,
-            fee=event.fee,
-            registration_deadline=event.registration_deadline.strftime("%Y-%m-%d") if event.registration_deadline else None,
-            registered_participants=event.registered_participants,
-            google_maps_url=event.google_maps_url,
-            google_drive_url=event.google_drive_url,
-            deleted=event.deleted,
-            created_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            updated_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    try:
+        after = _decode_events_cursor(cursor) if cursor else None
+        date_from_value, date_to_value = _parse_date_range(date_from, date_to)
+        
+        selected_fields = None
+        if fields:
+            selected_fields = [name.strip() for name in fields.split(",") if name.strip()]
+            unknown = [name for name in selected_fields if name not in EVENT_FIELDS]
+            if unknown:
+                raise ValueError(f"Nieznane pola: {', '.join(unknown)}")
+        
+        # Pobierz jedno wydarzenie więcej, żeby wiedzieć czy istnieje następna strona.
+        # Równoczesne żądania o tę samą stronę i wersję dzielą jedno zapytanie (lista jest
+        # współdzielona - poniżej powstają z niej nowe listy, bez zmian w miejscu)
+        events = event_service.list_events_page(
+            limit=limit + 1 if limit else None,
+            after=after,
+            date_from=date_from_value,
+            date_to=date_to_value,
+            category=category,
+            location=location,
+            fields=selected_fields,
+            version=version
         )
-        for event in events
-    ]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if limit and len(events) > limit:
+        events = events[:limit]
+        headers["X-Next-Cursor"] = _encode_events_cursor(events[-1])
+    
+    if selected_fields:
+        return ORJSONResponse([event_fields_to_dict(event, selected_fields) for event in events], headers=headers)
+    
+    return ORJSONResponse(events_to_list(events), headers=headers)
 
 @app.put("/events/{event_id}", response_model=EventResponse)
-async def update_event(
+@query_budget(4)
+def update_event(
     event_id: int,
     event_data: EventCreate,
     event_service: EventService = Depends(get_event_service),
@@ -261,28 +371,13 @@ async def update_event(
         if not updated_event:
             raise HTTPException(status_code=404, detail="Wydarzenie nie zostało znalezione")
         
-        # Konwertuj z powrotem na response model
-        return EventResponse(
-            id=updated_event.id,
-            name=updated_event.name,
-            date=updated_event.date.strftime("%Y-%m-%d"),
-            categories=updated_event.categories,
-            location=updated_event.location,
-            start_point_url=updated_event.start_point_url,
-            start_time=updated_event.start_time,
-            fee=updated_event.fee,
-            registration_deadline=updated_event.registration_deadline.strftime("%Y-%m-%d") if updated_event.registration_deadline else None,
-            registered_participants=updated_event.registered_participants,
-            google_maps_url=updated_event.google_maps_url,
-            google_drive_url=updated_event.google_drive_url,
-            deleted=updated_event.deleted,
-            created_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            updated_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        )
+        # Domain object pochodzi z bazy - serializujemy go bez ponownej walidacji
+        return ORJSONResponse(event_to_dict(updated_event))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.delete("/events/{event_id}")
+@query_budget(5)
 def delete_event(
     event_id: int,
     event_service: EventService = Depends(get_event_service),
@@ -300,7 +395,8 @@ def delete_event(
 
 # Endpointy dla Result
 @app.post("/results", response_model=ResultResponse)
-async def create_result(
+@query_budget(7)
+def create_result(
     result_data: ResultCreate,
     result_service: ResultService = Depends(get_result_service),
     current_user: User = Depends(get_current_user)  # Sprawdza tylko czy użytkownik jest zalogowany
@@ -317,49 +413,90 @@ async def create_result(
         
         created_result = result_service.add_result(result)
         
-        # Konwertuj z powrotem na response model
-        return ResultResponse(
-            id=created_result.id,
-            event_id=created_result.event_id,
-            category=created_result.category,
-            team=created_result.team,
-            penalty_points=created_result.penalty_points,
-            deleted=created_result.deleted,
-            created_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            updated_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        )
+        # Domain object pochodzi z bazy - serializujemy go bez ponownej walidacji
+        return ORJSONResponse(result_to_dict(created_result))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.get("/results/{event_id}")
+@query_budget(2)
 def get_results_by_event(
     event_id: int,
+    request: Request,
+    result_service: ResultService = Depends(get_result_service)
+):
+    """Listuje wyniki dla wydarzenia pogrupowane według kategorii (obsługuje If-None-Match)"""
+    version = result_service.get_results_version(event_id)
+    headers = cache_headers(version, request)
+    if is_not_modified(request, headers["ETag"], version.updated_at):
+        return Response(status_code=304, headers=headers)
+    
+    # Równoczesne żądania o tę samą wersję dzielą zapytanie i gotową treść odpowiedzi
+    body = result_service.render_results_by_event(event_id, version, results_by_category_to_json)
+    return Response(body, media_type="application/json", headers=headers)
+
+# around_team: pozycja zespołu, potem wiersze okna - dwa zapytania klasyfikacji
+@app.get("/results/{event_id}/leaderboard")
+@query_budget(3)
+def get_leaderboard(
+    event_id: int,
+    request: Request,
+    category: Optional[str] = None,
+    top: Optional[int] = Query(None, ge=1, description="Tylko pierwsze N miejsc"),
+    around_team: Optional[str] = Query(None, description="Tylko pozycje wokół wskazanego zespołu"),
+    window: int = Query(2, ge=0, le=50, description="Liczba pozycji nad i pod zespołem dla around_team"),
     result_service: ResultService = Depends(get_result_service)
 ):
-    """Listuje wyniki dla wydarzenia pogrupowane według kategorii"""
-    results_by_category = result_service.list_results_by_event(event_id)
+    """Zwraca klasyfikację wydarzenia z miejscami, remisami i stratą do lidera"""
+    version = result_service.get_results_version(event_id)
+    headers = cache_headers(version, request)
+    if is_not_modified(request, headers["ETag"], version.updated_at):
+        return Response(status_code=304, headers=headers)
     
-    # Konwertuj na format odpowiedzi pogrupowany według kategorii
-    response = {}
-    for category, results in results_by_category.items():
-        response[category] = [
+    try:
+        leaderboard = result_service.get_leaderboard(
+            event_id,
+            category=category,
+            top=top,
+            around_team=around_team,
+            window=window
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return ORJSONResponse({
+        category_name: [
             {
-                "id": result.id,
-                "event_id": result.event_id,
-                "category": result.category,
-                "team": result.team,
-                "penalty_points": result.penalty_points,
-                "deleted": result.deleted,
-                "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                "id": standing.result_id,
+                "rank": standing.rank,
+                "position": standing.position,
+                "team": standing.team,
+                "penalty_points": standing.penalty_points,
+                "gap_to_leader": standing.gap_to_leader,
+                "tied": standing.tied
             }
-            for result in results
+            for standing in standings
         ]
-    
-    return response
+        for category_name, standings in leaderboard.items()
+    }, headers=headers)
+
+@app.get("/results/{event_id}/stream")
+@query_budget(0)
+async def stream_results(event_id: int):
+    """
+    Strumień zmian wyników wydarzenia (Server-Sent Events).
+    Zdarzenia: `results` (dodane/zmienione/usunięte wyniki) oraz `resync` - klient powinien
+    wtedy pobrać GET /results/{event_id} od nowa (np. gdy nie nadążał z odbiorem).
+    """
+    return StreamingResponse(
+        result_broadcaster.stream(event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.put("/results/{event_id}")
-async def update_results_for_event(
+@query_budget(10)
+def update_results_for_event(
     event_id: int,
     results_data: dict,
     result_service: ResultService = Depends(get_result_service),
@@ -367,26 +504,71 @@ async def update_results_for_event(
 ):
     """Aktualizuje wszystkie wyniki dla wydarzenia (wymaga zalogowania)"""
     try:
-        # Usuń wszystkie istniejące wyniki dla tego wydarzenia
-        result_service.delete_all_results_for_event(event_id)
-        
-        # Dodaj nowe wyniki
-        for category, results in results_data.items():
-            for result_item in results:
+        # Zbierz wszystkie nowe wyniki
+        results = []
+        for category, category_results in results_data.items():
+            for result_item in category_results:
                 if result_item.get('team', '').strip():  # Tylko jeśli zespół nie jest pusty
-                    result = Result(
+                    results.append(Result(
                         event_id=event_id,
                         category=category,
                         team=result_item['team'],
                         penalty_points=result_item.get('penalty_points', 0)
-                    )
-                    result_service.add_result(result)
+                    ))
+        
+        # Zapisz tylko różnice względem istniejących wyników
+        changes = result_service.replace_results_for_event(event_id, results)
         
-        return {"message": f"Wyniki dla wydarzenia {event_id} zostały zaktualizowane"}
+        return {
+            "message": f"Wyniki dla wydarzenia {event_id} zostały zaktualizowane",
+            **changes.counts(),
+            "changes": {
+                "inserted": [
+                    {"id": r.id, "category": r.category, "team": r.team, "penalty_points": r.penalty_points}
+                    for r in changes.inserted
+                ],
+                "updated": [
+                    {"id": r.id, "category": r.category, "team": r.team, "penalty_points": r.penalty_points}
+                    for r in changes.updated
+                ],
+                "deleted": changes.deleted
+            }
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# Bez budżetu - import zapisuje partiami po batch_size wierszy, więc liczba zapytań
+# rośnie z rozmiarem pliku (dwa zapytania na partię)
+@app.post("/results/{event_id}/import")
+def import_results(
+    event_id: int,
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="csv lub iof (domyślnie na podstawie rozszerzenia pliku)"),
+    mode: str = Query("append", description="append - dopisuje wyniki, replace - zastępuje wyniki wydarzenia"),
+    event_service: EventService = Depends(get_event_service),
+    result_service: ResultService = Depends(get_result_service),
+    current_user: User = Depends(get_current_user)
+):
+    """Importuje wyniki z pliku CSV lub IOF XML 3.0 (wymaga zalogowania)"""
+    if event_service.get_event_by_id(event_id) is None:
+        raise HTTPException(status_code=404, detail="Wydarzenie nie zostało znalezione")
+    
+    import_service = ResultImportService(result_service)
+    try:
+        records = iter_import_records(file.file, format or detect_import_format(file.filename))
+        report = import_service.import_records(event_id, records, mode)
+    except ImportRejectedError as e:
+        raise HTTPException(status_code=400, detail={"message": str(e), **e.report})
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except SyntaxError as e:
+        # ET.ParseError dziedziczy po SyntaxError
+        raise HTTPException(status_code=400, detail=f"Nieprawidłowy plik XML: {e}")
+    
+    return {"message": f"Import wyników dla wydarzenia {event_id} zakończony", **report}
 
 @app.delete("/results/{result_id}")
+@query_budget(7)
 def delete_result(
     result_id: int,
     result_service: ResultService = Depends(get_result_service),
@@ -402,8 +584,76 @@ def delete_result(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+# Endpointy eksportu
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+def _stream_export(export):
+    """
+    Generator odpowiedzi eksportu z własną sesją bazy danych.
+    Sesja żyje tak długo jak strumień, niezależnie od zależności żądania.
+    """
+    db = SessionLocal()
+    try:
+        export_service = ExportService(SqlAlchemyResultRepository(db), SqlAlchemyEventRepository(db))
+        yield from export(export_service)
+    finally:
+        db.close()
+
+def _export_response(export, export_format: str, filename: str) -> StreamingResponse:
+    """Tworzy odpowiedź strumieniową dla eksportu"""
+    return StreamingResponse(
+        _stream_export(export),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'}
+    )
+
+@app.get("/export/results")
+@query_budget(3)
+def export_results(
+    format: str = Query("csv", description="csv lub ndjson"),
+    event_id: Optional[int] = None,
+    date_from: Optional[str] = Query(None, description="Format: 2024-06-01"),
+    date_to: Optional[str] = Query(None, description="Format: 2024-06-30"),
+    current_user: User = Depends(get_current_user)
+):
+    """Eksportuje wyniki (jednego wydarzenia, zakresu dat lub wszystkie) jako CSV/NDJSON (wymaga zalogowania)"""
+    try:
+        ExportService.validate_format(format)
+        date_from_value, date_to_value = _parse_date_range(date_from, date_to)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    filename = f"results-{event_id}" if event_id is not None else "results"
+    return _export_response(
+        lambda service: service.export_results(format, event_id=event_id, date_from=date_from_value, date_to=date_to_value),
+        format,
+        filename
+    )
+
+@app.get("/export/events")
+@query_budget(3)
+def export_events(
+    format: str = Query("csv", description="csv lub ndjson"),
+    date_from: Optional[str] = Query(None, description="Format: 2024-06-01"),
+    date_to: Optional[str] = Query(None, description="Format: 2024-06-30"),
+    current_user: User = Depends(get_current_user)
+):
+    """Eksportuje wydarzenia (z zakresu dat lub wszystkie) jako CSV/NDJSON (wymaga zalogowania)"""
+    try:
+        ExportService.validate_format(format)
+        date_from_value, date_to_value = _parse_date_range(date_from, date_to)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return _export_response(
+        lambda service: service.export_events(format, date_from=date_from_value, date_to=date_to_value),
+        format,
+        "events"
+    )
+
 # Health check endpoint
 @app.get("/health")
+@query_budget(0)
 def health_check():
     """Sprawdza czy API działa"""
     return {"status": "healthy", "message": "INO API działa poprawnie"} 
\ No newline at end of file
@@ -0,0 +1,280 @@
+"""
+Polecenia administracyjne backendu.
+
+    python manage.py migrate        # stosuje brakujące migracje
+    python manage.py migrations     # pokazuje stan migracji
+    python manage.py explain        # plany zapytań dla najczęstszych odczytów
+    python manage.py rebuild-standings [--event-id N]   # odbudowuje klasyfikację z wyników
+    python manage.py check-standings [--event-id N]     # sprawdza spójność klasyfikacji
+    python manage.py import-results --event-id N PLIK [--format csv|iof] [--mode append|replace]
+    python manage.py compact [--retention-days 30] [--mode archive|delete] [--dry-run] [--vacuum]
+"""
+import argparse
+import sys
+from datetime import datetime
+
+from sqlalchemy import event
+
+from infrastructure.database import SessionLocal, engine
+from infrastructure.migrations import migration_status, run_migrations
+from infrastructure.repository_cache import repository_cache
+from infrastructure.result_import import detect_import_format, iter_import_records
+from repositories.cached_repositories import CachedResultRepository
+from repositories.compaction_repository import SqlAlchemyCompactionRepository
+from repositories.data_version_repository import results_scope
+from repositories.event_repository import SqlAlchemyEventRepository
+from repositories.result_repository import SqlAlchemyResultRepository
+from repositories.standings_repository import SqlAlchemyStandingsRepository
+from usecases.compaction_service import COMPACTION_MODES, CompactionService
+from usecases.import_service import ImportRejectedError, ResultImportService
+from usecases.result_service import ResultService
+
+
+def cmd_migrate(args):
+    applied = run_migrations(engine)
+    if applied:
+        for name in applied:
+            print(f"Zastosowano {name}")
+    else:
+        print("Baza jest aktualna")
+
+
+def cmd_migrations(args):
+    for version, name, applied in migration_status(engine):
+        print(f"[{'x' if applied else ' '}] {version:04d} {name}")
+
+
+def _capture_statements(call):
+    """Wykonuje `call` i zwraca zapytania SELECT wysłane do bazy"""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    return captured
+
+
+def explain_checks(db, event_id):
+    """(opis, oczekiwany indeks, wywołanie repozytorium) dla najczęstszych odczytów"""
+    return [
+        ("list_all_sorted", "ix_events_active_date_id",
+         lambda: SqlAlchemyEventRepository(db).list_all_sorted()),
+        ("list_latest_events", "ix_events_active_date_id",
+         lambda: SqlAlchemyEventRepository(db).list_latest_events(3)),
+        ("list_page", "ix_events_active_date_id",
+         lambda: SqlAlchemyEventRepository(db).list_page(limit=20, after=(datetime(2024, 1, 1), 1))),
+        ("get_by_event_grouped_by_category", "ix_results_active_event_category_created",
+         lambda: SqlAlchemyResultRepository(db).get_by_event_grouped_by_category(event_id)),
+        ("get_leaderboard", "ix_standings_event_order",
+         lambda: SqlAlchemyResultRepository(db).get_leaderboard(event_id)),
+        ("get_leaderboard top", "ix_standings_event_order",
+         lambda: SqlAlchemyResultRepository(db).get_leaderboard(event_id, top=3)),
+    ]
+
+
+def query_plans(call):
+    """
+    Plany zapytań SELECT wysłanych przez `call`.
+    W PostgreSQL wyłączamy seq scan, żeby na małej bazie sprawdzić samą możliwość użycia indeksu.
+    """
+    plans = []
+    for statement, parameters in _capture_statements(call):
+        with engine.connect() as connection:
+            if connection.dialect.name == "postgresql":
+                connection.exec_driver_sql("SET enable_seqscan = off")
+                prefix = "EXPLAIN "
+            else:
+                prefix = "EXPLAIN QUERY PLAN "
+            rows = connection.exec_driver_sql(prefix + statement, parameters).all()
+        plans.append("\n".join(" ".join(str(value) for value in row) for row in rows))
+    return plans
+
+
+def cmd_explain(args):
+    """Pokazuje plany zapytań wysyłanych przez repozytoria i sprawdza czy używają indeksów"""
+    db = SessionLocal()
+    failed = False
+    try:
+        for label, index_name, call in explain_checks(db, args.event_id):
+            for plan in query_plans(call):
+                uses_index = index_name in plan
+                failed = failed or not uses_index
+                print(f"== {label}: {'OK' if uses_index else 'BRAK INDEKSU'} ({index_name})")
+                print(plan)
+                print()
+    finally:
+        db.close()
+
+    if failed:
+        sys.exit(1)
+
+
+def cmd_rebuild_standings(args):
+    db = SessionLocal()
+    try:
+        rows = SqlAlchemyStandingsRepository(db).rebuild(args.event_id)
+    finally:
+        db.close()
+    print(f"Odbudowano klasyfikację: {rows} wierszy")
+
+
+def cmd_check_standings(args):
+    db = SessionLocal()
+    try:
+        problems = SqlAlchemyStandingsRepository(db).check(args.event_id)
+    finally:
+        db.close()
+
+    for problem in problems:
+        print(problem)
+    if problems:
+        print(f"Znaleziono {len(problems)} rozbieżności - uruchom rebuild-standings")
+        sys.exit(1)
+    print("Klasyfikacja jest spójna z wynikami")
+
+
+def cmd_import_results(args):
+    db = SessionLocal()
+    try:
+        if SqlAlchemyEventRepository(db).get_by_id(args.event_id) is None:
+            print(f"Wydarzenie {args.event_id} nie istnieje")
+            sys.exit(1)
+
+        repository = SqlAlchemyResultRepository(db)
+        if repository_cache is not None:
+            # Unieważnienie trafia do workerów aplikacji przez Redis albo kanał Postgres; przy kanale
+            # memory (SQLite) nie wyjdzie z tego procesu - serwer zobaczy zmianę po nowej wersji wyników
+            repository = CachedResultRepository(repository, repository_cache)
+        import_service = ResultImportService(ResultService(repository), batch_size=args.batch_size)
+        with open(args.path, "rb") as stream:
+            records = iter_import_records(stream, args.format or detect_import_format(args.path))
+            report = import_service.import_records(args.event_id, records, args.mode)
+    except ImportRejectedError as e:
+        for error in e.report["errors"]:
+            print(f"wiersz {error['row']}: {error['error']}")
+        print(e)
+        sys.exit(1)
+    finally:
+        db.close()
+
+    for error in report["errors"]:
+        print(f"wiersz {error['row']}: {error['error']}")
+    print(
+        f"Zaimportowano {report['imported']} wyników w {report['batches']} paczkach, "
+        f"odrzucono {report['rejected']}"
+    )
+    if report["rejected"]:
+        sys.exit(1)
+
+
+def _format_bytes(size):
+    if size is None:
+        return "-"
+    for unit in ("B", "kB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def cmd_compact(args):
+    """
+    Przenosi do archiwum (albo usuwa) wiersze oznaczone jako usunięte dawniej niż
+    --retention-days dni temu. Działa paczkami, więc można go uruchamiać przy ruchu (np. z crona).
+    """
+    on_results_removed = None
+    if repository_cache is not None:
+        # Wyniki usuniętego wydarzenia znikają z /results/{event_id} - workery muszą o tym wiedzieć
+        # (kompaktowanie zmienia też wersję wyników, która jest w kluczu cache odczytów)
+        on_results_removed = lambda event_id: repository_cache.invalidate(results_scope(event_id))
+
+    db = SessionLocal()
+    try:
+        repository = SqlAlchemyCompactionRepository(db)
+        service = CompactionService(
+            repository,
+            batch_size=args.batch_size,
+            pause_seconds=args.pause,
+            on_results_removed=on_results_removed,
+        )
+        try:
+            report = service.compact(args.retention_days, args.mode, dry_run=args.dry_run, max_batches=args.max_batches)
+        except ValueError as e:
+            print(e)
+            sys.exit(2)
+        if args.vacuum and not args.dry_run:
+            repository.vacuum()
+            report["tables_after"] = repository.table_stats()
+    finally:
+        db.close()
+
+    action = "Do usunięcia" if report["dry_run"] else ("Zarchiwizowano" if report["mode"] == "archive" else "Usunięto")
+    print(
+        f"{action}: {report['events']} wydarzeń, {report['results']} wyników "
+        f"(usunięte przed {report['cutoff']}, paczek: {report['batches']})"
+    )
+    if report["skipped_events"]:
+        print(
+            f"Pominięto wydarzenia zmienione w trakcie: {', '.join(map(str, report['skipped_events']))} "
+            f"- zostaną usunięte przy następnym uruchomieniu"
+        )
+    if not report["complete"]:
+        print(f"Przerwano po {args.max_batches} paczkach - uruchom ponownie, żeby dokończyć")
+
+    print(f"{'tabela':<16}  {'wiersze przed':>13}  {'wiersze po':>10}  {'usunięte po':>11}  {'rozmiar przed':>13}  {'rozmiar po':>10}")
+    for name, before in report["tables_before"].items():
+        after = report["tables_after"][name]
+        print(
+            f"{name:<16}  {before['rows']:>13}  {after['rows']:>10}  {after.get('deleted', '-'):>11}  "
+            f"{_format_bytes(before['bytes']):>13}  {_format_bytes(after['bytes']):>10}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Polecenia administracyjne INO API")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("migrate", help="stosuje brakujące migracje").set_defaults(func=cmd_migrate)
+    subparsers.add_parser("migrations", help="pokazuje stan migracji").set_defaults(func=cmd_migrations)
+
+    explain = subparsers.add_parser("explain", help="plany zapytań dla najczęstszych odczytów")
+    explain.add_argument("--event-id", type=int, default=1)
+    explain.set_defaults(func=cmd_explain)
+
+    rebuild = subparsers.add_parser("rebuild-standings", help="odbudowuje klasyfikację z wyników")
+    rebuild.add_argument("--event-id", type=int, default=None)
+    rebuild.set_defaults(func=cmd_rebuild_standings)
+
+    check = subparsers.add_parser("check-standings", help="sprawdza spójność klasyfikacji z wynikami")
+    check.add_argument("--event-id", type=int, default=None)
+    check.set_defaults(func=cmd_check_standings)
+
+    import_results = subparsers.add_parser("import-results", help="importuje wyniki z pliku CSV lub IOF XML")
+    import_results.add_argument("path")
+    import_results.add_argument("--event-id", type=int, required=True)
+    import_results.add_argument("--format", choices=["csv", "iof"], default=None)
+    import_results.add_argument("--mode", choices=["append", "replace"], default="append")
+    import_results.add_argument("--batch-size", type=int, default=1000)
+    import_results.set_defaults(func=cmd_import_results)
+
+    compact = subparsers.add_parser("compact", help="archiwizuje lub usuwa stare wiersze oznaczone jako usunięte")
+    compact.add_argument("--retention-days", type=int, default=30)
+    compact.add_argument("--mode", choices=COMPACTION_MODES, default="archive")
+    compact.add_argument("--batch-size", type=int, default=500)
+    compact.add_argument("--pause", type=float, default=0.1, help="przerwa między paczkami w sekundach")
+    compact.add_argument("--max-batches", type=int, default=None)
+    compact.add_argument("--dry-run", action="store_true", help="tylko policz wiersze do usunięcia")
+    compact.add_argument("--vacuum", action="store_true", help="VACUUM po kompaktowaniu (oddaje miejsce na dysku)")
+    compact.set_defaults(func=cmd_compact)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
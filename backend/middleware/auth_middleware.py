@@ -6,7 +6,8 @@ from domain.user import User
 from usecases.user_service import UserService
 from infrastructure.auth_service import AzureAuthService
 from repositories.user_repository import SqlAlchemyUserRepository
-from infrastructure.database import get_db
+from infrastructure.database import get_db, request_repository
+from infrastructure.principal_cache import principal_cache
 
 security = HTTPBearer()
 
@@ -17,8 +18,13 @@ async def get_current_user(
     """Dependency do pobierania aktualnego użytkownika z tokenu Azure AD"""
     token = credentials.credentials
     
+    # Najpierw sprawdź cache zweryfikowanych użytkowników
+    user = principal_cache.get(token)
+    if user:
+        return user
+    
     # Tworzenie serwisów
-    user_repository = SqlAlchemyUserRepository(db)
+    user_repository = request_repository(SqlAlchemyUserRepository(db), db)
     auth_service = AzureAuthService(user_repository)
     
     # Weryfikuj token Azure AD
@@ -36,6 +42,10 @@ async def get_current_user(
             detail="Konto użytkownika jest nieaktywne"
         )
     
+    # Token przeszedł weryfikację, więc jego exp jest poprawne (verify_azure_token)
+    payload = AzureAuthService.decode_token_payload(token) or {}
+    principal_cache.put(token, user, token_expires_at=AzureAuthService.token_expires_at(payload))
+    
     return user
 
 def require_roles(required_roles: list[str]):
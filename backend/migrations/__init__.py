@@ -0,0 +1 @@
+# Migrations package - wersjonowane zmiany schematu bazy danych 
\ No newline at end of file
@@ -0,0 +1,57 @@
+"""
+Schemat początkowy - tabele events, results i users.
+Na istniejących bazach (utworzonych wcześniej przez create_all) nic nie zmienia.
+"""
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, MetaData, String, Table, Text
+from sqlalchemy.sql import func
+
+
+def upgrade(connection):
+    metadata = MetaData()
+
+    Table(
+        "events",
+        metadata,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("name", String, nullable=False),
+        Column("date", DateTime, nullable=False),
+        Column("categories", String, nullable=False),
+        Column("location", String, nullable=False),
+        Column("start_point_url", String, nullable=False),
+        Column("start_time", String, nullable=False),
+        Column("fee", Float, nullable=True),
+        Column("registration_deadline", DateTime, nullable=True),
+        Column("registered_participants", Integer),
+        Column("google_maps_url", String, nullable=True),
+        Column("google_drive_url", String, nullable=True),
+        Column("deleted", Boolean),
+        Column("created_at", DateTime, server_default=func.now()),
+        Column("updated_at", DateTime, server_default=func.now()),
+    )
+
+    Table(
+        "results",
+        metadata,
+        Column("id", Integer, primary_key=True, index=True),
+        Column("event_id", Integer, ForeignKey("events.id"), nullable=False),
+        Column("category", String, nullable=False),
+        Column("team", String, nullable=False),
+        Column("penalty_points", Integer),
+        Column("deleted", Boolean),
+        Column("created_at", DateTime, server_default=func.now()),
+        Column("updated_at", DateTime, server_default=func.now()),
+    )
+
+    Table(
+        "users",
+        metadata,
+        Column("id", String, primary_key=True, index=True),
+        Column("email", String, unique=True, nullable=False, index=True),
+        Column("name", String, nullable=False),
+        Column("roles", Text, nullable=False),
+        Column("is_active", Boolean),
+        Column("created_at", DateTime, server_default=func.now()),
+        Column("updated_at", DateTime, server_default=func.now()),
+    )
+
+    metadata.create_all(connection, checkfirst=True)
@@ -0,0 +1,48 @@
+"""
+Częściowe indeksy pod najczęstsze zapytania - obejmują tylko nieusunięte wiersze.
+
+- events(date): list_all_sorted i list_latest_events
+- results(event_id, category, created_at DESC): get_by_event_grouped_by_category
+"""
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, MetaData, String, Table
+
+
+def upgrade(connection):
+    metadata = MetaData()
+
+    events = Table(
+        "events",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("date", DateTime),
+        Column("deleted", Boolean),
+    )
+    results = Table(
+        "results",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("event_id", Integer),
+        Column("category", String),
+        Column("created_at", DateTime),
+        Column("deleted", Boolean),
+    )
+
+    # Predykat musi mieć tę samą postać co filtr w zapytaniach (deleted == False)
+    indexes = [
+        Index(
+            "ix_events_active_date",
+            events.c.date,
+            postgresql_where=events.c.deleted == False,
+            sqlite_where=events.c.deleted == False,
+        ),
+        Index(
+            "ix_results_active_event_category_created",
+            results.c.event_id,
+            results.c.category,
+            results.c.created_at.desc(),
+            postgresql_where=results.c.deleted == False,
+            sqlite_where=results.c.deleted == False,
+        ),
+    ]
+    for index in indexes:
+        index.create(connection, checkfirst=True)
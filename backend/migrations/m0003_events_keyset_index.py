@@ -0,0 +1,27 @@
+"""
+Indeks (date, id) dla stronicowania kluczem w GET /events/all.
+Zastępuje ix_events_active_date - obsługuje też zwykłe sortowanie po dacie.
+"""
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, MetaData, Table
+
+
+def upgrade(connection):
+    metadata = MetaData()
+
+    events = Table(
+        "events",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("date", DateTime),
+        Column("deleted", Boolean),
+    )
+
+    Index(
+        "ix_events_active_date_id",
+        events.c.date,
+        events.c.id,
+        postgresql_where=events.c.deleted == False,
+        sqlite_where=events.c.deleted == False,
+    ).create(connection, checkfirst=True)
+
+    Index("ix_events_active_date", events.c.date).drop(connection, checkfirst=True)
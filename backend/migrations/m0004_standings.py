@@ -0,0 +1,54 @@
+"""
+Tabela standings - klasyfikacja utrzymywana przy każdym zapisie wyników.
+Indeks odpowiada kolejności klasyfikacji, więc odczyt jest jednym skanem zakresu bez sortowania.
+Tabela jest wypełniana aktualnymi (nieusuniętymi) wynikami.
+"""
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, MetaData, String, Table, func, insert, select
+
+
+def upgrade(connection):
+    metadata = MetaData()
+
+    Table("events", metadata, Column("id", Integer, primary_key=True))
+    results = Table(
+        "results",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("event_id", Integer),
+        Column("category", String),
+        Column("team", String),
+        Column("penalty_points", Integer),
+        Column("deleted", Boolean),
+    )
+    standings = Table(
+        "standings",
+        metadata,
+        Column("result_id", Integer, ForeignKey("results.id"), primary_key=True),
+        Column("event_id", Integer, ForeignKey("events.id"), nullable=False),
+        Column("category", String, nullable=False),
+        Column("team", String, nullable=False),
+        Column("penalty_points", Integer, nullable=False, default=0),
+    )
+    standings.create(connection, checkfirst=True)
+
+    Index(
+        "ix_standings_event_order",
+        standings.c.event_id,
+        standings.c.category,
+        standings.c.penalty_points,
+        standings.c.team,
+        standings.c.result_id,
+    ).create(connection, checkfirst=True)
+
+    connection.execute(
+        insert(standings).from_select(
+            ["result_id", "event_id", "category", "team", "penalty_points"],
+            select(
+                results.c.id,
+                results.c.event_id,
+                results.c.category,
+                results.c.team,
+                func.coalesce(results.c.penalty_points, 0),
+            ).where(results.c.deleted == False)
+        )
+    )
@@ -0,0 +1,38 @@
+"""
+Kategorie wydarzeń jako natywna tablica VARCHAR[] z indeksem GIN (PostgreSQL).
+Istniejące wiersze są przepisywane z tekstu JSON do tablicy w jednej transakcji.
+W SQLite kolumna zostaje tekstem JSON - CategoryList zapisuje go w tym samym formacie.
+"""
+from sqlalchemy import Column, Index, Integer, MetaData, Table, text
+from sqlalchemy.dialects import postgresql
+
+
+def upgrade(connection):
+    if connection.dialect.name != "postgresql":
+        return
+
+    data_type = connection.execute(text(
+        "SELECT data_type FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND table_name = 'events' AND column_name = 'categories'"
+    )).scalar()
+
+    if data_type != "ARRAY":
+        # USING w ALTER COLUMN TYPE nie przyjmuje podzapytań - przepisujemy przez nową kolumnę
+        connection.execute(text("ALTER TABLE events ADD COLUMN categories_array VARCHAR[]"))
+        connection.execute(text(
+            "UPDATE events SET categories_array = "
+            "ARRAY(SELECT json_array_elements_text(categories::json))"
+        ))
+        connection.execute(text("ALTER TABLE events DROP COLUMN categories"))
+        connection.execute(text("ALTER TABLE events RENAME COLUMN categories_array TO categories"))
+        connection.execute(text("ALTER TABLE events ALTER COLUMN categories SET NOT NULL"))
+
+    metadata = MetaData()
+    events = Table(
+        "events",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("categories", postgresql.ARRAY(postgresql.VARCHAR)),
+    )
+
+    Index("ix_events_categories", events.c.categories, postgresql_using="gin").create(connection, checkfirst=True)
@@ -0,0 +1,18 @@
+"""
+Tabela data_versions - licznik zmian na zakres danych (lista wydarzeń, wyniki wydarzenia).
+Repozytoria zwiększają go w transakcji zapisu, a endpointy odczytu liczą z niego ETag
+i odpowiadają 304 bez wczytywania wierszy. Brak wiersza oznacza wersję 0.
+"""
+from sqlalchemy import BigInteger, Column, DateTime, MetaData, String, Table, func
+
+
+def upgrade(connection):
+    metadata = MetaData()
+    data_versions = Table(
+        "data_versions",
+        metadata,
+        Column("scope", String, primary_key=True),
+        Column("version", BigInteger, nullable=False, default=0),
+        Column("updated_at", DateTime, nullable=False, server_default=func.now()),
+    )
+    data_versions.create(connection, checkfirst=True)
@@ -0,0 +1,69 @@
+"""
+Tabele archiwum dla kompaktowania usuniętych wierszy (python manage.py compact).
+Usunięte (soft delete) wyniki i wydarzenia starsze niż okres retencji są przenoszone
+do events_archive/results_archive i fizycznie usuwane z tabel roboczych.
+Archiwum nie ma kluczy obcych - wiersze zostają także po usunięciu wydarzenia.
+
+Częściowy indeks na usuniętych wynikach pozwala znaleźć kandydatów bez skanowania
+całej tabeli (obejmuje tylko martwe wiersze, więc jest mały).
+"""
+from sqlalchemy import Boolean, Column, DateTime, Float, Index, Integer, JSON, MetaData, String, Table
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import func
+
+
+def upgrade(connection):
+    metadata = MetaData()
+    # Ten sam typ co events.categories - archiwizacja to INSERT ... SELECT
+    categories_type = postgresql.ARRAY(postgresql.VARCHAR) if connection.dialect.name == "postgresql" else JSON
+
+    events_archive = Table(
+        "events_archive",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String, nullable=False),
+        Column("date", DateTime, nullable=False),
+        Column("categories", categories_type, nullable=False),
+        Column("location", String, nullable=False),
+        Column("start_point_url", String, nullable=False),
+        Column("start_time", String, nullable=False),
+        Column("fee", Float, nullable=True),
+        Column("registration_deadline", DateTime, nullable=True),
+        Column("registered_participants", Integer),
+        Column("google_maps_url", String, nullable=True),
+        Column("google_drive_url", String, nullable=True),
+        Column("deleted", Boolean),
+        Column("created_at", DateTime),
+        Column("updated_at", DateTime),
+        Column("archived_at", DateTime, nullable=False, server_default=func.now()),
+    )
+    results_archive = Table(
+        "results_archive",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("event_id", Integer, nullable=False),
+        Column("category", String, nullable=False),
+        Column("team", String, nullable=False),
+        Column("penalty_points", Integer),
+        Column("deleted", Boolean),
+        Column("created_at", DateTime),
+        Column("updated_at", DateTime),
+        Column("archived_at", DateTime, nullable=False, server_default=func.now()),
+    )
+    events_archive.create(connection, checkfirst=True)
+    results_archive.create(connection, checkfirst=True)
+    Index("ix_results_archive_event_id", results_archive.c.event_id).create(connection, checkfirst=True)
+
+    results = Table(
+        "results",
+        MetaData(),
+        Column("id", Integer, primary_key=True),
+        Column("deleted", Boolean),
+        Column("updated_at", DateTime),
+    )
+    Index(
+        "ix_results_deleted_updated",
+        results.c.updated_at,
+        postgresql_where=results.c.deleted == True,
+        sqlite_where=results.c.deleted == True,
+    ).create(connection, checkfirst=True)
@@ -0,0 +1,19 @@
+"""
+Indeks (event_id, team) tabeli standings - GET /results/{event_id}/leaderboard?around_team=X
+znajduje zespół bez przeglądania klasyfikacji całego wydarzenia.
+"""
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table
+
+
+def upgrade(connection):
+    metadata = MetaData()
+
+    standings = Table(
+        "standings",
+        metadata,
+        Column("result_id", Integer, primary_key=True),
+        Column("event_id", Integer),
+        Column("team", String),
+    )
+
+    Index("ix_standings_event_team", standings.c.event_id, standings.c.team).create(connection, checkfirst=True)
@@ -0,0 +1,162 @@
+from domain.data_version import DataVersion
+from domain.event import Event
+from domain.result import Result, ResultChangeSet
+from domain.standing import Standing
+from infrastructure.repository_cache import RepositoryCache
+from repositories.data_version_repository import EVENTS_SCOPE, results_scope
+from typing import Dict, List, Optional
+
+class CachedEventRepository:
+    """
+    Dekorator EventRepository - odczyty list i pojedynczych wydarzeń idą przez cache,
+    a każdy zapis unieważnia zakres "events" po zatwierdzeniu transakcji.
+    Pozostałe metody (np. eksport strumieniowy) trafiają bez zmian do repozytorium bazy.
+    Zwracane obiekty są współdzielone - nie wolno ich modyfikować.
+
+    Wersja danych (get_version) nie jest cache'owana - to jedno zapytanie po kluczu głównym,
+    od którego zależy ETag. Odczyty po niej w tym samym żądaniu mają wersję w kluczu cache,
+    więc nawet pominięte unieważnienie nie zwróci treści starszej niż wersja w ETag.
+    """
+
+    def __init__(self, inner, cache: RepositoryCache):
+        self.inner = inner
+        self.cache = cache
+        # Wersja zakresu odczytana w tym żądaniu (instancja żyje tyle co żądanie)
+        self._version: Optional[int] = None
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+    def add(self, event: Event) -> Event:
+        created = self.inner.add(event)
+        self.cache.invalidate(EVENTS_SCOPE)
+        return created
+
+    def update(self, event: Event) -> Optional[Event]:
+        updated = self.inner.update(event)
+        if updated is not None:
+            self.cache.invalidate(EVENTS_SCOPE)
+        return updated
+
+    def soft_delete(self, event_id: int) -> bool:
+        success = self.inner.soft_delete(event_id)
+        if success:
+            self.cache.invalidate(EVENTS_SCOPE)
+        return success
+
+    def list_all_sorted(self) -> List[Event]:
+        return self.cache.get_or_load("events.list_all_sorted", EVENTS_SCOPE, (self._version,), self.inner.list_all_sorted)
+
+    def list_latest_events(self, limit: int = 3) -> List[Event]:
+        return self.cache.get_or_load(
+            "events.list_latest_events", EVENTS_SCOPE, (self._version, limit),
+            lambda: self.inner.list_latest_events(limit)
+        )
+
+    def list_page(self, limit=None, after=None, date_from=None, date_to=None, category=None, location=None, fields=None) -> List[Event]:
+        arguments = (self._version, limit, after, date_from, date_to, category, location, tuple(fields) if fields is not None else None)
+        return self.cache.get_or_load(
+            "events.list_page", EVENTS_SCOPE, arguments,
+            lambda: self.inner.list_page(
+                limit=limit, after=after, date_from=date_from, date_to=date_to,
+                category=category, location=location, fields=fields
+            )
+        )
+
+    def get_by_id(self, event_id: int) -> Optional[Event]:
+        return self.cache.get_or_load(
+            "events.get_by_id", EVENTS_SCOPE, (self._version, event_id),
+            lambda: self.inner.get_by_id(event_id)
+        )
+
+    def get_version(self) -> DataVersion:
+        version = self.inner.get_version()
+        self._version = version.version
+        return version
+
+
+class CachedResultRepository:
+    """
+    Dekorator ResultRepository - wyniki i klasyfikacja wydarzenia idą przez cache,
+    unieważniany osobno dla każdego wydarzenia (zakres results:<event_id>).
+    Zwracane obiekty są współdzielone - nie wolno ich modyfikować.
+    Wersja wyników nie jest cache'owana i trafia do klucza odczytów jak w CachedEventRepository.
+    """
+
+    def __init__(self, inner, cache: RepositoryCache):
+        self.inner = inner
+        self.cache = cache
+        # Wydarzenia wyników pobranych w tym żądaniu - soft_delete nie musi ich szukać ponownie
+        self._event_ids: Dict[int, int] = {}
+        # Wersje wyników wydarzeń odczytane w tym żądaniu
+        self._versions: Dict[int, int] = {}
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+    def add(self, result: Result) -> Result:
+        created = self.inner.add(result)
+        self.cache.invalidate(results_scope(result.event_id))
+        return created
+
+    def add_many(self, results: List[Result]) -> List[Result]:
+        created = self.inner.add_many(results)
+        for event_id in sorted({result.event_id for result in results}):
+            self.cache.invalidate(results_scope(event_id))
+        return created
+
+    def replace_for_event(self, event_id: int, results: List[Result]) -> ResultChangeSet:
+        changes = self.inner.replace_for_event(event_id, results)
+        if changes.inserted or changes.updated or changes.deleted:
+            self.cache.invalidate(results_scope(event_id))
+        return changes
+
+    def delete_all_for_event(self, event_id: int) -> bool:
+        success = self.inner.delete_all_for_event(event_id)
+        self.cache.invalidate(results_scope(event_id))
+        return success
+
+    def soft_delete(self, result_id: int) -> bool:
+        event_id = self._event_ids.get(result_id)
+        if event_id is None:
+            result = self.inner.get_by_id(result_id)
+            event_id = result.event_id if result is not None else None
+        success = self.inner.soft_delete(result_id)
+        # Wynik już wcześniej usunięty - odczyty w cache go nie zawierają
+        if success and event_id is not None:
+            self.cache.invalidate(results_scope(event_id))
+        return success
+
+    def get_by_id(self, result_id: int) -> Optional[Result]:
+        # Pojedyncze wyniki nie są cache'owane - nie wiadomo z góry, do którego wydarzenia należą
+        result = self.inner.get_by_id(result_id)
+        if result is not None:
+            self._event_ids[result.id] = result.event_id
+        return result
+
+    def get_by_event_grouped_by_category(self, event_id: int) -> Dict[str, List[Result]]:
+        return self.cache.get_or_load(
+            "results.get_by_event_grouped_by_category", results_scope(event_id), (self._versions.get(event_id),),
+            lambda: self.inner.get_by_event_grouped_by_category(event_id)
+        )
+
+    def get_leaderboard(
+        self,
+        event_id: int,
+        category: Optional[str] = None,
+        top: Optional[int] = None,
+        around_team: Optional[str] = None,
+        window: int = 2
+    ) -> Dict[str, List[Standing]]:
+        return self.cache.get_or_load(
+            "results.get_leaderboard", results_scope(event_id),
+            (self._versions.get(event_id), category, top, around_team, window),
+            lambda: self.inner.get_leaderboard(
+                event_id, category=category, top=top, around_team=around_team, window=window
+            )
+        )
+
+    def get_version(self, event_id: int) -> DataVersion:
+        version = self.inner.get_version(event_id)
+        self._versions[event_id] = version.version
+        return version
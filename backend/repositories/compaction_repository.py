@@ -0,0 +1,203 @@
+from sqlalchemy import and_, delete, func, insert, or_, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from infrastructure.db_models import ArchivedEventModel, ArchivedResultModel, EventModel, ResultModel, StandingModel
+from repositories.data_version_repository import SqlAlchemyDataVersionRepository, results_scope
+from repositories.event_repository import EVENT_FIELDS
+from repositories.result_repository import RESULT_FIELDS
+from datetime import datetime
+from typing import Collection, List, Optional, Tuple
+
+# Tabele raportowane przez kompaktowanie (liczba wierszy i rozmiar na dysku)
+COMPACTED_TABLES = {
+    "events": EventModel,
+    "results": ResultModel,
+    "standings": StandingModel,
+    "events_archive": ArchivedEventModel,
+    "results_archive": ArchivedResultModel,
+}
+
+class SqlAlchemyCompactionRepository:
+    """
+    CompactionRepository - fizyczne usuwanie wierszy oznaczonych jako usunięte (soft delete).
+    Każda metoda *_batch przetwarza najwyżej `batch_size` wierszy w osobnej, krótkiej
+    transakcji - blokady wierszy trzymane są tylko na czas jednej paczki.
+    Czas usunięcia to updated_at (ustawiany przy oznaczeniu wiersza jako usuniętego).
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.versions = SqlAlchemyDataVersionRepository(db)
+
+    def database_now(self) -> datetime:
+        """Czas bazy danych - ta sama strefa co updated_at zapisywany przez func.now()"""
+        now = self.db.execute(select(func.now())).scalar()
+        self.db.commit()
+        return now
+
+    def count_candidates(self, cutoff: datetime) -> Tuple[int, int]:
+        """(wydarzenia, wyniki) do usunięcia przed `cutoff` - do podglądu bez zmian"""
+        expired_events = select(EventModel.id).where(EventModel.deleted == True, EventModel.updated_at < cutoff)
+        events = self.db.execute(select(func.count()).select_from(expired_events.subquery())).scalar()
+        # Wyniki usuniętych wydarzeń znikają razem z nimi, także aktywne
+        results = self.db.execute(
+            select(func.count()).select_from(ResultModel).where(or_(
+                and_(ResultModel.deleted == True, ResultModel.updated_at < cutoff),
+                ResultModel.event_id.in_(expired_events)
+            ))
+        ).scalar()
+        self.db.commit()
+        return events, results
+
+    def compact_events_batch(
+        self,
+        cutoff: datetime,
+        batch_size: int,
+        archive: bool = True,
+        exclude: Collection[int] = ()
+    ) -> Tuple[List[int], int, List[int]]:
+        """
+        Usuwa paczkę wydarzeń usuniętych przed `cutoff` razem z ich wynikami (także aktywnymi)
+        i klasyfikacją. Zwraca (ID usuniętych wydarzeń, liczba usuniętych wyników, ID pominiętych).
+        Gdy paczka narusza klucz obcy (wynik dopisany do wydarzenia w trakcie), wydarzenia są
+        usuwane pojedynczo, a te z błędem pomijane - wywołujący podaje je potem w `exclude`.
+        """
+        event_ids = self._lock_candidates(self._expired_events(cutoff, exclude).limit(batch_size))
+        if not event_ids:
+            return [], 0, []
+
+        try:
+            removed_results = self._remove_events(event_ids, archive)
+            self.db.commit()
+            return event_ids, removed_results, []
+        except IntegrityError:
+            self.db.rollback()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        compacted, removed_results, skipped = [], 0, []
+        for event_id in event_ids:
+            # Blokady paczki zniknęły z rollback - wydarzenie mogło zostać w tym czasie zajęte
+            if not self._lock_candidates(self._expired_events(cutoff).where(EventModel.id == event_id)):
+                continue
+            try:
+                removed_results += self._remove_events([event_id], archive)
+                self.db.commit()
+                compacted.append(event_id)
+            except IntegrityError:
+                self.db.rollback()
+                skipped.append(event_id)
+            except Exception:
+                self.db.rollback()
+                raise
+
+        return compacted, removed_results, skipped
+
+    def compact_results_batch(self, cutoff: datetime, batch_size: int, archive: bool = True) -> int:
+        """Usuwa paczkę wyników usuniętych przed `cutoff`; zwraca liczbę usuniętych wierszy"""
+        result_ids = self._lock_candidates(
+            select(ResultModel.id).where(ResultModel.deleted == True, ResultModel.updated_at < cutoff)
+            .order_by(ResultModel.id).limit(batch_size)
+        )
+        if not result_ids:
+            return 0
+
+        try:
+            if archive:
+                self._archive(ArchivedResultModel, ResultModel, RESULT_FIELDS, ResultModel.id.in_(result_ids))
+            # Usunięte wyniki nie mają wierszy w klasyfikacji - to tylko zabezpieczenie klucza obcego
+            self.db.execute(delete(StandingModel).where(StandingModel.result_id.in_(result_ids)))
+            removed = self.db.execute(
+                delete(ResultModel).where(ResultModel.id.in_(result_ids), ResultModel.deleted == True)
+            ).rowcount
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        return removed
+
+    def table_stats(self) -> dict:
+        """Liczba wierszy (w tym usuniętych) i rozmiar na dysku każdej tabeli, gdy baza go udostępnia"""
+        stats = {}
+        for name, model in COMPACTED_TABLES.items():
+            row = {"rows": self.db.execute(select(func.count()).select_from(model)).scalar()}
+            if hasattr(model, "deleted") and not name.endswith("_archive"):
+                row["deleted"] = self.db.execute(
+                    select(func.count()).select_from(model).where(model.deleted == True)
+                ).scalar()
+            row["bytes"] = self._table_bytes(name)
+            stats[name] = row
+        self.db.commit()
+        return stats
+
+    def vacuum(self) -> None:
+        """
+        Oddaje miejsce po usuniętych wierszach: VACUUM ANALYZE tabel (PostgreSQL)
+        albo VACUUM całego pliku (SQLite). Wymaga połączenia poza transakcją.
+        """
+        with self.db.get_bind().connect() as connection:
+            connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+            if connection.dialect.name == "postgresql":
+                for name in COMPACTED_TABLES:
+                    connection.execute(text(f"VACUUM ANALYZE {name}"))
+            elif connection.dialect.name == "sqlite":
+                connection.execute(text("VACUUM"))
+
+    @staticmethod
+    def _expired_events(cutoff: datetime, exclude: Collection[int] = ()):
+        query = select(EventModel.id).where(EventModel.deleted == True, EventModel.updated_at < cutoff)
+        if exclude:
+            query = query.where(EventModel.id.notin_(list(exclude)))
+        return query.order_by(EventModel.id)
+
+    def _remove_events(self, event_ids: List[int], archive: bool) -> int:
+        """Archiwizuje i usuwa zablokowane wydarzenia z wynikami i klasyfikacją (bez commit)"""
+        # Wyniki też są blokowane - trwające zmiany wyników tych wydarzeń kończą się przed usunięciem
+        self.db.execute(select(ResultModel.id).where(ResultModel.event_id.in_(event_ids)).with_for_update()).all()
+        if archive:
+            self._archive(ArchivedResultModel, ResultModel, RESULT_FIELDS, ResultModel.event_id.in_(event_ids))
+        self.db.execute(delete(StandingModel).where(StandingModel.event_id.in_(event_ids)))
+        removed_results = self.db.execute(delete(ResultModel).where(ResultModel.event_id.in_(event_ids))).rowcount
+        if archive:
+            self._archive(ArchivedEventModel, EventModel, EVENT_FIELDS, EventModel.id.in_(event_ids))
+        self.db.execute(delete(EventModel).where(EventModel.id.in_(event_ids), EventModel.deleted == True))
+        # Wyniki usuniętego wydarzenia były dostępne pod /results/{event_id} - zmienia się ich wersja
+        if removed_results:
+            self.versions.bump(*(results_scope(event_id) for event_id in event_ids))
+        return removed_results
+
+    def _lock_candidates(self, query) -> List[int]:
+        """
+        ID kandydatów paczki. W PostgreSQL wiersze są blokowane, a zablokowane przez
+        bieżący ruch pomijane (SKIP LOCKED) - kompaktowanie nigdy na nie nie czeka.
+        Zapis wyników blokuje swoje wydarzenie (FOR SHARE), więc jest tu pomijane.
+        """
+        return list(self.db.execute(query.with_for_update(skip_locked=True)).scalars())
+
+    def _archive(self, archive_model, model, fields: Tuple[str, ...], condition) -> None:
+        """Kopiuje wiersze spełniające warunek do tabeli archiwum (INSERT ... SELECT)"""
+        self.db.execute(
+            insert(archive_model).from_select(
+                list(fields),
+                select(*(getattr(model, name) for name in fields)).where(condition)
+            )
+        )
+
+    def _table_bytes(self, table: str) -> Optional[int]:
+        """Rozmiar tabeli z indeksami w bajtach (PostgreSQL, SQLite z dbstat) albo None"""
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            return self.db.execute(text("SELECT pg_total_relation_size(:table)"), {"table": table}).scalar()
+        if dialect == "sqlite":
+            try:
+                return self.db.execute(text(
+                    "SELECT COALESCE(SUM(dbstat.pgsize), 0) FROM dbstat "
+                    "JOIN sqlite_master ON sqlite_master.name = dbstat.name "
+                    "WHERE sqlite_master.tbl_name = :table"
+                ), {"table": table}).scalar()
+            except Exception:
+                # SQLite bez rozszerzenia dbstat
+                self.db.rollback()
+        return None
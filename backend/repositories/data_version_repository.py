@@ -0,0 +1,67 @@
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from infrastructure.db_models import DataVersionModel
+from domain.data_version import DataVersion
+
+# Zakres listy wydarzeń (GET /events, GET /events/all)
+EVENTS_SCOPE = "events"
+
+def results_scope(event_id: int) -> str:
+    """Zakres wyników jednego wydarzenia (GET /results/{event_id} i klasyfikacja)"""
+    return f"results:{event_id}"
+
+def _bump_time(dialect: str):
+    """
+    Czas zwiększenia wersji w UTC (podstawa Last-Modified). W PostgreSQL now() to początek
+    transakcji - dłuższy zapis dostałby czas starszy niż wersja zatwierdzona przed nim.
+    clock_timestamp() jest liczony po blokadzie wiersza wersji, więc czasy kolejnych wersji rosną.
+    """
+    if dialect == "postgresql":
+        return func.timezone("UTC", func.clock_timestamp())
+    return func.now()
+
+class SqlAlchemyDataVersionRepository:
+    """
+    DataVersionRepository - liczniki zmian danych używane do ETagów.
+    Metoda bump nie robi commit - wywołują ją repozytoria wydarzeń i wyników w swojej
+    transakcji, więc nowa wersja jest widoczna dokładnie wtedy, gdy zapisane dane.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, scope: str) -> DataVersion:
+        """Zwraca aktualną wersję zakresu (0, gdy nic jeszcze nie zapisano)"""
+        row = self.db.execute(
+            select(DataVersionModel.version, DataVersionModel.updated_at).where(DataVersionModel.scope == scope)
+        ).first()
+        if row is None:
+            return DataVersion(scope)
+        return DataVersion(scope, row.version, row.updated_at)
+
+    def bump(self, *scopes: str) -> None:
+        """Zwiększa wersje zakresów jednym zapytaniem (INSERT ... ON CONFLICT DO UPDATE)"""
+        if not scopes:
+            return
+        
+        dialect = self.db.get_bind().dialect.name
+        values = [{"scope": scope, "version": 1, "updated_at": _bump_time(dialect)} for scope in sorted(set(scopes))]
+        if dialect in ("postgresql", "sqlite"):
+            upsert = (postgresql.insert if dialect == "postgresql" else sqlite.insert)(DataVersionModel).values(values)
+            self.db.execute(upsert.on_conflict_do_update(
+                index_elements=[DataVersionModel.scope],
+                set_={"version": DataVersionModel.version + 1, "updated_at": _bump_time(dialect)}
+            ))
+            return
+        
+        # Pozostałe bazy: aktualizacja, a brakujące zakresy wstawiane
+        for value in values:
+            updated = self.db.execute(
+                update(DataVersionModel)
+                .where(DataVersionModel.scope == value["scope"])
+                .values(version=DataVersionModel.version + 1, updated_at=_bump_time(dialect))
+            )
+            if updated.rowcount == 0:
+                self.db.execute(insert(DataVersionModel).values(**value))
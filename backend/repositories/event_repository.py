@@ -1,8 +1,22 @@
+from sqlalchemy import and_, or_, select, update
 from sqlalchemy.orm import Session
-from infrastructure.db_models import EventModel
+from infrastructure.db_models import EventModel, categories_contain
+from domain.data_version import DataVersion
 from domain.event import Event
-import json
-from typing import List, Optional
+from repositories.data_version_repository import EVENTS_SCOPE, SqlAlchemyDataVersionRepository
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Pola wydarzenia, które można pobrać przez selektor pól
+EVENT_FIELDS = (
+    "id", "name", "date", "categories", "location", "start_point_url", "start_time", "fee",
+    "registration_deadline", "registered_participants", "google_maps_url", "google_drive_url", "deleted",
+    "created_at", "updated_at",
+)
+
+def _escape_like(value: str) -> str:
+    """Zamienia znaki specjalne LIKE (%, _ i znak ucieczki \\) na dosłowne"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 class SqlAlchemyEventRepository:
     """
@@ -12,13 +26,14 @@ class SqlAlchemyEventRepository:
     
     def __init__(self, db: Session):
         self.db = db
+        self.versions = SqlAlchemyDataVersionRepository(db)
 
     def add(self, event: Event) -> Event:
         """Dodaje nowe wydarzenie do bazy danych"""
         db_event = EventModel(
             name=event.name,
             date=event.date,
-            categories=json.dumps(event.categories),
+            categories=event.categories,
             location=event.location,
             start_point_url=event.start_point_url,
             start_time=event.start_time,
@@ -29,6 +44,7 @@ class SqlAlchemyEventRepository:
             google_drive_url=event.google_drive_url,
         )
         self.db.add(db_event)
+        self.versions.bump(EVENTS_SCOPE)
         self.db.commit()
         self.db.refresh(db_event)
         
@@ -40,49 +56,141 @@ class SqlAlchemyEventRepository:
         event = self.db.query(EventModel).filter(EventModel.id == event_id).first()
         if event:
             event.deleted = True
+            self.versions.bump(EVENTS_SCOPE)
             self.db.commit()
             return True
         return False
 
     def list_all_sorted(self) -> List[Event]:
         """Listuje wszystkie aktywne wydarzenia posortowane po dacie"""
-        events = self.db.query(EventModel).filter_by(deleted=False).order_by(EventModel.date).all()
-        return [self._to_domain(event) for event in events]
+        query = self._select_events().where(EventModel.deleted == False).order_by(EventModel.date, EventModel.id)
+        return self._fetch_events(query)
     
     def list_latest_events(self, limit: int = 3) -> List[Event]:
         """Listuje najnowsze aktywne wydarzenia posortowane po dacie (domyślnie 3)"""
-        events = self.db.query(EventModel).filter_by(deleted=False).order_by(EventModel.date.desc()).limit(limit).all()
-        return [self._to_domain(event) for event in events]
+        query = (
+            self._select_events()
+            .where(EventModel.deleted == False)
+            .order_by(EventModel.date.desc(), EventModel.id.desc())
+            .limit(limit)
+        )
+        return self._fetch_events(query)
+    
+    def list_page(
+        self,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        category: Optional[str] = None,
+        location: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Event]:
+        """
+        Listuje aktywne wydarzenia posortowane po (data, id) - stronicowanie kluczem.
+        `after` to (data, id) ostatniego wydarzenia z poprzedniej strony.
+        Gdy podano `fields`, pobierane są tylko te kolumny (pozostałe pola mają wartość None).
+        """
+        selected = [name for name in EVENT_FIELDS if fields is None or name in fields or name in ("id", "date")]
+        query = select(*(getattr(EventModel, name) for name in selected)).where(EventModel.deleted == False)
+        
+        if after is not None:
+            after_date, after_id = after
+            query = query.where(or_(
+                EventModel.date > after_date,
+                and_(EventModel.date == after_date, EventModel.id > after_id)
+            ))
+        if date_from is not None:
+            query = query.where(EventModel.date >= date_from)
+        if date_to is not None:
+            query = query.where(EventModel.date <= date_to)
+        if category:
+            query = query.where(categories_contain(EventModel.categories, category))
+        if location:
+            # Fragment nazwy miejsca - %, _ i \ z parametru są zwykłymi znakami, nie wzorcem
+            query = query.where(EventModel.location.ilike(f"%{_escape_like(location)}%", escape="\\"))
+        
+        query = query.order_by(EventModel.date, EventModel.id)
+        if limit is not None:
+            query = query.limit(limit)
+        
+        events = []
+        for row in self.db.execute(query).mappings():
+            events.append(Event(**{name: row.get(name) for name in EVENT_FIELDS}))
+        return events
+    
+    def iter_for_export(
+        self,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """Strumieniowo zwraca aktywne wydarzenia jako słowniki (kursor po stronie serwera)"""
+        query = (
+            select(
+                *(getattr(EventModel, name) for name in EVENT_FIELDS if name != "deleted"),
+            )
+            .where(EventModel.deleted == False)
+            .order_by(EventModel.date, EventModel.id)
+            .execution_options(yield_per=batch_size)
+        )
+        if date_from is not None:
+            query = query.where(EventModel.date >= date_from)
+        if date_to is not None:
+            query = query.where(EventModel.date <= date_to)
+        
+        for row in self.db.execute(query).mappings():
+            yield dict(row)
     
     def get_by_id(self, event_id: int) -> Optional[Event]:
         """Pobiera wydarzenie po ID"""
-        event = self.db.query(EventModel).filter(EventModel.id == event_id, EventModel.deleted == False).first()
-        return self._to_domain(event) if event else None
+        events = self._fetch_events(self._select_events().where(EventModel.id == event_id, EventModel.deleted == False))
+        return events[0] if events else None
     
-    def update(self, event: Event) -> Event:
-        """Aktualizuje wydarzenie w bazie danych"""
-        db_event = self.db.query(EventModel).filter(EventModel.id == event.id).first()
-        if not db_event:
-            raise ValueError(f"Wydarzenie o ID {event.id} nie zostało znalezione")
-        
-        # Aktualizuj pola
-        db_event.name = event.name
-        db_event.date = event.date
-        db_event.categories = json.dumps(event.categories)
-        db_event.location = event.location
-        db_event.start_point_url = event.start_point_url
-        db_event.start_time = event.start_time
-        db_event.fee = event.fee
-        db_event.registration_deadline = event.registration_deadline
-        db_event.registered_participants = event.registered_participants
-        db_event.google_maps_url = event.google_maps_url
-        db_event.google_drive_url = event.google_drive_url
-        
+    def update(self, event: Event) -> Optional[Event]:
+        """
+        Aktualizuje aktywne wydarzenie jednym UPDATE ... RETURNING.
+        Zwraca None, gdy wydarzenie nie istnieje albo zostało usunięte.
+        """
+        query = (
+            update(EventModel)
+            .where(EventModel.id == event.id, EventModel.deleted == False)
+            .values(
+                name=event.name,
+                date=event.date,
+                categories=event.categories,
+                location=event.location,
+                start_point_url=event.start_point_url,
+                start_time=event.start_time,
+                fee=event.fee,
+                registration_deadline=event.registration_deadline,
+                registered_participants=event.registered_participants,
+                google_maps_url=event.google_maps_url,
+                google_drive_url=event.google_drive_url,
+            )
+            .returning(*(getattr(EventModel, name) for name in EVENT_FIELDS))
+            .execution_options(synchronize_session=False)
+        )
+        row = self.db.execute(query).first()
+        if row is not None:
+            self.versions.bump(EVENTS_SCOPE)
         self.db.commit()
-        self.db.refresh(db_event)
-        
-        # Konwertuj z powrotem na domain object
-        return self._to_domain(db_event)
+        return Event(**dict(zip(EVENT_FIELDS, row))) if row is not None else None
+    
+    def get_version(self) -> DataVersion:
+        """Wersja listy wydarzeń - zmienia się przy każdym dodaniu, edycji i usunięciu"""
+        return self.versions.get(EVENTS_SCOPE)
+    
+    @staticmethod
+    def _select_events():
+        """
+        Odczyt przez SQLAlchemy Core - krotki kolumn zamiast obiektów ORM (bez identity map
+        i śledzenia zmian), mapowane od razu na domain objects
+        """
+        return select(*(getattr(EventModel, name) for name in EVENT_FIELDS))
+    
+    def _fetch_events(self, query) -> List[Event]:
+        return [Event(**dict(zip(EVENT_FIELDS, row))) for row in self.db.execute(query)]
     
     def _to_domain(self, db_event: EventModel) -> Event:
         """Konwertuje model bazy danych na domain object"""
@@ -90,7 +198,7 @@ class SqlAlchemyEventRepository:
             id=db_event.id,
             name=db_event.name,
             date=db_event.date,
-            categories=json.loads(db_event.categories),
+            categories=db_event.categories,
             location=db_event.location,
             start_point_url=db_event.start_point_url,
             start_time=db_event.start_time,
@@ -99,5 +207,7 @@ class SqlAlchemyEventRepository:
             registered_participants=db_event.registered_participants,
             google_maps_url=db_event.google_maps_url,
             google_drive_url=db_event.google_drive_url,
-            deleted=db_event.deleted
+            deleted=db_event.deleted,
+            created_at=db_event.created_at,
+            updated_at=db_event.updated_at
         ) 
\ No newline at end of file
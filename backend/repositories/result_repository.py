@@ -1,7 +1,16 @@
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
-from infrastructure.db_models import ResultModel
-from domain.result import Result
-from typing import List, Dict, Optional
+from infrastructure.db_models import EventModel, ResultModel
+from domain.data_version import DataVersion
+from domain.result import Result, ResultChangeSet
+from domain.standing import Standing
+from repositories.data_version_repository import SqlAlchemyDataVersionRepository, results_scope
+from repositories.standings_repository import SqlAlchemyStandingsRepository
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+# Kolumny wyniku czytane przez Core (kolejność krotek w _fetch_results)
+RESULT_FIELDS = ("id", "event_id", "category", "team", "penalty_points", "deleted", "created_at", "updated_at")
 
 class SqlAlchemyResultRepository:
     """
@@ -11,9 +20,12 @@ class SqlAlchemyResultRepository:
     
     def __init__(self, db: Session):
         self.db = db
+        self.standings = SqlAlchemyStandingsRepository(db)
+        self.versions = SqlAlchemyDataVersionRepository(db)
 
     def add(self, result: Result) -> Result:
         """Dodaje nowy wynik do bazy danych"""
+        self._lock_active_events([result.event_id])
         db_result = ResultModel(
             event_id=result.event_id,
             category=result.category,
@@ -21,42 +33,123 @@ class SqlAlchemyResultRepository:
             penalty_points=result.penalty_points,
         )
         self.db.add(db_result)
+        self.db.flush()
+        
+        # Klasyfikacja jest aktualizowana w tej samej transakcji
+        self.standings.apply_inserted([self._to_domain(db_result)])
+        self.versions.bump(results_scope(result.event_id))
         self.db.commit()
         self.db.refresh(db_result)
         
         # Konwertuj z powrotem na domain object
         return self._to_domain(db_result)
 
+    def add_many(self, results: List[Result]) -> List[Result]:
+        """Dodaje wiele wyników w jednej transakcji (jeden INSERT executemany)"""
+        if not results:
+            return []
+        
+        try:
+            self._lock_active_events({result.event_id for result in results})
+            created = self._insert_results(results)
+            self.standings.apply_inserted(created)
+            self.versions.bump(*(results_scope(event_id) for event_id in {result.event_id for result in results}))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        return created
+
     def soft_delete(self, result_id: int) -> bool:
         """Usuwa wynik (soft delete)"""
         result = self.db.query(ResultModel).filter(ResultModel.id == result_id).first()
         if result:
             result.deleted = True
+            self.standings.apply_deleted([result_id])
+            self.versions.bump(results_scope(result.event_id))
             self.db.commit()
             return True
         return False
 
     def get_by_event_grouped_by_category(self, event_id: int) -> Dict[str, List[Result]]:
         """Pobiera wyniki dla danego wydarzenia pogrupowane według kategorii"""
-        results = self.db.query(ResultModel).filter(
+        query = self._select_results().where(
             ResultModel.event_id == event_id,
             ResultModel.deleted == False
-        ).order_by(ResultModel.created_at.desc()).all()
+        ).order_by(ResultModel.category, ResultModel.created_at.desc())
         
         # Grupuj według kategorii
         grouped_results = {}
-        for result in results:
+        for result in self._fetch_results(query):
             category = result.category
             if category not in grouped_results:
                 grouped_results[category] = []
-            grouped_results[category].append(self._to_domain(result))
+            grouped_results[category].append(result)
         
         return grouped_results
     
+    def get_leaderboard(
+        self,
+        event_id: int,
+        category: Optional[str] = None,
+        top: Optional[int] = None,
+        around_team: Optional[str] = None,
+        window: int = 2
+    ) -> Dict[str, List[Standing]]:
+        """Zwraca klasyfikację wydarzenia z utrzymywanej tabeli standings"""
+        return self.standings.get_leaderboard(
+            event_id,
+            category=category,
+            top=top,
+            around_team=around_team,
+            window=window
+        )
+    
+    def iter_for_export(
+        self,
+        event_id: Optional[int] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Strumieniowo zwraca aktywne wyniki (z nazwą i datą wydarzenia) jako słowniki.
+        yield_per używa kursora po stronie serwera, więc w pamięci jest tylko jedna paczka wierszy.
+        """
+        query = (
+            select(
+                ResultModel.id,
+                ResultModel.event_id,
+                EventModel.name.label("event_name"),
+                EventModel.date.label("event_date"),
+                ResultModel.category,
+                ResultModel.team,
+                ResultModel.penalty_points,
+                ResultModel.created_at,
+                ResultModel.updated_at,
+            )
+            .join(EventModel, EventModel.id == ResultModel.event_id)
+            .where(ResultModel.deleted == False, EventModel.deleted == False)
+            .order_by(EventModel.date, ResultModel.event_id, ResultModel.category, ResultModel.id)
+            .execution_options(yield_per=batch_size)
+        )
+        if event_id is not None:
+            query = query.where(ResultModel.event_id == event_id)
+        if date_from is not None:
+            query = query.where(EventModel.date >= date_from)
+        if date_to is not None:
+            query = query.where(EventModel.date <= date_to)
+        
+        for row in self.db.execute(query).mappings():
+            yield dict(row)
+    
     def get_by_id(self, result_id: int) -> Optional[Result]:
         """Pobiera wynik po ID"""
-        result = self.db.query(ResultModel).filter(ResultModel.id == result_id, ResultModel.deleted == False).first()
-        return self._to_domain(result) if result else None
+        results = self._fetch_results(
+            self._select_results().where(ResultModel.id == result_id, ResultModel.deleted == False)
+        )
+        return results[0] if results else None
     
     def delete_all_for_event(self, event_id: int) -> bool:
         """Usuwa wszystkie wyniki dla danego wydarzenia (soft delete)"""
@@ -68,9 +161,165 @@ class SqlAlchemyResultRepository:
         for result in results:
             result.deleted = True
         
+        self.standings.delete_for_event(event_id)
+        self.versions.bump(results_scope(event_id))
         self.db.commit()
         return True
     
+    def replace_for_event(self, event_id: int, results: List[Result]) -> ResultChangeSet:
+        """
+        Doprowadza wyniki wydarzenia do podanego stanu w jednej transakcji.
+        Wiersze są dopasowywane po (kategoria, zespół) - zapisywane są tylko różnice.
+        """
+        self._lock_active_events([event_id])
+        existing = self.db.execute(
+            select(ResultModel.id, ResultModel.category, ResultModel.team, ResultModel.penalty_points)
+            .where(ResultModel.event_id == event_id, ResultModel.deleted == False)
+            .order_by(ResultModel.id)
+        ).all()
+        
+        # Istniejące wiersze czekające na dopasowanie, pogrupowane po (kategoria, zespół)
+        pending = {}
+        for row in existing:
+            pending.setdefault((row.category, row.team), []).append(row)
+        
+        changes = ResultChangeSet()
+        to_insert = []
+        for result in results:
+            matches = pending.get((result.category, result.team))
+            if not matches:
+                to_insert.append(result)
+                continue
+            
+            row = matches.pop(0)
+            if row.penalty_points == result.penalty_points:
+                changes.unchanged += 1
+            else:
+                changes.updated.append(Result(
+                    id=row.id,
+                    event_id=event_id,
+                    category=row.category,
+                    team=row.team,
+                    penalty_points=result.penalty_points
+                ))
+        
+        # Wszystko co zostało bez pary znika z tabeli wyników
+        changes.deleted = [row.id for rows in pending.values() for row in rows]
+        
+        try:
+            if changes.updated:
+                self.db.execute(
+                    update(ResultModel),
+                    [{"id": result.id, "penalty_points": result.penalty_points} for result in changes.updated]
+                )
+            
+            if changes.deleted:
+                self.db.execute(
+                    update(ResultModel)
+                    .where(ResultModel.id.in_(changes.deleted))
+                    .values(deleted=True)
+                    .execution_options(synchronize_session=False)
+                )
+            
+            if to_insert:
+                changes.inserted = self._insert_results(to_insert)
+            
+            self.standings.apply_updated(changes.updated)
+            self.standings.apply_deleted(changes.deleted)
+            self.standings.apply_inserted(changes.inserted)
+            if changes.inserted or changes.updated or changes.deleted:
+                self.versions.bump(results_scope(event_id))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        return changes
+    
+    def get_version(self, event_id: int) -> DataVersion:
+        """Wersja wyników wydarzenia - zmienia się przy każdym zapisie wyników"""
+        return self.versions.get(results_scope(event_id))
+    
+    def _lock_active_events(self, event_ids) -> None:
+        """
+        Sprawdza, że wydarzenia istnieją i nie są usunięte, i blokuje je do końca transakcji
+        (FOR SHARE w PostgreSQL) - kompaktowanie nie usunie ich w trakcie zapisu wyników
+        """
+        event_ids = set(event_ids)
+        active = set(self.db.execute(
+            select(EventModel.id)
+            .where(EventModel.id.in_(event_ids), EventModel.deleted == False)
+            .with_for_update(read=True)
+        ).scalars())
+        missing = sorted(event_ids - active)
+        if missing:
+            self.db.rollback()
+            raise ValueError(f"Wydarzenie {missing[0]} nie istnieje lub zostało usunięte")
+    
+    def _insert_results(self, results: List[Result]) -> List[Result]:
+        """
+        Wstawia wyniki jednym INSERT ... RETURNING i zwraca je z nadanymi ID (bez commit).
+        PostgreSQL zwraca wiersze w kolejności parametrów (sort_by_parameter_order) nadal
+        jednym zapytaniem. Na SQLite ta opcja wymusza osobny INSERT na każdy wiersz, więc
+        ID są przypisywane po wartościach (kategoria, zespół, punkty) - SQLite zwraca je
+        bez konwersji, a wiersze identyczne w tych polach są i tak nierozróżnialne.
+        """
+        in_parameter_order = self.db.get_bind().dialect.name == "postgresql"
+        rows = self.db.execute(
+            insert(ResultModel).returning(
+                ResultModel.id, ResultModel.category, ResultModel.team, ResultModel.penalty_points,
+                sort_by_parameter_order=in_parameter_order
+            ),
+            [
+                {
+                    "event_id": result.event_id,
+                    "category": result.category,
+                    "team": result.team,
+                    "penalty_points": result.penalty_points,
+                    "deleted": False,
+                }
+                for result in results
+            ]
+        ).all()
+        
+        if in_parameter_order:
+            # Wartości z bazy, np. punkty po konwersji kolumny INTEGER (2.5 -> 3)
+            return [
+                Result(
+                    id=row.id,
+                    event_id=result.event_id,
+                    category=row.category,
+                    team=row.team,
+                    penalty_points=row.penalty_points
+                )
+                for result, row in zip(results, rows)
+            ]
+        
+        ids = {}
+        for row in rows:
+            ids.setdefault((row.category, row.team, row.penalty_points), []).append(row.id)
+        return [
+            Result(
+                id=ids[(result.category, result.team, result.penalty_points)].pop(0),
+                event_id=result.event_id,
+                category=result.category,
+                team=result.team,
+                penalty_points=result.penalty_points
+            )
+            for result in results
+        ]
+    
+    @staticmethod
+    def _select_results():
+        """
+        Odczyt przez SQLAlchemy Core - krotki kolumn zamiast obiektów ORM (bez identity map
+        i śledzenia zmian), mapowane od razu na domain objects
+        """
+        return select(*(getattr(ResultModel, name) for name in RESULT_FIELDS))
+    
+    def _fetch_results(self, query) -> List[Result]:
+        return [Result(**dict(zip(RESULT_FIELDS, row))) for row in self.db.execute(query)]
+    
     def _to_domain(self, db_result: ResultModel) -> Result:
         """Konwertuje model bazy danych na domain object"""
         return Result(
@@ -79,5 +328,7 @@ class SqlAlchemyResultRepository:
             category=db_result.category,
             team=db_result.team,
             penalty_points=db_result.penalty_points,
-            deleted=db_result.deleted
+            deleted=db_result.deleted,
+            created_at=db_result.created_at,
+            updated_at=db_result.updated_at
         ) 
\ No newline at end of file
@@ -0,0 +1,291 @@
+from sqlalchemy import and_, delete, func, insert, literal, or_, select, union_all, update
+from sqlalchemy.orm import Session, aliased
+from infrastructure.db_models import ResultModel, StandingModel
+from domain.result import Result
+from domain.standing import Standing
+from typing import Dict, List, Optional
+
+# Kolejność klasyfikacji w kategorii - ta sama co w indeksie ix_standings_event_order
+def _standing_order(model):
+    return (model.penalty_points, model.team, model.result_id)
+
+def _before(model, anchor):
+    """Warunek: wiersz `model` jest w klasyfikacji przed wierszem `anchor` (tej samej kategorii)"""
+    return or_(
+        model.penalty_points < anchor.penalty_points,
+        and_(model.penalty_points == anchor.penalty_points, model.team < anchor.team),
+        and_(model.penalty_points == anchor.penalty_points, model.team == anchor.team, model.result_id < anchor.result_id),
+    )
+
+class SqlAlchemyStandingsRepository:
+    """
+    StandingsRepository - utrzymuje tabelę klasyfikacji równolegle z tabelą wyników.
+    Metody apply_* nie robią commit - wywołuje je SqlAlchemyResultRepository w swojej transakcji.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply_inserted(self, results: List[Result]) -> None:
+        """Dodaje wiersze klasyfikacji dla nowych wyników"""
+        if not results:
+            return
+        self.db.execute(insert(StandingModel), [
+            {
+                "result_id": result.id,
+                "event_id": result.event_id,
+                "category": result.category,
+                "team": result.team,
+                "penalty_points": result.penalty_points or 0,
+            }
+            for result in results
+        ])
+
+    def apply_updated(self, results: List[Result]) -> None:
+        """Aktualizuje punkty karne zmienionych wyników"""
+        if not results:
+            return
+        self.db.execute(update(StandingModel), [
+            {"result_id": result.id, "penalty_points": result.penalty_points or 0}
+            for result in results
+        ])
+
+    def apply_deleted(self, result_ids: List[int]) -> None:
+        """Usuwa z klasyfikacji usunięte wyniki"""
+        if not result_ids:
+            return
+        self.db.execute(delete(StandingModel).where(StandingModel.result_id.in_(result_ids)))
+
+    def delete_for_event(self, event_id: int) -> None:
+        """Usuwa całą klasyfikację wydarzenia"""
+        self.db.execute(delete(StandingModel).where(StandingModel.event_id == event_id))
+
+    def get_leaderboard(
+        self,
+        event_id: int,
+        category: Optional[str] = None,
+        top: Optional[int] = None,
+        around_team: Optional[str] = None,
+        window: int = 2
+    ) -> Dict[str, List[Standing]]:
+        """
+        Zwraca klasyfikację wydarzenia pogrupowaną według kategorii.
+        Zapytania czytają wiersze w kolejności indeksu ix_standings_event_order (bez sortowania).
+        `top` ogranicza wynik do pierwszych N miejsc, `around_team` do `window` pozycji wokół
+        zespołu - w obu przypadkach baza zwraca tylko te wiersze, a nie całe wydarzenie.
+        """
+        if around_team is not None:
+            return self._leaderboard_around(event_id, category, around_team, window)
+        
+        query = select(
+            StandingModel.result_id,
+            StandingModel.category,
+            StandingModel.team,
+            StandingModel.penalty_points,
+        ).where(StandingModel.event_id == event_id)
+        if category is not None:
+            query = query.where(StandingModel.category == category)
+        if top is not None:
+            thresholds = self._top_thresholds(event_id, category, top)
+            query = query.join(thresholds, and_(
+                StandingModel.category == thresholds.c.category,
+                StandingModel.penalty_points <= thresholds.c.max_points
+            ))
+        query = query.order_by(StandingModel.category, *_standing_order(StandingModel))
+        
+        # Wiersze zaczynają się od lidera kategorii - miejsca, remisy i stratę liczymy w jednym przejściu
+        leaderboard = {}
+        for row in self.db.execute(query):
+            standings = leaderboard.setdefault(row.category, [])
+            position = len(standings) + 1
+            previous = standings[-1] if standings else None
+            
+            if previous is not None and previous.penalty_points == row.penalty_points:
+                rank = previous.rank
+                previous.tied = True
+                tied = True
+            else:
+                rank = position
+                tied = False
+            
+            leader_points = standings[0].penalty_points if standings else row.penalty_points
+            standings.append(Standing(
+                result_id=row.result_id,
+                event_id=event_id,
+                category=row.category,
+                team=row.team,
+                penalty_points=row.penalty_points,
+                rank=rank,
+                position=position,
+                gap_to_leader=row.penalty_points - leader_points,
+                tied=tied
+            ))
+        
+        return leaderboard
+
+    def _top_thresholds(self, event_id: int, category: Optional[str], top: int):
+        """
+        (kategoria, max_points) - punkty N-tej pozycji w każdej kategorii albo ostatniej, gdy
+        kategoria ma mniej wierszy. Wiersze z punktami <= max_points to miejsca 1..N razem
+        z remisami na N-tym miejscu; każda wartość to jedno wyszukanie w indeksie.
+        """
+        if category is not None:
+            categories = select(literal(category).label("category")).subquery()
+        else:
+            # Kolejne kategorie wydarzenia skokami po indeksie (bez czytania wszystkich wierszy)
+            first = select(func.min(StandingModel.category).label("category")).where(
+                StandingModel.event_id == event_id
+            ).cte("leaderboard_categories", recursive=True)
+            following = select(
+                select(func.min(StandingModel.category)).where(
+                    StandingModel.event_id == event_id,
+                    StandingModel.category > first.c.category
+                ).scalar_subquery()
+            ).where(first.c.category.isnot(None))
+            categories = first.union_all(following)
+        
+        ranked = aliased(StandingModel)
+        in_category = and_(ranked.event_id == event_id, ranked.category == categories.c.category)
+        nth_points = (
+            select(ranked.penalty_points).where(in_category)
+            .order_by(*_standing_order(ranked)).offset(top - 1).limit(1)
+            .scalar_subquery()
+        )
+        last_points = select(func.max(ranked.penalty_points)).where(in_category).scalar_subquery()
+        return select(
+            categories.c.category,
+            func.coalesce(nth_points, last_points).label("max_points")
+        ).where(categories.c.category.isnot(None)).subquery()
+
+    def _leaderboard_around(self, event_id: int, category: Optional[str], team: str, window: int) -> Dict[str, List[Standing]]:
+        """
+        `window` pozycji nad i pod zespołem w każdej kategorii, w której występuje.
+        Dwa zapytania: pozycja zespołu (liczenie po indeksie), potem tylko wiersze okna
+        z miejscem, remisem i punktami lidera liczonymi w bazie.
+        """
+        anchor = aliased(StandingModel)
+        preceding = aliased(StandingModel)
+        anchors_query = select(
+            anchor.category,
+            anchor.penalty_points,
+            anchor.team,
+            anchor.result_id,
+            select(func.count()).select_from(preceding).where(
+                preceding.event_id == event_id,
+                preceding.category == anchor.category,
+                _before(preceding, anchor)
+            ).scalar_subquery().label("preceding"),
+        ).where(anchor.event_id == event_id, anchor.team == team)
+        if category is not None:
+            anchors_query = anchors_query.where(anchor.category == category)
+        
+        # Zespół wpisany kilka razy w kategorii - okno wokół jego najlepszej pozycji
+        anchors = {}
+        for row in self.db.execute(anchors_query):
+            current = anchors.get(row.category)
+            if current is None or row.preceding < current.preceding:
+                anchors[row.category] = row
+        if not anchors:
+            return {}
+        
+        parts = []
+        for category_name, row in sorted(anchors.items()):
+            start = max(row.preceding - window, 0)
+            parts.append(self._window_rows(event_id, category_name, start, row.preceding - start + window + 1))
+        
+        leaderboard = {}
+        for row in self.db.execute(union_all(*parts).order_by("category", "penalty_points", "team", "result_id")):
+            standings = leaderboard.setdefault(row.category, [])
+            start = max(anchors[row.category].preceding - window, 0)
+            standings.append(Standing(
+                result_id=row.result_id,
+                event_id=event_id,
+                category=row.category,
+                team=row.team,
+                penalty_points=row.penalty_points,
+                rank=row.better + 1,
+                position=start + len(standings) + 1,
+                gap_to_leader=row.penalty_points - row.leader_points,
+                tied=row.same_points > 1
+            ))
+        return leaderboard
+
+    def _window_rows(self, event_id: int, category: str, offset: int, limit: int):
+        """Wiersze kategorii od pozycji offset+1 z liczbą lepszych wyników, remisów i punktami lidera"""
+        other = aliased(StandingModel)
+        in_category = and_(other.event_id == event_id, other.category == StandingModel.category)
+        return (
+            select(
+                StandingModel.result_id,
+                StandingModel.category,
+                StandingModel.team,
+                StandingModel.penalty_points,
+                select(func.count()).select_from(other).where(
+                    in_category, other.penalty_points < StandingModel.penalty_points
+                ).scalar_subquery().label("better"),
+                select(func.count()).select_from(other).where(
+                    in_category, other.penalty_points == StandingModel.penalty_points
+                ).scalar_subquery().label("same_points"),
+                select(func.min(other.penalty_points)).where(in_category).scalar_subquery().label("leader_points"),
+            )
+            .where(StandingModel.event_id == event_id, StandingModel.category == category)
+            .order_by(*_standing_order(StandingModel))
+            .offset(offset)
+            .limit(limit)
+            .subquery()
+            .select()
+        )
+
+    def rebuild(self, event_id: Optional[int] = None) -> int:
+        """Odbudowuje klasyfikację z tabeli wyników (dla wydarzenia lub całej bazy) i zwraca liczbę wierszy"""
+        source = select(
+            ResultModel.id,
+            ResultModel.event_id,
+            ResultModel.category,
+            ResultModel.team,
+            func.coalesce(ResultModel.penalty_points, 0),
+        ).where(ResultModel.deleted == False)
+        clear = delete(StandingModel)
+        if event_id is not None:
+            source = source.where(ResultModel.event_id == event_id)
+            clear = clear.where(StandingModel.event_id == event_id)
+        
+        try:
+            self.db.execute(clear)
+            inserted = self.db.execute(
+                insert(StandingModel).from_select(
+                    ["result_id", "event_id", "category", "team", "penalty_points"], source
+                )
+            ).rowcount
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return inserted
+
+    def check(self, event_id: Optional[int] = None) -> List[str]:
+        """Porównuje klasyfikację z tabelą wyników i zwraca opis znalezionych rozbieżności"""
+        expected_query = select(
+            ResultModel.id, ResultModel.event_id, ResultModel.category, ResultModel.team,
+            func.coalesce(ResultModel.penalty_points, 0)
+        ).where(ResultModel.deleted == False)
+        actual_query = select(
+            StandingModel.result_id, StandingModel.event_id, StandingModel.category,
+            StandingModel.team, StandingModel.penalty_points
+        )
+        if event_id is not None:
+            expected_query = expected_query.where(ResultModel.event_id == event_id)
+            actual_query = actual_query.where(StandingModel.event_id == event_id)
+        
+        expected = {row[0]: tuple(row[1:]) for row in self.db.execute(expected_query)}
+        actual = {row[0]: tuple(row[1:]) for row in self.db.execute(actual_query)}
+        
+        problems = []
+        for result_id in sorted(expected.keys() - actual.keys()):
+            problems.append(f"Brak wyniku {result_id} w klasyfikacji")
+        for result_id in sorted(actual.keys() - expected.keys()):
+            problems.append(f"Wiersz klasyfikacji {result_id} nie ma aktywnego wyniku")
+        for result_id in sorted(expected.keys() & actual.keys()):
+            if expected[result_id] != actual[result_id]:
+                problems.append(f"Wynik {result_id}: oczekiwano {expected[result_id]}, jest {actual[result_id]}")
+        return problems
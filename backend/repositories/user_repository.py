@@ -2,6 +2,8 @@ import json
 from typing import Optional
 from sqlalchemy.orm import Session
 from infrastructure.db_models import UserModel
+from infrastructure.invalidation import cache_invalidation
+from infrastructure.principal_cache import PRINCIPAL_NAMESPACE
 from domain.user import User
 from domain.interfaces import UserRepository
 
@@ -31,9 +33,11 @@ class SqlAlchemyUserRepository(UserRepository):
             is_active=user.is_active
         )
         self.db.add(db_user)
+        # created_at/updated_at wracają z INSERT ... RETURNING - bez ponownego SELECT po commit
+        self.db.flush()
+        created = self._to_domain(db_user)
         self.db.commit()
-        self.db.refresh(db_user)
-        return self._to_domain(db_user)
+        return created
     
     def update_user(self, user: User) -> User:
         """Aktualizuje użytkownika"""
@@ -41,13 +45,21 @@ class SqlAlchemyUserRepository(UserRepository):
         if not db_user:
             raise ValueError(f"Użytkownik o ID {user.id} nie istnieje")
         
+        roles = json.dumps(user.roles)
+        access_changed = db_user.roles != roles or db_user.is_active != user.is_active
+        
         db_user.email = user.email
         db_user.name = user.name
-        db_user.roles = json.dumps(user.roles)
+        db_user.roles = roles
         db_user.is_active = user.is_active
         
         self.db.commit()
         self.db.refresh(db_user)
+        
+        # Zmiana ról lub aktywności unieważnia zapamiętane tokeny użytkownika (we wszystkich workerach)
+        if access_changed:
+            cache_invalidation.invalidate(PRINCIPAL_NAMESPACE, user.id)
+        
         return self._to_domain(db_user)
     
     def _to_domain(self, db_user: UserModel) -> User:
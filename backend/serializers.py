@@ -0,0 +1,80 @@
+import orjson
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+from domain.event import Event
+from domain.result import Result
+
+# Serializacja odpowiedzi bez pydantic - domain objects pochodzą z naszej bazy, więc nie
+# walidujemy ich ponownie. Format pól jest taki sam jak w EventResponse/ResultResponse
+# (schemas.py), które dalej opisują odpowiedzi w dokumentacji OpenAPI.
+
+def format_date(value: Optional[datetime]) -> Optional[str]:
+    """Data w formacie 2024-06-15"""
+    return value.date().isoformat() if value is not None else None
+
+def format_timestamp(value: Optional[datetime]) -> Optional[str]:
+    """Znacznik czasu w formacie 2024-06-15 10:00:00"""
+    return value.isoformat(sep=" ", timespec="seconds") if value is not None else None
+
+# Pola wydarzenia zapisywane jako data lub znacznik czasu
+_EVENT_DATE_FIELDS = {"date": format_date, "registration_deadline": format_date,
+                      "created_at": format_timestamp, "updated_at": format_timestamp}
+
+def event_to_dict(event: Event) -> dict:
+    """Zamienia wydarzenie na słownik w formacie EventResponse"""
+    return {
+        "id": event.id,
+        "name": event.name,
+        "date": format_date(event.date),
+        "categories": event.categories,
+        "location": event.location,
+        "start_point_url": event.start_point_url,
+        "start_time": event.start_time,
+        "fee": event.fee,
+        "registration_deadline": format_date(event.registration_deadline),
+        "registered_participants": event.registered_participants,
+        "google_maps_url": event.google_maps_url,
+        "google_drive_url": event.google_drive_url,
+        "deleted": event.deleted,
+        "created_at": format_timestamp(event.created_at),
+        "updated_at": format_timestamp(event.updated_at),
+    }
+
+def event_fields_to_dict(event: Event, fields: Sequence[str]) -> dict:
+    """Zwraca tylko wybrane pola wydarzenia w formacie odpowiedzi API"""
+    data = {}
+    for name in fields:
+        value = getattr(event, name)
+        formatter = _EVENT_DATE_FIELDS.get(name)
+        data[name] = formatter(value) if formatter else value
+    return data
+
+def events_to_list(events: Iterable[Event]) -> List[dict]:
+    return [event_to_dict(event) for event in events]
+
+def result_to_dict(result: Result) -> dict:
+    """Zamienia wynik na słownik w formacie ResultResponse"""
+    return {
+        "id": result.id,
+        "event_id": result.event_id,
+        "category": result.category,
+        "team": result.team,
+        "penalty_points": result.penalty_points,
+        "deleted": result.deleted,
+        "created_at": format_timestamp(result.created_at),
+        "updated_at": format_timestamp(result.updated_at),
+    }
+
+def results_by_category_to_dict(results_by_category: Dict[str, List[Result]]) -> Dict[str, List[dict]]:
+    return {
+        category: [result_to_dict(result) for result in results]
+        for category, results in results_by_category.items()
+    }
+
+# Gotowa treść odpowiedzi JSON (jak ORJSONResponse) - można ją współdzielić między żądaniami
+
+def events_to_json(events: Iterable[Event]) -> bytes:
+    return orjson.dumps(events_to_list(events))
+
+def results_by_category_to_json(results_by_category: Dict[str, List[Result]]) -> bytes:
+    return orjson.dumps(results_by_category_to_dict(results_by_category))
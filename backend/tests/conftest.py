@@ -0,0 +1,45 @@
+"""
+Wspólna konfiguracja testów. Moduły aplikacji czytają ustawienia przy imporcie, więc
+środowisko jest ustawiane tu, zanim zaimportuje je którykolwiek test: osobna baza SQLite
+w katalogu tymczasowym (nigdy DATABASE_URL z otoczenia) i budżety zapytań sprawdzane
+przez same testy zamiast middleware.
+"""
+import os
+import tempfile
+
+import pytest
+
+_database_dir = tempfile.mkdtemp(prefix="ino-tests-")
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL") or f"sqlite:///{_database_dir}/tests.db"
+os.environ["QUERY_BUDGET_MODE"] = "off"
+
+CATEGORIES = ["TZ", "TU", "TT", "TS"]
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """Silnik bazy testowej ze schematem po wszystkich migracjach"""
+    from infrastructure.database import engine
+    from infrastructure.migrations import run_migrations
+
+    run_migrations(engine)
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    from infrastructure.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture(scope="session")
+def app(engine):
+    """Aplikacja FastAPI podłączona do bazy testowej"""
+    from benchmarks.common import load_app
+
+    return load_app(os.environ["DATABASE_URL"])
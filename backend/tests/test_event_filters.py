@@ -0,0 +1,49 @@
+"""
+Filtr miejsca w GET /events/all (SqlAlchemyEventRepository.list_page) - fragment nazwy
+bez rozróżniania wielkości liter; %, _ i \\ w parametrze są zwykłymi znakami.
+"""
+from datetime import datetime
+
+import pytest
+
+from conftest import CATEGORIES
+from domain.event import Event
+from repositories.event_repository import SqlAlchemyEventRepository
+
+# Osobny dzień - wydarzenia innych testów w tej samej bazie nie trafiają do wyników
+DAY = datetime(2031, 5, 17)
+LOCATIONS = ["Las Oliwski", "Las_Oliwski", "100% Gdynia", "Sopot \\ plaża", "Chaszcze, Gdynia"]
+
+
+@pytest.fixture(scope="module")
+def repository(engine):
+    from infrastructure.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        repository = SqlAlchemyEventRepository(session)
+        for location in LOCATIONS:
+            repository.add(Event(
+                name=f"Filtr {location}", date=DAY, categories=CATEGORIES, location=location,
+                start_point_url="https://example.com/start", start_time="10:00",
+            ))
+        yield repository
+    finally:
+        session.close()
+
+
+def locations(repository, location):
+    events = repository.list_page(date_from=DAY, date_to=DAY.replace(hour=23), location=location)
+    return sorted(event.location for event in events)
+
+
+@pytest.mark.parametrize("location, expected", [
+    ("gdynia", ["100% Gdynia", "Chaszcze, Gdynia"]),
+    ("%", ["100% Gdynia"]),
+    ("_", ["Las_Oliwski"]),
+    ("Las_", ["Las_Oliwski"]),
+    ("\\", ["Sopot \\ plaża"]),
+    ("0%_", []),
+])
+def test_location_filter_matches_literal_fragment(repository, location, expected):
+    assert locations(repository, location) == expected
@@ -0,0 +1,61 @@
+"""
+Eksport CSV/NDJSON (ExportService) - pola w formacie odpowiedzi API, a plik wyników CSV
+da się wczytać z powrotem importem wyników.
+"""
+import io
+import json
+from datetime import datetime
+
+from conftest import CATEGORIES
+from domain.event import Event
+from infrastructure.result_import import iter_csv_records
+from serializers import event_to_dict
+from usecases.export_service import EVENT_EXPORT_FIELDS, ExportService
+
+
+class ExportRows:
+    """Repozytorium zwracające gotowe wiersze eksportu"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def iter_for_export(self, **filters):
+        return iter(self.rows)
+
+
+def test_exported_events_match_api_format():
+    event = Event(
+        id=7, name="Nocna INO", date=datetime(2024, 6, 1), categories=CATEGORIES, location="Gdynia",
+        start_point_url="https://example.com/start", start_time="21:00", fee=25.0,
+        registration_deadline=datetime(2024, 5, 20), registered_participants=12,
+        created_at=datetime(2024, 5, 1, 12, 30, 15, 123456), updated_at=datetime(2024, 5, 2, 8, 0, 1),
+    )
+    row = {name: getattr(event, name) for name in EVENT_EXPORT_FIELDS}
+    service = ExportService(None, ExportRows([row]))
+
+    exported = json.loads("".join(service.export_events("ndjson")))
+
+    api = event_to_dict(event)
+    assert exported == {name: api[name] for name in EVENT_EXPORT_FIELDS}
+
+
+def test_exported_results_csv_can_be_imported_again():
+    rows = [
+        {
+            "id": number, "event_id": 7, "event_name": "Nocna INO", "event_date": datetime(2024, 6, 1),
+            "category": category, "team": f"Zespół {number}", "penalty_points": number * 5,
+            "created_at": datetime(2024, 6, 1, 22, 15, 0, 500), "updated_at": datetime(2024, 6, 1, 22, 15, 0, 500),
+        }
+        for number, category in enumerate(CATEGORIES, start=1)
+    ]
+    service = ExportService(ExportRows(rows), None)
+
+    exported = "".join(service.export_results("csv"))
+
+    assert "2024-06-01,TZ" in exported
+    assert "2024-06-01 22:15:00" in exported
+    records = [record for _, record in iter_csv_records(io.BytesIO(exported.encode("utf-8")))]
+    assert records == [
+        {"category": row["category"], "team": row["team"], "penalty_points": str(row["penalty_points"])}
+        for row in rows
+    ]
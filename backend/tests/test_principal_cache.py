@@ -0,0 +1,97 @@
+"""
+Cache zweryfikowanych użytkowników (PrincipalCache) - wygasanie po TTL i `exp` tokenu,
+wypieranie LRU oraz odrzucanie tokenów z uszkodzonym `exp` w get_current_user.
+"""
+import base64
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import infrastructure.principal_cache as principal_cache_module
+from domain.user import User
+from infrastructure.principal_cache import PrincipalCache
+
+NOW = 1_700_000_000.0
+
+
+class Clock:
+    """Zastępuje time.time() w module cache - czas przesuwa test"""
+
+    def __init__(self, now: float = NOW):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(principal_cache_module, "time", clock)
+    return clock
+
+
+def user(number: int) -> User:
+    return User(id=f"oid-{number}", email=f"user{number}@example.com", name=f"Użytkownik {number}", roles=["admin"])
+
+
+def token(payload: dict) -> str:
+    def encode(data: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode("utf-8")).decode("ascii").rstrip("=")
+
+    return f"{encode({'alg': 'none', 'typ': 'JWT'})}.{encode(payload)}.test"
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = PrincipalCache(max_size=10, ttl_seconds=300)
+    cache.put("token", user(1))
+
+    clock.now = NOW + 299
+    assert cache.get("token").id == "oid-1"
+    clock.now = NOW + 300
+    assert cache.get("token") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_entry_never_outlives_token_exp(clock):
+    cache = PrincipalCache(max_size=10, ttl_seconds=300)
+    cache.put("token", user(1), token_expires_at=NOW + 60)
+    # Token już wygasły nie trafia do cache
+    cache.put("expired", user(2), token_expires_at=NOW - 1)
+
+    clock.now = NOW + 59
+    assert cache.get("token") is not None
+    assert cache.get("expired") is None
+    clock.now = NOW + 60
+    assert cache.get("token") is None
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = PrincipalCache(max_size=2, ttl_seconds=300)
+    cache.put("first", user(1))
+    cache.put("second", user(2))
+    # Odczyt odświeża wpis - wypierany jest "second"
+    assert cache.get("first") is not None
+    cache.put("third", user(3))
+
+    assert cache.get("second") is None
+    assert cache.get("first").id == "oid-1"
+    assert cache.get("third").id == "oid-3"
+    assert cache.stats()["evictions"] == 1
+    # Wypchnięty wpis znika też z indeksu użytkowników - unieważnienie nic już nie usuwa
+    cache.invalidate_user("oid-2")
+    assert cache.stats()["invalidations"] == 0
+
+
+@pytest.mark.parametrize("exp", ["jutro", "1700000000", True, None])
+def test_token_with_malformed_exp_is_rejected(app, exp):
+    payload = {"oid": "oid-exp", "email": "exp@example.com", "name": "Exp"}
+    if exp is not None:
+        payload["exp"] = exp
+
+    with TestClient(app) as client:
+        response = client.get("/auth/me", headers={"Authorization": f"Bearer {token(payload)}"})
+
+    # Brak exp jest dozwolony (wpis żyje wtedy TTL cache), uszkodzone exp to 401, a nie 500
+    assert response.status_code == (200 if exp is None else 401)
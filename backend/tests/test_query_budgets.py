@@ -0,0 +1,108 @@
+"""
+Liczba zapytań SQL każdej trasy nie przekracza jej @query_budget - przy pustym cache,
+dla dwóch rozmiarów danych i przy pierwszym logowaniu (scenariusze z benchmarks.query_counts).
+Pomiar jest powtarzany z kanałami między procesami na Postgres LISTEN/NOTIFY - NOTIFY
+wysyłany po zapisie nie może zużywać budżetu żądania.
+"""
+import pytest
+from sqlalchemy import event
+
+from benchmarks.query_counts import measure_routes
+
+
+@pytest.fixture(params=["memory", "postgres"])
+def bus(request, engine, monkeypatch):
+    """
+    Backend kanałów zmian wyników i unieważnień cache. Na SQLite backend postgres wysyła
+    swoje SELECT pg_notify(...) przez ten sam engine co żądania (funkcja pg_notify jest
+    rejestrowana w SQLite), bez nasłuchu LISTEN.
+    """
+    from infrastructure.broadcast import PostgresBroadcastBackend, result_broadcaster
+    from infrastructure.invalidation import INVALIDATION_CHANNEL, cache_invalidation
+
+    if request.param == "memory":
+        yield request.param
+        return
+
+    on_sqlite = engine.dialect.name != "postgresql"
+
+    def register_pg_notify(dbapi_connection, connection_record):
+        dbapi_connection.create_function("pg_notify", 2, lambda channel, payload: None)
+
+    for owner, channel in ((result_broadcaster, None), (cache_invalidation, INVALIDATION_CHANNEL)):
+        backend = PostgresBroadcastBackend(engine) if channel is None else PostgresBroadcastBackend(engine, channel=channel)
+        if on_sqlite:
+            monkeypatch.setattr(backend, "start", lambda deliver: None)
+        monkeypatch.setattr(owner, "backend", backend)
+
+    if on_sqlite:
+        event.listen(engine, "connect", register_pg_notify)
+        engine.dispose()
+    try:
+        yield request.param
+    finally:
+        if on_sqlite:
+            event.remove(engine, "connect", register_pg_notify)
+            engine.dispose()
+
+
+def test_routes_stay_within_query_budgets(app, bus):
+    from infrastructure.broadcast import result_broadcaster
+    from infrastructure.invalidation import cache_invalidation
+
+    published = result_broadcaster.published + cache_invalidation.published
+    rows = measure_routes(app)
+    # Pomiar ma sens tylko wtedy, gdy zapisy rzeczywiście opublikowały zmiany przez kanały
+    assert result_broadcaster.published + cache_invalidation.published > published
+
+    failures = [
+        f"{label}: {queries} zapytań, budżet {budget if budget is not None else '-'} - {status}"
+        for label, queries, budget, status, ok in rows
+        if not ok
+    ]
+    assert not failures, f"trasy poza budżetem zapytań (kanały {bus}):\n" + "\n".join(failures)
+
+
+def test_statements_are_recorded_only_up_to_the_first_over_budget(engine, caplog):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from sqlalchemy import text
+
+    from infrastructure.query_budget import query_budget
+    from infrastructure.request_metrics import MetricsMiddleware, RequestMetrics
+
+    finished = []
+
+    class RecordingMetrics(RequestMetrics):
+        def request_finished(self, method, route, status, seconds, stats):
+            finished.append(stats)
+            super().request_finished(method, route, status, seconds, stats)
+
+    def run_queries(count: int) -> None:
+        with engine.connect() as connection:
+            for _ in range(count):
+                connection.execute(text("SELECT 1"))
+
+    app = FastAPI()
+
+    @app.get("/budgeted")
+    @query_budget(2)
+    def budgeted():
+        run_queries(50)
+
+    @app.get("/unbudgeted")
+    def unbudgeted():
+        run_queries(50)
+
+    app.add_middleware(MetricsMiddleware, metrics=RecordingMetrics(), budget_mode="warn")
+    with TestClient(app) as client:
+        client.get("/budgeted")
+        client.get("/unbudgeted")
+
+    budgeted_stats, unbudgeted_stats = finished
+    assert budgeted_stats.queries == 50
+    assert len(budgeted_stats.statements) == 3
+    assert unbudgeted_stats.queries == 50
+    assert unbudgeted_stats.statements == []
+    assert "GET /budgeted: 50 zapytań SQL przy budżecie 2" in caplog.text
+    assert "... i 47 kolejnych" in caplog.text
@@ -0,0 +1,46 @@
+"""
+Częściowe indeksy z migracji (m0002, m0003 i m0004) - istnieją, obejmują tylko aktywne
+wiersze i są używane przez zapytania repozytoriów (te same sprawdzenia co manage.py explain).
+"""
+import pytest
+from sqlalchemy import text
+
+from benchmarks.common import seed_event
+from conftest import CATEGORIES
+
+# Indeks -> tabela; ix_events_active_date_id z m0003 zastąpił ix_events_active_date z m0002
+PARTIAL_INDEXES = {
+    "ix_events_active_date_id": "events",
+    "ix_results_active_event_category_created": "results",
+}
+
+
+@pytest.fixture
+def event_id(db):
+    return seed_event(db, 50, CATEGORIES, name="Plany zapytań")
+
+
+def test_partial_indexes_exist(engine):
+    if engine.dialect.name != "sqlite":
+        pytest.skip("definicje indeksów czytane z sqlite_master")
+    with engine.connect() as connection:
+        indexes = dict(connection.execute(text("SELECT name, sql FROM sqlite_master WHERE type = 'index'")).all())
+
+    assert "ix_events_active_date" not in indexes
+    for name, table in PARTIAL_INDEXES.items():
+        assert name in indexes, f"brak indeksu {name}"
+        definition = " ".join(indexes[name].split())
+        assert f"ON {table} " in definition
+        assert definition.endswith("WHERE deleted = 0"), f"{name} nie jest indeksem częściowym: {definition}"
+
+
+def test_hot_queries_use_indexes(db, event_id):
+    from manage import explain_checks, query_plans
+
+    missing = []
+    for label, index_name, call in explain_checks(db, event_id):
+        plans = query_plans(call)
+        assert plans, f"{label} nie wysłało zapytania SELECT"
+        missing += [f"{label}: {plan}" for plan in plans if index_name not in plan]
+
+    assert not missing, "zapytania bez oczekiwanego indeksu:\n" + "\n".join(missing)
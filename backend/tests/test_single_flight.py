@@ -0,0 +1,179 @@
+"""
+Łączenie równoczesnych odczytów wyników i wydarzeń (SingleFlight w ResultService i EventService).
+
+Repozytorium blokuje odczyt, dopóki wszystkie wątki nie dołączą do trwającego wywołania -
+wynik nie zależy od szybkości maszyny ani od symulowanego opóźnienia bazy.
+"""
+import threading
+import time
+from typing import Callable, List, Tuple
+
+from domain.data_version import DataVersion
+from infrastructure.single_flight import SingleFlight
+from usecases.event_service import EventService
+from usecases.result_service import ResultService
+
+CALLERS = 32
+TIMEOUT = 5.0
+
+
+class BlockingResultRepository:
+    """Repozytorium, którego odczyt czeka na `release` i liczy wywołania"""
+
+    def __init__(self, outcome):
+        self.outcome = outcome
+        self.release = threading.Event()
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get_by_event_grouped_by_category(self, event_id: int):
+        return self._read()
+
+    def _read(self):
+        with self._lock:
+            self.calls += 1
+        assert self.release.wait(TIMEOUT), "odczyt nie został zwolniony"
+        if isinstance(self.outcome, BaseException):
+            raise self.outcome
+        return self.outcome
+
+
+class BlockingEventRepository(BlockingResultRepository):
+    """Repozytorium wydarzeń - strona wydarzeń czeka na `release`, zapamiętuje argumenty odczytów"""
+
+    def __init__(self, outcome):
+        super().__init__(outcome)
+        self.pages = []
+
+    def list_page(self, **arguments):
+        with self._lock:
+            self.pages.append(arguments)
+        return self._read()
+
+
+def wait_until(condition: Callable[[], bool]) -> None:
+    deadline = time.monotonic() + TIMEOUT
+    while not condition():
+        assert time.monotonic() < deadline, "warunek nie został spełniony w czasie"
+        time.sleep(0.001)
+
+
+def call_concurrently(callers: int, call: Callable[[], object]) -> Tuple[List[threading.Thread], List[tuple]]:
+    """Uruchamia wywołania naraz; zwraca wątki i pary (wynik, wyjątek) wypełniane po ich zakończeniu"""
+    barrier = threading.Barrier(callers)
+    outcomes: List[tuple] = [(None, None)] * callers
+
+    def worker(index: int) -> None:
+        barrier.wait()
+        try:
+            outcomes[index] = (call(), None)
+        except Exception as error:
+            outcomes[index] = (None, error)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+
+def join(threads: List[threading.Thread]) -> None:
+    for thread in threads:
+        thread.join(TIMEOUT)
+        assert not thread.is_alive(), "wątek nie zakończył się"
+
+
+def test_concurrent_callers_share_one_query():
+    results = {"TZ": []}
+    repository = BlockingResultRepository(results)
+    single_flight = SingleFlight()
+    version = DataVersion("results:1", version=3)
+
+    threads, outcomes = call_concurrently(
+        CALLERS,
+        lambda: ResultService(repository, single_flight=single_flight).list_results_by_event(1, version)
+    )
+    # Wszyscy poza pierwszym czekają na jego odczyt - dopiero teraz kończymy zapytanie
+    wait_until(lambda: single_flight.stats()["shared"] == CALLERS - 1)
+    repository.release.set()
+    join(threads)
+
+    assert repository.calls == 1
+    assert all(error is None for _, error in outcomes)
+    assert all(value is results for value, _ in outcomes)
+    assert single_flight.stats() == {"executed": 1, "shared": CALLERS - 1, "in_flight": 0}
+
+
+def test_leader_error_reaches_every_waiting_caller():
+    failure = RuntimeError("baza niedostępna")
+    repository = BlockingResultRepository(failure)
+    single_flight = SingleFlight()
+    version = DataVersion("results:1", version=3)
+
+    threads, outcomes = call_concurrently(
+        CALLERS,
+        lambda: ResultService(repository, single_flight=single_flight).list_results_by_event(1, version)
+    )
+    wait_until(lambda: single_flight.stats()["shared"] == CALLERS - 1)
+    repository.release.set()
+    join(threads)
+
+    assert repository.calls == 1
+    assert all(value is None and error is failure for value, error in outcomes)
+    # Błąd nie zostaje zapamiętany - kolejne wywołanie pyta bazę od nowa
+    repository.outcome = {"TZ": []}
+    assert ResultService(repository, single_flight=single_flight).list_results_by_event(1, version) == {"TZ": []}
+    assert repository.calls == 2
+
+
+def test_newer_version_does_not_join_older_read():
+    repository = BlockingResultRepository({"TZ": []})
+    single_flight = SingleFlight()
+    service = ResultService(repository, single_flight=single_flight)
+
+    threads, _ = call_concurrently(1, lambda: service.list_results_by_event(1, DataVersion("results:1", version=3)))
+    wait_until(lambda: repository.calls == 1)
+    newer, _ = call_concurrently(1, lambda: service.list_results_by_event(1, DataVersion("results:1", version=4)))
+    # Odczyt nowszej wersji wykonuje własne zapytanie zamiast czekać na starszy
+    wait_until(lambda: repository.calls == 2)
+    repository.release.set()
+    join(threads + newer)
+
+    assert single_flight.stats()["shared"] == 0
+
+
+def test_concurrent_event_page_readers_share_one_query():
+    events = []
+    repository = BlockingEventRepository(events)
+    single_flight = SingleFlight()
+    version = DataVersion("events", version=7)
+
+    threads, outcomes = call_concurrently(
+        CALLERS,
+        lambda: EventService(repository, single_flight=single_flight).list_events_page(
+            limit=51, fields=["id", "name"], version=version
+        )
+    )
+    wait_until(lambda: single_flight.stats()["shared"] == CALLERS - 1)
+    repository.release.set()
+    join(threads)
+
+    assert repository.calls == 1
+    assert repository.pages[0]["limit"] == 51
+    assert all(error is None and value is events for value, error in outcomes)
+
+
+def test_event_pages_with_different_filters_do_not_share_a_query():
+    repository = BlockingEventRepository([])
+    single_flight = SingleFlight()
+    service = EventService(repository, single_flight=single_flight)
+    version = DataVersion("events", version=7)
+
+    first, _ = call_concurrently(1, lambda: service.list_events_page(limit=51, category="TT", version=version))
+    wait_until(lambda: repository.calls == 1)
+    second, _ = call_concurrently(1, lambda: service.list_events_page(limit=51, category="TZ", version=version))
+    wait_until(lambda: repository.calls == 2)
+    repository.release.set()
+    join(first + second)
+
+    assert single_flight.stats()["shared"] == 0
+    assert sorted(page["category"] for page in repository.pages) == ["TT", "TZ"]
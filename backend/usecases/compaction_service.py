@@ -0,0 +1,99 @@
+import time
+from datetime import timedelta
+from typing import Callable, Optional
+
+COMPACTION_MODES = ("archive", "delete")
+
+class CompactionService:
+    """
+    CompactionService - kompaktowanie wierszy oznaczonych jako usunięte.
+    To jest warstwa Use Cases - decyduje CO i w jakiej kolejności usuwamy.
+
+    Najpierw wydarzenia (razem z ich wynikami i klasyfikacją), potem pojedyncze wyniki.
+    Każda paczka to osobna transakcja, a przerwa między paczkami oddaje bazę bieżącemu ruchowi.
+    """
+
+    def __init__(
+        self,
+        compaction_repository,
+        batch_size: int = 500,
+        pause_seconds: float = 0.1,
+        on_results_removed: Optional[Callable[[int], None]] = None
+    ):
+        if batch_size < 1:
+            raise ValueError("Rozmiar paczki musi być dodatni")
+        self.compaction_repository = compaction_repository
+        self.batch_size = batch_size
+        self.pause_seconds = pause_seconds
+        # Wywoływane z ID wydarzenia, którego wyniki zniknęły (np. unieważnienie cache)
+        self.on_results_removed = on_results_removed
+
+    def compact(
+        self,
+        retention_days: int,
+        mode: str = "archive",
+        dry_run: bool = False,
+        max_batches: Optional[int] = None
+    ) -> dict:
+        """
+        Usuwa wiersze usunięte dawniej niż `retention_days` dni temu i zwraca raport
+        z liczbą usuniętych wierszy oraz stanem tabel przed i po.
+        - archive: wiersze trafiają do events_archive/results_archive
+        - delete: wiersze są usuwane bez kopii
+        """
+        if mode not in COMPACTION_MODES:
+            raise ValueError(f"Nieobsługiwany tryb kompaktowania: {mode} (dostępne: {', '.join(COMPACTION_MODES)})")
+        if retention_days < 0:
+            raise ValueError("Okres retencji nie może być ujemny")
+
+        cutoff = self.compaction_repository.database_now() - timedelta(days=retention_days)
+        report = {
+            "mode": mode,
+            "retention_days": retention_days,
+            "cutoff": cutoff.isoformat(sep=" ", timespec="seconds"),
+            "dry_run": dry_run,
+            "events": 0,
+            "results": 0,
+            "batches": 0,
+            "skipped_events": [],
+            "complete": True,
+            "tables_before": self.compaction_repository.table_stats(),
+        }
+
+        if dry_run:
+            report["events"], report["results"] = self.compaction_repository.count_candidates(cutoff)
+            report["tables_after"] = report["tables_before"]
+            return report
+
+        archive = mode == "archive"
+        for step in (self._events_batch, self._results_batch):
+            while True:
+                if max_batches is not None and report["batches"] >= max_batches:
+                    report["complete"] = False
+                    break
+                if not step(report, cutoff, archive):
+                    break
+                report["batches"] += 1
+                if self.pause_seconds:
+                    time.sleep(self.pause_seconds)
+
+        report["tables_after"] = self.compaction_repository.table_stats()
+        return report
+
+    def _events_batch(self, report: dict, cutoff, archive: bool) -> bool:
+        event_ids, removed_results, skipped = self.compaction_repository.compact_events_batch(
+            cutoff, self.batch_size, archive, exclude=report["skipped_events"]
+        )
+        report["events"] += len(event_ids)
+        report["results"] += removed_results
+        # Pominięte wydarzenia (zmienione w trakcie) poczekają na następne uruchomienie
+        report["skipped_events"].extend(skipped)
+        if removed_results and self.on_results_removed is not None:
+            for event_id in event_ids:
+                self.on_results_removed(event_id)
+        return bool(event_ids or skipped)
+
+    def _results_batch(self, report: dict, cutoff, archive: bool) -> bool:
+        removed = self.compaction_repository.compact_results_batch(cutoff, self.batch_size, archive)
+        report["results"] += removed
+        return removed > 0
@@ -1,4 +1,6 @@
-from typing import List, Optional
+from typing import Callable, List, Optional, Sequence, Tuple
+from datetime import datetime
+from domain.data_version import DataVersion
 from domain.event import Event
 
 class EventService:
@@ -7,8 +9,16 @@ class EventService:
     To jest warstwa Use Cases - mówi CO można zrobić z danymi.
     """
     
-    def __init__(self, event_repository):
+    def __init__(self, event_repository, single_flight=None):
         self.event_repository = event_repository
+        # Opcjonalne łączenie równoczesnych identycznych odczytów (SingleFlight)
+        self.single_flight = single_flight
+
+    def _coalesce(self, key: tuple, load: Callable):
+        """Równoczesne wywołania z tym samym kluczem dzielą jeden odczyt"""
+        if self.single_flight is None:
+            return load()
+        return self.single_flight.do(key, load)
 
     def create_event(self, event: Event) -> Event:
         """Tworzy nowe wydarzenie"""
@@ -26,21 +36,65 @@ class EventService:
         """Listuje wszystkie aktywne wydarzenia posortowane po dacie"""
         return self.event_repository.list_all_sorted()
     
-    def list_latest_events(self, limit: int = 3) -> List[Event]:
-        """Listuje najnowsze aktywne wydarzenia (domyślnie 3)"""
-        return self.event_repository.list_latest_events(limit)
+    def list_events_page(
+        self,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        category: Optional[str] = None,
+        location: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        version: Optional[DataVersion] = None
+    ) -> List[Event]:
+        """
+        Listuje jedną stronę aktywnych wydarzeń z opcjonalnymi filtrami.
+        Równoczesne wywołania z tymi samymi argumentami i wersją danych dzielą jedno zapytanie.
+        """
+        if date_from and date_to and date_from > date_to:
+            raise ValueError("Data początkowa nie może być późniejsza niż końcowa")
+        
+        fields = tuple(fields) if fields is not None else None
+        return self._coalesce(
+            ("events.page", limit, after, date_from, date_to, category, location, fields, _version_number(version)),
+            lambda: self.event_repository.list_page(
+                limit=limit,
+                after=after,
+                date_from=date_from,
+                date_to=date_to,
+                category=category,
+                location=location,
+                fields=fields
+            )
+        )
+    
+    def list_latest_events(self, limit: int = 3, version: Optional[DataVersion] = None) -> List[Event]:
+        """Listuje najnowsze aktywne wydarzenia (domyślnie 3), łącząc równoczesne wywołania"""
+        return self._coalesce(
+            ("events.latest", limit, _version_number(version)),
+            lambda: self.event_repository.list_latest_events(limit)
+        )
+    
+    def render_latest_events(self, limit: int, version: DataVersion, render: Callable[[List[Event]], bytes]) -> bytes:
+        """
+        Najnowsze wydarzenia od razu w postaci treści odpowiedzi - równoczesne żądania
+        o tę samą wersję danych dzielą jedno zapytanie i jedną serializację
+        """
+        return self._coalesce(
+            ("events.latest.body", limit, version.version, render),
+            lambda: render(self.list_latest_events(limit, version))
+        )
+    
+    def get_events_version(self) -> DataVersion:
+        """Wersja listy wydarzeń - pozwala sprawdzić zmiany bez wczytywania wydarzeń"""
+        return self.event_repository.get_version()
     
     def get_event_by_id(self, event_id: int) -> Optional[Event]:
         """Pobiera wydarzenie po ID"""
         return self.event_repository.get_by_id(event_id)
     
     def update_event(self, event_id: int, event: Event) -> Optional[Event]:
-        """Aktualizuje wydarzenie"""
-        # Sprawdź czy wydarzenie istnieje
-        existing_event = self.event_repository.get_by_id(event_id)
-        if not existing_event:
-            return None
-        
+        """Aktualizuje wydarzenie; zwraca None, gdy wydarzenie nie istnieje"""
         # Ustaw ID dla aktualizacji
         event.id = event_id
         
@@ -48,4 +102,13 @@ class EventService:
         if not event.name:
             raise ValueError("Nazwa wydarzenia jest wymagana")
         
-        return self.event_repository.update(event) 
\ No newline at end of file
+        # Repozytorium sprawdza istnienie i zapisuje w jednym zapytaniu
+        return self.event_repository.update(event)
+
+def _version_number(version: Optional[DataVersion]) -> Optional[int]:
+    """
+    Wersja danych w kluczu łączenia - żądanie, które odczytało nowszą wersję, nie dołączy
+    do odczytu rozpoczętego przed zapisem. Bez wersji łączone są po prostu wywołania
+    trwające w tym samym czasie.
+    """
+    return version.version if version is not None else None
@@ -0,0 +1,107 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from serializers import format_date, format_timestamp
+
+# Kolumny eksportu w kolejności zapisu
+RESULT_EXPORT_FIELDS = [
+    "id", "event_id", "event_name", "event_date", "category", "team", "penalty_points", "created_at", "updated_at",
+]
+EVENT_EXPORT_FIELDS = [
+    "id", "name", "date", "categories", "location", "start_point_url", "start_time", "fee",
+    "registration_deadline", "registered_participants", "google_maps_url", "google_drive_url",
+    "created_at", "updated_at",
+]
+EXPORT_FORMATS = ("csv", "ndjson")
+
+# Daty i znaczniki czasu w tym samym formacie co w odpowiedziach API (GET /events/all, /results)
+EXPORT_DATE_FORMATTERS = {
+    "date": format_date,
+    "event_date": format_date,
+    "registration_deadline": format_date,
+    "created_at": format_timestamp,
+    "updated_at": format_timestamp,
+}
+
+class ExportService:
+    """
+    ExportService - strumieniowy eksport wyników i wydarzeń do CSV/NDJSON.
+    To jest warstwa Use Cases - zwraca kolejne fragmenty tekstu, nie buduje całego pliku w pamięci.
+    """
+    
+    def __init__(self, result_repository, event_repository, chunk_rows: int = 500):
+        self.result_repository = result_repository
+        self.event_repository = event_repository
+        self.chunk_rows = chunk_rows
+
+    @staticmethod
+    def validate_format(export_format: str) -> None:
+        """Sprawdza czy format eksportu jest obsługiwany"""
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Nieobsługiwany format eksportu: {export_format} (dostępne: {', '.join(EXPORT_FORMATS)})")
+
+    def export_results(
+        self,
+        export_format: str,
+        event_id: Optional[int] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ) -> Iterator[str]:
+        """Eksportuje wyniki jednego wydarzenia, zakresu dat lub całej historii"""
+        self.validate_format(export_format)
+        rows = self.result_repository.iter_for_export(event_id=event_id, date_from=date_from, date_to=date_to)
+        return self._format(rows, RESULT_EXPORT_FIELDS, export_format)
+
+    def export_events(
+        self,
+        export_format: str,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None
+    ) -> Iterator[str]:
+        """Eksportuje wydarzenia z zakresu dat lub wszystkie"""
+        self.validate_format(export_format)
+        rows = self.event_repository.iter_for_export(date_from=date_from, date_to=date_to)
+        return self._format(rows, EVENT_EXPORT_FIELDS, export_format)
+
+    def _format(self, rows: Iterable[Dict[str, Any]], fields: List[str], export_format: str) -> Iterator[str]:
+        """Zamienia wiersze na fragmenty CSV lub NDJSON po `chunk_rows` wierszy"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if export_format == "csv" else None
+        
+        if writer is not None:
+            # Nagłówek wysyłamy od razu, zanim baza zwróci pierwsze wiersze
+            writer.writerow(fields)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        
+        formatters = [(name, EXPORT_DATE_FORMATTERS.get(name)) for name in fields]
+        pending = 0
+        for row in rows:
+            values = {
+                name: formatter(row.get(name)) if formatter else row.get(name)
+                for name, formatter in formatters
+            }
+            if writer is not None:
+                writer.writerow([self._csv_value(values[name]) for name in fields])
+            else:
+                buffer.write(json.dumps(values, ensure_ascii=False))
+                buffer.write("\n")
+            
+            pending += 1
+            if pending >= self.chunk_rows:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+        
+        if pending:
+            yield buffer.getvalue()
+
+    @staticmethod
+    def _csv_value(value: Any) -> Any:
+        if isinstance(value, list):
+            return ";".join(value)
+        return value
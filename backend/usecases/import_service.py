@@ -0,0 +1,111 @@
+from typing import Iterable, List, Optional, Tuple
+from domain.result import Result
+from infrastructure.result_import import ImportRecord
+
+IMPORT_MODES = ("append", "replace")
+
+class ImportRejectedError(ValueError):
+    """Import w trybie replace przerwany bez zapisu - plik zawiera błędne wiersze"""
+
+    def __init__(self, message: str, report: dict):
+        super().__init__(message)
+        self.report = report
+
+class ResultImportService:
+    """
+    ResultImportService - import wyników z plików (CSV, IOF XML) w paczkach.
+    To jest warstwa Use Cases - waliduje wiersze regułami ResultService i zbiera błędy per wiersz.
+    """
+    
+    def __init__(
+        self,
+        result_service,
+        batch_size: int = 1000,
+        max_reported_errors: int = 1000,
+        max_replace_rows: int = 50000
+    ):
+        self.result_service = result_service
+        self.batch_size = batch_size
+        self.max_reported_errors = max_reported_errors
+        # Tryb replace trzyma cały plik w pamięci do jednego zapisu różnicowego
+        self.max_replace_rows = max_replace_rows
+
+    def import_records(self, event_id: int, records: Iterable[ImportRecord], mode: str = "append") -> dict:
+        """
+        Importuje rekordy do wydarzenia i zwraca raport.
+        - append: poprawne wiersze są zapisywane paczkami po `batch_size`, każda w osobnej transakcji
+        - replace: wiersze zastępują wyniki wydarzenia jednym zapisem różnicowym; jeden błędny
+          wiersz przerywa import bez zapisu (ImportRejectedError), bo usunąłby wyniki pominiętych drużyn
+        """
+        if mode not in IMPORT_MODES:
+            raise ValueError(f"Nieobsługiwany tryb importu: {mode} (dostępne: {', '.join(IMPORT_MODES)})")
+        
+        report = {"imported": 0, "rejected": 0, "batches": 0, "errors": []}
+        batch: List[Tuple[int, Result]] = []
+        
+        for row_number, record in records:
+            try:
+                result = self._to_result(event_id, record)
+                self.result_service.validate_result(result)
+            except ValueError as e:
+                self._reject(report, row_number, str(e))
+                continue
+            
+            batch.append((row_number, result))
+            if mode == "replace" and len(batch) > self.max_replace_rows:
+                raise ValueError(
+                    f"Import w trybie replace obsługuje najwyżej {self.max_replace_rows} wierszy - "
+                    f"użyj trybu append"
+                )
+            if mode == "append" and len(batch) >= self.batch_size:
+                self._write_batch(report, batch)
+                batch = []
+        
+        if mode == "replace":
+            if report["rejected"]:
+                raise ImportRejectedError(
+                    f"Odrzucono {report['rejected']} wierszy - wyniki wydarzenia nie zostały zmienione",
+                    report
+                )
+            changes = self.result_service.replace_results_for_event(event_id, [result for _, result in batch])
+            report["imported"] = len(batch)
+            report["batches"] = 1
+            report["changes"] = changes.counts()
+        elif batch:
+            self._write_batch(report, batch)
+        
+        return report
+
+    def _write_batch(self, report: dict, batch: List[Tuple[int, Result]]) -> None:
+        """Zapisuje paczkę wierszy; błąd zapisu odrzuca tylko tę paczkę"""
+        try:
+            self.result_service.add_results([result for _, result in batch])
+        except Exception as e:
+            for row_number, _ in batch:
+                self._reject(report, row_number, f"Błąd zapisu paczki: {e}")
+            return
+        report["imported"] += len(batch)
+        report["batches"] += 1
+
+    def _reject(self, report: dict, row_number: int, message: str) -> None:
+        report["rejected"] += 1
+        if len(report["errors"]) < self.max_reported_errors:
+            report["errors"].append({"row": row_number, "error": message})
+
+    @staticmethod
+    def _to_result(event_id: int, record: dict) -> Result:
+        """Zamienia surowy rekord z pliku na domain object"""
+        category = (record.get("category") or "").strip()
+        team = (record.get("team") or "").strip()
+        points: Optional[str] = record.get("penalty_points")
+        
+        if not category:
+            raise ValueError("Kategoria jest wymagana")
+        if points is None or str(points).strip() == "":
+            raise ValueError("Brak punktów karnych")
+        try:
+            penalty_points = int(str(points).strip())
+        except ValueError:
+            raise ValueError(f"Nieprawidłowa liczba punktów karnych: {points}")
+        
+        return Result(event_id=event_id, category=category, team=team, penalty_points=penalty_points)
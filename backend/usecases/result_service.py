@@ -1,5 +1,7 @@
-from typing import List, Dict, Optional
-from domain.result import Result
+from typing import Callable, List, Dict, Optional
+from domain.data_version import DataVersion
+from domain.result import Result, ResultChangeSet
+from domain.standing import Standing
 
 class ResultService:
     """
@@ -7,27 +9,134 @@ class ResultService:
     To jest warstwa Use Cases - mówi CO można zrobić z danymi.
     """
     
-    def __init__(self, result_repository):
+    def __init__(self, result_repository, publisher=None, single_flight=None):
         self.result_repository = result_repository
+        # Opcjonalny odbiorca zmian (np. ResultBroadcaster) - powiadamiany po zapisie
+        self.publisher = publisher
+        # Opcjonalne łączenie równoczesnych identycznych odczytów (SingleFlight)
+        self.single_flight = single_flight
 
-    def add_result(self, result: Result) -> Result:
-        """Dodaje nowy wynik"""
-        # Walidacja biznesowa
+    def _coalesce(self, key: tuple, load: Callable):
+        """Równoczesne wywołania z tym samym kluczem dzielą jeden odczyt"""
+        if self.single_flight is None:
+            return load()
+        return self.single_flight.do(key, load)
+
+    def _publish_changes(self, event_id: int, changes: ResultChangeSet) -> None:
+        """Powiadamia subskrybentów o zapisanych zmianach wyników wydarzenia"""
+        if self.publisher is None or not changes.has_changes():
+            return
+        
+        self.publisher.publish(event_id, "results", {
+            "event_id": event_id,
+            "inserted": [self._result_payload(result) for result in changes.inserted],
+            "updated": [self._result_payload(result) for result in changes.updated],
+            "deleted": changes.deleted,
+        })
+
+    @staticmethod
+    def _result_payload(result: Result) -> dict:
+        return {
+            "id": result.id,
+            "category": result.category,
+            "team": result.team,
+            "penalty_points": result.penalty_points,
+        }
+
+    def validate_result(self, result: Result) -> None:
+        """Sprawdza reguły biznesowe dla pojedynczego wyniku"""
         if result.penalty_points < 0:
             raise ValueError("Punkty karne nie mogą być ujemne")
         
         if not result.team:
             raise ValueError("Nazwa zespołu jest wymagana")
+
+    def add_result(self, result: Result) -> Result:
+        """Dodaje nowy wynik"""
+        self.validate_result(result)
+        created = self.result_repository.add(result)
+        self._publish_changes(created.event_id, ResultChangeSet(inserted=[created]))
+        return created
+
+    def add_results(self, results: List[Result]) -> List[Result]:
+        """Dodaje wiele wyników naraz - najpierw waliduje cały zestaw, potem zapisuje w jednej transakcji"""
+        for result in results:
+            self.validate_result(result)
+        
+        created = self.result_repository.add_many(results)
+        for event_id in {result.event_id for result in created}:
+            self._publish_changes(
+                event_id,
+                ResultChangeSet(inserted=[result for result in created if result.event_id == event_id])
+            )
+        return created
+
+    def replace_results_for_event(self, event_id: int, results: List[Result]) -> ResultChangeSet:
+        """Zastępuje wszystkie wyniki wydarzenia - najpierw waliduje cały zestaw, potem zapisuje tylko różnice"""
+        for result in results:
+            self.validate_result(result)
         
-        return self.result_repository.add(result)
+        changes = self.result_repository.replace_for_event(event_id, results)
+        self._publish_changes(event_id, changes)
+        return changes
 
     def delete_result(self, result_id: int) -> bool:
         """Usuwa wynik (soft delete)"""
-        return self.result_repository.soft_delete(result_id)
+        result = self.result_repository.get_by_id(result_id) if self.publisher is not None else None
+        success = self.result_repository.soft_delete(result_id)
+        if success and result is not None:
+            self._publish_changes(result.event_id, ResultChangeSet(deleted=[result_id]))
+        return success
 
-    def list_results_by_event(self, event_id: int) -> Dict[str, List[Result]]:
-        """Listuje wyniki dla danego wydarzenia pogrupowane według kategorii"""
-        return self.result_repository.get_by_event_grouped_by_category(event_id)
+    def get_results_version(self, event_id: int) -> DataVersion:
+        """Wersja wyników wydarzenia - pozwala sprawdzić zmiany bez wczytywania wyników"""
+        return self.result_repository.get_version(event_id)
+    
+    def list_results_by_event(self, event_id: int, version: Optional[DataVersion] = None) -> Dict[str, List[Result]]:
+        """
+        Listuje wyniki dla danego wydarzenia pogrupowane według kategorii.
+        Równoczesne wywołania dla tej samej wersji wyników dzielą jedno zapytanie - żądanie,
+        które odczytało nowszą wersję, nie dołączy do odczytu rozpoczętego przed zapisem.
+        """
+        return self._coalesce(
+            ("results", event_id, version.version if version is not None else None),
+            lambda: self.result_repository.get_by_event_grouped_by_category(event_id)
+        )
+    
+    def render_results_by_event(
+        self,
+        event_id: int,
+        version: DataVersion,
+        render: Callable[[Dict[str, List[Result]]], bytes]
+    ) -> bytes:
+        """
+        Wyniki wydarzenia od razu w postaci treści odpowiedzi - równoczesne żądania
+        o tę samą wersję wyników dzielą jedno zapytanie i jedną serializację
+        """
+        return self._coalesce(
+            ("results.body", event_id, version.version, render),
+            lambda: render(self.list_results_by_event(event_id, version))
+        )
+    
+    def get_leaderboard(
+        self,
+        event_id: int,
+        category: Optional[str] = None,
+        top: Optional[int] = None,
+        around_team: Optional[str] = None,
+        window: int = 2
+    ) -> Dict[str, List[Standing]]:
+        """Zwraca klasyfikację wydarzenia (całą, pierwsze N miejsc lub okolice zespołu)"""
+        if top is not None and around_team is not None:
+            raise ValueError("Parametry top i around_team wykluczają się")
+        
+        return self.result_repository.get_leaderboard(
+            event_id,
+            category=category,
+            top=top,
+            around_team=around_team,
+            window=window
+        )
     
     def get_result_by_id(self, result_id: int) -> Optional[Result]:
         """Pobiera wynik po ID"""
@@ -35,4 +144,7 @@ class ResultService:
     
     def delete_all_results_for_event(self, event_id: int) -> bool:
         """Usuwa wszystkie wyniki dla danego wydarzenia (soft delete)"""
-        return self.result_repository.delete_all_for_event(event_id) 
\ No newline at end of file
+        success = self.result_repository.delete_all_for_event(event_id)
+        if success and self.publisher is not None:
+            self.publisher.publish(event_id, "resync", {"event_id": event_id})
+        return success 
\ No newline at end of file